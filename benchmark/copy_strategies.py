@@ -0,0 +1,175 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A benchmark that compares the methods of copying files and
+directory trees on the given file systems.
+
+Run it from the root of the repository, for example on tmpfs and
+on the file system of the build directory:
+
+    python -m benchmark.copy_strategies /dev/shm build
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from typing import Callable
+
+from couplet_composer.util import file_copy
+
+
+def _measure(function: Callable[[], None], clean: Callable[[], None]) -> float:
+    """Runs the given function once and gives the time it took.
+
+    Args:
+        function (Callable): The function that is measured.
+        clean (Callable): The function that removes the output of
+            the previous run.
+
+    Returns:
+        A 'float' that is the time in seconds.
+    """
+    clean()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def _create_tree(path: str, files: int) -> None:
+    """Creates a directory tree that resembles an installed
+    distribution of a tool.
+
+    Args:
+        path (str): The root of the tree.
+        files (int): The number of the files in the tree.
+    """
+    for i in range(files):
+        directory = os.path.join(path, "share", "module{}".format(i // 64))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "file{}".format(i)), "wb") as f:
+            f.write(os.urandom(1024 * (1 + i % 32)))
+
+
+def _run(directory: str, size: int, files: int, repeat: int) -> None:
+    """Runs the benchmark in the given directory and prints the
+    results.
+
+    Args:
+        directory (str): The directory on the file system that is
+            measured.
+        size (int): The size of the large file in mebibytes.
+        files (int): The number of the files in the tree.
+        repeat (int): The number of the runs of each method.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp_dir:
+        large_file = os.path.join(tmp_dir, "large.bin")
+        large_copy = os.path.join(tmp_dir, "large-copy.bin")
+
+        with open(large_file, "wb") as f:
+            for _ in range(size):
+                f.write(os.urandom(1024 * 1024))
+
+        tree = os.path.join(tmp_dir, "tree")
+        tree_copy = os.path.join(tmp_dir, "tree-copy")
+
+        _create_tree(path=tree, files=files)
+
+        def _remove_file() -> None:
+            if os.path.exists(large_copy):
+                os.remove(large_copy)
+
+        def _remove_tree() -> None:
+            shutil.rmtree(tree_copy, ignore_errors=True)
+
+        print("{} ({} MiB file, {} files in the tree)".format(
+            directory,
+            size,
+            files
+        ))
+        print("{:>24} {:>10}".format("method", "best (s)"))
+
+        candidates = [
+            ("shutil.copy2", lambda: shutil.copy2(large_file, large_copy))
+        ] + [
+            (name, lambda name=name: file_copy.copy_file(
+                large_file,
+                large_copy,
+                strategies=[name]
+            )) for name in file_copy.STRATEGIES
+        ]
+
+        for name, function in candidates:
+            try:
+                best = min(
+                    _measure(function=function, clean=_remove_file)
+                    for _ in range(repeat)
+                )
+            except OSError:
+                print("{:>24} {:>10}".format(name, "unsupported"))
+                continue
+
+            print("{:>24} {:>10.4f}".format(name, best))
+
+        for name, function in [
+            ("shutil.copytree", lambda: shutil.copytree(tree, tree_copy)),
+            ("copy_tree, 1 job", lambda: file_copy.copy_tree(
+                tree,
+                tree_copy,
+                jobs=1
+            )),
+            ("copy_tree", lambda: file_copy.copy_tree(tree, tree_copy))
+        ]:
+            best = min(
+                _measure(function=function, clean=_remove_tree)
+                for _ in range(repeat)
+            )
+            print("{:>24} {:>10.4f}".format(name, best))
+
+        print()
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "directories",
+        default=[tempfile.gettempdir()],
+        nargs="*",
+        help="the directories on the file systems to measure (default: the "
+             "temporary directory)"
+    )
+    parser.add_argument(
+        "--size",
+        default=256,
+        type=int,
+        help="the size of the large file in mebibytes (default: 256)"
+    )
+    parser.add_argument(
+        "--files",
+        default=2000,
+        type=int,
+        help="the number of the files in the tree (default: 2000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        default=3,
+        type=int,
+        help="the number of the runs of each method"
+    )
+    args = parser.parse_args()
+
+    for directory in args.directories:
+        _run(
+            directory=directory,
+            size=args.size,
+            files=args.files,
+            repeat=args.repeat
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,686 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A suite of micro-benchmarks of the hot paths of the build script
+that are run on synthetic fixtures: large directory trees, large
+archives, preset files with deep chains of mix-in presets, and
+project files with hundreds of dependencies.
+
+Run it from the root of the repository. The results can be saved
+to a file and compared to the saved results of an earlier run, for
+example in CI:
+
+    python -m benchmark.micro --save baseline.json
+    python -m benchmark.micro --compare baseline.json --threshold 0.2
+
+The comparison exits with a non-zero status if a benchmark has
+become slower than the threshold allows.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tarfile
+import tempfile
+import time
+
+from argparse import Namespace
+
+from collections import namedtuple
+
+from typing import Callable, Dict, List, Tuple
+
+from couplet_composer.support.build_variant import BuildVariant
+
+from couplet_composer.support.cmake_generator import CMakeGenerator
+
+from couplet_composer.support.run_mode import RunMode
+
+from couplet_composer.support.system import System
+
+from couplet_composer.support import preset
+
+from couplet_composer.util import fingerprint, shell
+
+from couplet_composer.build_directory import BuildDirectory
+
+from couplet_composer.project import Project
+
+from couplet_composer.target import Target
+
+
+# The version of the format of the saved results.
+RESULTS_VERSION = 1
+
+# The shortest time a measured run of a fast benchmark should take
+# so that the timer is accurate enough.
+MINIMUM_RUN_TIME = 0.2
+
+Benchmark = namedtuple("Benchmark", ["name", "setup"])
+
+
+def _write_random_file(path: str, size: int) -> None:
+    """Writes a file of the given size with random contents.
+
+    Args:
+        path (str): The file.
+        size (int): The size of the file in bytes.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb") as f:
+        while size > 0:
+            chunk = min(size, 1024 * 1024)
+            f.write(os.urandom(chunk))
+            size -= chunk
+
+
+def _create_tree(path: str, files: int) -> None:
+    """Creates a directory tree that resembles the installed files
+    of a dependency: many small headers and a few libraries.
+
+    Args:
+        path (str): The root of the tree.
+        files (int): The number of the files in the tree.
+    """
+    for i in range(files):
+        if i % 100 == 0:
+            name = os.path.join("lib", "liblib{}.a".format(i))
+            size = 1024 * 1024
+        else:
+            name = os.path.join(
+                "include",
+                "module{}".format(i // 64),
+                "header{}.h".format(i)
+            )
+            size = 1024 * (1 + i % 16)
+
+        _write_random_file(path=os.path.join(path, name), size=size)
+
+
+def _create_archive(path: str, size: int) -> None:
+    """Creates a gzipped tar archive that resembles the source
+    archive of a dependency.
+
+    Args:
+        path (str): The archive file.
+        size (int): The total size of the files in the archive in
+            mebibytes.
+    """
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path)) as tmp_dir:
+        root = os.path.join(tmp_dir, "dependency-1.0.0")
+
+        _create_tree(path=os.path.join(root, "include"), files=2000)
+
+        for i in range(size):
+            _write_random_file(
+                path=os.path.join(root, "data", "blob{}.bin".format(i)),
+                size=1024 * 1024
+            )
+
+        with tarfile.open(path, "w:gz", compresslevel=1) as archive:
+            archive.add(root, arcname="dependency-1.0.0")
+
+
+def _create_presets(path: str, depth: int) -> str:
+    """Creates a preset file with a chain of mix-in presets. Every
+    preset in the chain mixes in the next one and a shared preset,
+    and has a mode-specific portion.
+
+    Args:
+        path (str): The preset file.
+        depth (int): The length of the chain.
+
+    Returns:
+        An 'str' that is the name of the preset at the head of the
+        chain.
+    """
+    lines = [
+        "[common]",
+        "build-variant = debug",
+        "cmake-generator = ninja",
+        ""
+    ]
+
+    for i in range(depth):
+        lines.extend([
+            "[preset{}]".format(i),
+            "mix-in-preset = common"
+        ])
+
+        if i + 1 < depth:
+            lines.append("    preset{}".format(i + 1))
+
+        lines.extend([
+            "option{} = value{}".format(i, i),
+            "list{} =".format(i),
+            "    first{}".format(i),
+            "    second{}".format(i),
+            "",
+            "[compose:preset{}]".format(i),
+            "compose-option{} = value{}".format(i, i),
+            ""
+        ])
+
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+    return "preset0"
+
+
+def _create_project(source_root: str, repo: str, dependencies: int) -> None:
+    """Creates a project with a project file that has the given
+    number of dependencies. Every dependency depends on the
+    previous one.
+
+    Args:
+        source_root (str): The root directory of the invocation.
+        repo (str): The name of the repository directory.
+        dependencies (int): The number of the dependencies.
+    """
+    project_dir = os.path.join(source_root, repo)
+
+    os.makedirs(project_dir, exist_ok=True)
+
+    with open(os.path.join(project_dir, "CMakeLists.txt"), "w") as f:
+        f.write("cmake_minimum_required(VERSION 3.18)\n")
+
+    data = {
+        "shared_version": "0.1.0",
+        "anthem": {"name": "Anthem", "version": "shared"},
+        "forge": {"name": "Forge", "version": "0.2.0"},
+        "opengl": {"version": "4.6"},
+        "dependencies": {}
+    }
+
+    for i in range(dependencies):
+        key = "dependency{}".format(i)
+        data["dependencies"][key] = {
+            "name": "Dependency {}".format(i),
+            "version": "1.{}.0".format(i),
+            "repository": "example/{}".format(key),
+            "files": [
+                "include/{}".format(key),
+                "lib/lib{}.a".format(key),
+                "lib/pkgconfig/{}.pc".format(key)
+            ],
+            "dependsOn": ["dependency{}".format(i - 1)] if i else [],
+            "sha256": "0" * 64
+        }
+
+    with open(os.path.join(project_dir, "product.json"), "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _setup_copytree(directory: str, args: Namespace) -> Tuple:
+    """Creates the fixture of the benchmark of copying a directory tree.
+
+    Args:
+        directory (str): The directory of the fixture.
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        A 'tuple' of the measured function and the optional
+        function that removes the output of the previous run.
+    """
+    tree = os.path.join(directory, "tree")
+    tree_copy = os.path.join(directory, "tree-copy")
+
+    _create_tree(path=tree, files=args.files)
+
+    return (
+        lambda: shell.copytree(tree, tree_copy),
+        lambda: shell.rmtree(tree_copy) if os.path.isdir(tree_copy) else None
+    )
+
+
+def _setup_tar(directory: str, args: Namespace, members: List[str]) -> Tuple:
+    """Creates the fixture of the benchmark of extracting an archive.
+
+    Args:
+        directory (str): The directory of the fixture.
+        args (Namespace): The parsed command line arguments.
+        members (list): The filters of the extracted members.
+
+    Returns:
+        A 'tuple' of the measured function and the optional
+        function that removes the output of the previous run.
+    """
+    archive = os.path.join(directory, "dependency.tar.gz")
+    destination = os.path.join(directory, "extracted")
+
+    if not os.path.isfile(archive):
+        _create_archive(path=archive, size=args.archive_size)
+
+    def _clean() -> None:
+        if os.path.isdir(destination):
+            shell.rmtree(destination)
+        os.makedirs(destination)
+
+    return (
+        lambda: shell.tar(path=archive, dest=destination, members=members),
+        _clean
+    )
+
+
+def _setup_presets(directory: str, args: Namespace, cached: bool) -> Tuple:
+    """Creates the fixture of the benchmark of reading a preset.
+
+    Args:
+        directory (str): The directory of the fixture.
+        args (Namespace): The parsed command line arguments.
+        cached (bool): Whether the resolved presets are read from
+            the cache directory.
+
+    Returns:
+        A 'tuple' of the measured function and the optional
+        function that removes the output of the previous run.
+    """
+    preset_file = os.path.join(directory, "presets.ini")
+    name = _create_presets(path=preset_file, depth=args.preset_depth)
+
+    return (
+        lambda: preset.get_preset_options(
+            file_names=[preset_file],
+            preset_name=name,
+            run_mode=RunMode.compose,
+            cache_dir=os.path.join(directory, "cache") if cached else None
+        ),
+        None
+    )
+
+
+def _setup_project(directory: str, args: Namespace) -> Tuple:
+    """Creates the fixture of the benchmark of reading the project file.
+
+    Args:
+        directory (str): The directory of the fixture.
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        A 'tuple' of the measured function and the optional
+        function that removes the output of the previous run.
+    """
+    _create_project(
+        source_root=directory,
+        repo="project",
+        dependencies=args.dependencies
+    )
+
+    return (
+        lambda: Project(
+            source_root=directory,
+            repo="project",
+            script_package="couplet_composer",
+            platform=System.linux
+        ),
+        None
+    )
+
+
+def _setup_should_install(directory: str, args: Namespace) -> Tuple:
+    """Creates the fixture of the benchmark of checking whether the
+    dependencies should be installed.
+
+    Args:
+        directory (str): The directory of the fixture.
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        A 'tuple' of the measured function and the optional
+        function that removes the output of the previous run.
+    """
+    _create_project(
+        source_root=directory,
+        repo="project",
+        dependencies=args.dependencies
+    )
+
+    project = Project(
+        source_root=directory,
+        repo="project",
+        script_package="couplet_composer",
+        platform=System.linux
+    )
+    build_dir = BuildDirectory(
+        args=Namespace(dry_run=False, verbose=False),
+        source_root=directory,
+        build_variant=BuildVariant.debug,
+        generator=CMakeGenerator.ninja,
+        target=Target(system="linux", machine="x86_64")
+    )
+
+    runner = Namespace(
+        args=Namespace(explain=False),
+        toolchain=Namespace(tool_cache=None),
+        build_variant=BuildVariant.debug,
+        cmake_generator=CMakeGenerator.ninja
+    )
+
+    # Half of the installed dependencies have different inputs
+    # from the current ones so that the changes are explained, and
+    # the installed files of the others are checked.
+    for i, dependency in enumerate(project.dependencies):
+        inputs = dependency.resolve_inputs(
+            runner=runner,
+            build_dir=build_dir
+        )
+        library = os.path.join("lib", "lib{}.a".format(dependency.key))
+
+        if i % 2:
+            os.makedirs(
+                os.path.join(build_dir.dependencies, "lib"),
+                exist_ok=True
+            )
+            open(os.path.join(build_dir.dependencies, library), "w").close()
+        else:
+            inputs = dict(inputs, build_variant=BuildVariant.release.name)
+
+        build_dir.store_install(
+            key=dependency.key,
+            version=dependency.version,
+            fingerprint=fingerprint.compute(inputs),
+            inputs=inputs,
+            files=[library]
+        )
+
+    return (
+        lambda: [
+            dependency.should_install(runner=runner, build_dir=build_dir)
+            for dependency in project.dependencies
+        ],
+        None
+    )
+
+
+BENCHMARKS = [
+    Benchmark(name="shell.copytree", setup=_setup_copytree),
+    Benchmark(
+        name="shell.tar",
+        setup=lambda directory, args: _setup_tar(
+            directory=directory,
+            args=args,
+            members=None
+        )
+    ),
+    Benchmark(
+        name="shell.tar, members",
+        setup=lambda directory, args: _setup_tar(
+            directory=directory,
+            args=args,
+            members=["*/include/module1"]
+        )
+    ),
+    Benchmark(
+        name="preset.get_preset_options",
+        setup=lambda directory, args: _setup_presets(
+            directory=directory,
+            args=args,
+            cached=False
+        )
+    ),
+    Benchmark(
+        name="preset.get_preset_options, cached",
+        setup=lambda directory, args: _setup_presets(
+            directory=directory,
+            args=args,
+            cached=True
+        )
+    ),
+    Benchmark(name="Project.__init__", setup=_setup_project),
+    Benchmark(name="Dependency.should_install", setup=_setup_should_install)
+]
+
+
+def _measure(
+    function: Callable[[], None],
+    clean: Callable[[], None],
+    repeat: int
+) -> Dict:
+    """Runs the given function and gives the statistics of its
+    run times. The functions that are fast and need no cleaning
+    are run many times in each measured run.
+
+    Args:
+        function (Callable): The function that is measured.
+        clean (Callable): The optional function that removes the
+            output of the previous run.
+        repeat (int): The number of the measured runs.
+
+    Returns:
+        A 'dict' that contains the run times of a single call in
+        seconds.
+    """
+    loops = 1
+
+    if not clean:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        loops = max(1, int(MINIMUM_RUN_TIME / elapsed)) if elapsed else 1000
+
+    times = []
+
+    for _ in range(repeat):
+        if clean:
+            clean()
+
+        start = time.perf_counter()
+
+        for _ in range(loops):
+            function()
+
+        times.append((time.perf_counter() - start) / loops)
+
+    if clean:
+        clean()
+
+    return {
+        "best": min(times),
+        "median": statistics.median(times),
+        "loops": loops,
+        "times": times
+    }
+
+
+def _run(args: Namespace) -> Dict:
+    """Runs the selected benchmarks and prints their results.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        A 'dict' that contains the results that can be saved.
+    """
+    results = {}
+
+    print("{:>28} {:>12} {:>12} {:>8}".format(
+        "benchmark",
+        "best (s)",
+        "median (s)",
+        "loops"
+    ))
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmp_dir:
+        for benchmark in BENCHMARKS:
+            if args.filter and args.filter not in benchmark.name:
+                continue
+
+            directory = os.path.join(
+                tmp_dir,
+                benchmark.name.split(",")[0].replace(".", "-")
+            )
+
+            os.makedirs(directory, exist_ok=True)
+
+            function, clean = benchmark.setup(directory=directory, args=args)
+            result = _measure(
+                function=function,
+                clean=clean,
+                repeat=args.repeat
+            )
+            results[benchmark.name] = result
+
+            print("{:>28} {:>12.6f} {:>12.6f} {:>8}".format(
+                benchmark.name,
+                result["best"],
+                result["median"],
+                result["loops"]
+            ))
+
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "files": args.files,
+            "archive_size": args.archive_size,
+            "preset_depth": args.preset_depth,
+            "dependencies": args.dependencies
+        },
+        "results": results
+    }
+
+
+def _compare(baseline: Dict, current: Dict, threshold: float) -> bool:
+    """Compares the results to the saved results of an earlier run
+    and prints the comparison. The best times are compared as
+    they are the least affected by the noise of the machine.
+
+    Args:
+        baseline (dict): The saved results.
+        current (dict): The results of this run.
+        threshold (float): The allowed relative slowdown.
+
+    Returns:
+        A 'bool' that tells whether none of the benchmarks has
+        become slower than the threshold allows.
+    """
+    if baseline.get("parameters") != current["parameters"]:
+        print(
+            "The saved results were run with different parameters: {}".format(
+                baseline.get("parameters")
+            )
+        )
+
+    print()
+    print("{:>28} {:>12} {:>12} {:>8}".format(
+        "benchmark",
+        "saved (s)",
+        "now (s)",
+        "change"
+    ))
+
+    passed = True
+
+    for name, result in current["results"].items():
+        if name not in baseline.get("results", {}):
+            continue
+
+        saved = baseline["results"][name]["best"]
+        change = result["best"] / saved - 1 if saved else 0.0
+        regressed = change > threshold
+
+        if regressed:
+            passed = False
+
+        print("{:>28} {:>12.6f} {:>12.6f} {:>+7.1%}{}".format(
+            name,
+            saved,
+            result["best"],
+            change,
+            " slower" if regressed else ""
+        ))
+
+    return passed
+
+
+def main() -> None:
+    """Runs the benchmarks and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k",
+        "--filter",
+        help="run only the benchmarks whose names contain the given text"
+    )
+    parser.add_argument(
+        "--directory",
+        default=tempfile.gettempdir(),
+        help="the directory the fixtures are created in (default: the "
+             "temporary directory)"
+    )
+    parser.add_argument(
+        "--files",
+        default=5000,
+        type=int,
+        help="the number of the files in the tree (default: 5000)"
+    )
+    parser.add_argument(
+        "--archive-size",
+        default=256,
+        type=int,
+        help="the size of the files in the archive in mebibytes (default: "
+             "256)"
+    )
+    parser.add_argument(
+        "--preset-depth",
+        default=200,
+        type=int,
+        help="the length of the chain of mix-in presets (default: 200)"
+    )
+    parser.add_argument(
+        "--dependencies",
+        default=300,
+        type=int,
+        help="the number of the dependencies in the project file (default: "
+             "300)"
+    )
+    parser.add_argument(
+        "--repeat",
+        default=5,
+        type=int,
+        help="the number of the measured runs of each benchmark (default: 5)"
+    )
+    parser.add_argument(
+        "--save",
+        metavar="FILE",
+        help="save the results to the given file"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="compare the results to the results saved in the given file"
+    )
+    parser.add_argument(
+        "--threshold",
+        default=0.1,
+        type=float,
+        help="the relative slowdown that is allowed in the comparison "
+             "(default: 0.1)"
+    )
+    args = parser.parse_args()
+
+    results = _run(args=args)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if not _compare(
+            baseline=baseline,
+            current=results,
+            threshold=args.threshold
+        ):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
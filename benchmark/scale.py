@@ -0,0 +1,554 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A benchmark that measures how the overhead of the build script
+scales with the number of the dependencies of the project.
+
+The benchmark generates a project root with a 'CMakeLists.txt', a
+'product.json' with the given number of dependencies of every
+kind, and a 'util/composer-presets.ini'. The source archives and
+the Git repositories of the dependencies are served from a local
+HTTP server that replaces GitHub, so nothing is downloaded from
+the network. The configuring and the composing modes are run
+through 'Invocation' twice each, first from scratch and then with
+nothing to do, and the wall time, the CPU time, and the peak
+resident set size of the build script are measured.
+
+Run it from the root of the repository. CMake, Ninja, Git, and a C
+and a C++ compiler must be installed:
+
+    python -m benchmark.scale --dependencies 10 50 100
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+from argparse import Namespace
+
+from typing import Dict, List
+
+from .server import serve
+
+
+# The kinds of the dependencies in the generated project. Every
+# kind is installed differently by the build script.
+KINDS = ["copy", "symlink", "shared", "git", "binary"]
+
+# The owner of the generated repositories of the dependencies.
+OWNER = "benchmark"
+
+# The name of the repository directory of the generated project.
+REPOSITORY = "project"
+
+# The phases of the benchmark: the run mode and whether there is
+# nothing left to do for it.
+PHASES = [
+    ("configure", False),
+    ("configure", True),
+    ("compose", False),
+    ("compose", True)
+]
+
+PRESETS = """[benchmark]
+build-variant = debug
+cmake-generator = ninja
+
+[configure:benchmark]
+install-mode = copy
+
+[compose:benchmark]
+std = cpp17
+"""
+
+PROJECT_CMAKE = """cmake_minimum_required(VERSION 3.10)
+project(Benchmark CXX)
+add_executable(benchmark main.cpp)
+install(TARGETS benchmark DESTINATION bin)
+"""
+
+DEPENDENCY_CMAKE = """cmake_minimum_required(VERSION 3.10)
+project({key} C)
+add_library({key} STATIC {key}.c)
+install(TARGETS {key} DESTINATION lib)
+install(FILES {key}.h DESTINATION include)
+"""
+
+
+def _add_file(archive: tarfile.TarFile, name: str, content: str) -> None:
+    """Adds a file with the given contents to the archive.
+
+    Args:
+        archive (TarFile): The archive.
+        name (str): The name of the file in the archive.
+        content (str): The contents of the file.
+    """
+    data = content.encode("utf-8")
+    info = tarfile.TarInfo(name=name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    archive.addfile(info, io.BytesIO(data))
+
+
+def _resolve_sources(key: str, kind: str) -> Dict[str, str]:
+    """Gives the source files of the given dependency.
+
+    Args:
+        key (str): The key of the dependency.
+        kind (str): The kind of the dependency.
+
+    Returns:
+        A 'dict' that maps the paths of the files to their
+        contents.
+    """
+    header = "#pragma once\nint {}_value(void);\n".format(key)
+
+    if kind == "binary":
+        return {
+            "CMakeLists.txt": DEPENDENCY_CMAKE.format(key=key),
+            "{}.h".format(key): header,
+            "{}.c".format(key): "int {}_value(void) {{ return 1; }}\n".format(
+                key
+            )
+        }
+
+    sources = {"README.md": "# {}\n".format(key)}
+
+    for i in range(8):
+        sources["include/{}/header{}.h".format(key, i)] = header
+
+    return sources
+
+
+def _create_archive(served: str, key: str, kind: str, version: str) -> str:
+    """Creates the source archive of the given dependency in the
+    layout of the API of GitHub.
+
+    Args:
+        served (str): The directory that is served.
+        key (str): The key of the dependency.
+        kind (str): The kind of the dependency.
+        version (str): The version of the dependency.
+
+    Returns:
+        An 'str' that is the SHA-256 checksum of the archive.
+    """
+    path = os.path.join(
+        served,
+        "repos",
+        OWNER,
+        key,
+        "tarball",
+        "refs",
+        "tags",
+        "v{}".format(version)
+    )
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # The archives of GitHub have the sources in a single
+    # top-level directory that has a generated name.
+    root = "{}-{}-0000000".format(OWNER, key)
+
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in _resolve_sources(key=key, kind=kind).items():
+            _add_file(
+                archive=archive,
+                name="{}/{}".format(root, name),
+                content=content
+            )
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _create_git_repository(served: str, directory: str, key: str) -> str:
+    """Creates the Git repository of the given dependency that can
+    be cloned from the local server.
+
+    Args:
+        served (str): The directory that is served.
+        directory (str): The directory where the working copy is
+            created.
+        key (str): The key of the dependency.
+
+    Returns:
+        An 'str' that is the commit the dependency uses.
+    """
+    working_copy = os.path.join(directory, key)
+
+    for name, content in _resolve_sources(key=key, kind="git").items():
+        path = os.path.join(working_copy, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _git(*args: str, cwd: str = working_copy) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=Benchmark", "-c", "user.email=@"]
+            + list(args),
+            cwd=cwd,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        ).stdout.decode("utf-8").strip()
+
+    _git("init", "-q")
+    _git("add", "-A")
+    _git("commit", "-q", "-m", "Add the sources")
+
+    bare = os.path.join(served, OWNER, "{}.git".format(key))
+
+    os.makedirs(os.path.dirname(bare), exist_ok=True)
+    _git("clone", "-q", "--bare", working_copy, bare)
+
+    # The local server can only serve the repository over the
+    # dumb HTTP protocol.
+    _git("update-server-info", cwd=bare)
+
+    return _git("rev-parse", "HEAD")
+
+
+def _create_project(
+    root: str,
+    served: str,
+    dependencies: int,
+    kinds: List[str]
+) -> None:
+    """Creates the project and the files of its dependencies that
+    are served from the local server.
+
+    Args:
+        root (str): The root directory of the invocation.
+        served (str): The directory that is served.
+        dependencies (int): The number of the dependencies.
+        kinds (list): The kinds of the dependencies.
+    """
+    project_dir = os.path.join(root, REPOSITORY)
+
+    os.makedirs(os.path.join(project_dir, "util", "bin"))
+
+    with open(os.path.join(project_dir, "CMakeLists.txt"), "w") as f:
+        f.write(PROJECT_CMAKE)
+
+    with open(os.path.join(project_dir, "main.cpp"), "w") as f:
+        f.write("int main() { return 0; }\n")
+
+    with open(os.path.join(project_dir, "util", "composer-presets.ini"), "w") \
+            as f:
+        f.write(PRESETS)
+
+    data = {
+        "benchmark": {"name": "Benchmark", "version": "0.1.0"},
+        "opengl": {"version": "4.6"},
+        "dependencies": {}
+    }
+
+    for i in range(dependencies):
+        kind = kinds[i % len(kinds)]
+        key = "{}{}".format(kind, i)
+        version = "1.{}.0".format(i)
+        entry = {
+            "name": "Dependency {}".format(i),
+            "version": version,
+            "repository": "{}/{}".format(OWNER, key)
+        }
+
+        # The dependencies form short chains so that some of them
+        # must wait for the others.
+        if i % 4:
+            previous = i - 1
+            entry["dependsOn"] = "{}{}".format(
+                kinds[previous % len(kinds)],
+                previous
+            )
+
+        if kind == "git":
+            entry["commit"] = _create_git_repository(
+                served=served,
+                directory=os.path.join(root, "repositories"),
+                key=key
+            )
+        else:
+            entry["sha256"] = _create_archive(
+                served=served,
+                key=key,
+                kind=kind,
+                version=version
+            )
+
+        if kind == "binary":
+            entry["binary"] = True
+        else:
+            entry["files"] = ["include/{}".format(key)]
+
+        if kind == "symlink":
+            entry["installMode"] = "symlink"
+        elif kind == "shared":
+            entry["variantIndependent"] = True
+
+        data["dependencies"][key] = entry
+
+    with open(os.path.join(project_dir, "product.json"), "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _invoke(result_file: str, command: List[str]) -> None:
+    """Runs the build script through 'Invocation' in this process
+    and writes the resource usage of the run to the given file.
+    This is run in a subprocess of the benchmark so that the
+    usage of each run is measured separately.
+
+    Args:
+        result_file (str): The file the resource usage is written
+            to.
+        command (list): The command line arguments of the build
+            script.
+    """
+    from couplet_composer.invocation import Invocation
+    from couplet_composer.__version__ import __version__
+
+    sys.argv = ["couplet-composer"] + command
+
+    try:
+        exit_code = Invocation(version=__version__, name="Couplet Composer")()
+    except SystemExit as e:
+        exit_code = e.code
+
+    script = resource.getrusage(resource.RUSAGE_SELF)
+    tools = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    # The peak resident set size is in kibibytes on Linux and in
+    # bytes on macOS.
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+
+    with open(result_file, "w") as f:
+        json.dump(
+            {
+                "exit_code": exit_code,
+                "script_cpu": script.ru_utime + script.ru_stime,
+                "tools_cpu": tools.ru_utime + tools.ru_stime,
+                "peak_rss": script.ru_maxrss * rss_unit
+            },
+            f
+        )
+
+    sys.exit(exit_code or 0)
+
+
+def _run_phase(
+    root: str,
+    run_mode: str,
+    options: List[str],
+    log_file: str
+) -> Dict:
+    """Runs the build script in a subprocess and gives the
+    measurements of the run.
+
+    Args:
+        root (str): The root directory of the invocation.
+        run_mode (str): The run mode of the build script.
+        options (list): The command line options of the build
+            script.
+        log_file (str): The file the output of the run is written
+            to.
+
+    Returns:
+        A 'dict' that contains the measurements.
+    """
+    result_file = "{}.json".format(log_file)
+    env = dict(os.environ)
+
+    # The build script and the benchmark are imported from the
+    # repository although the invocation is run in the project
+    # root.
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.getcwd()] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+    )
+
+    start = time.perf_counter()
+
+    with open(log_file, "w") as f:
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmark.scale",
+                "--invoke",
+                result_file,
+                run_mode
+            ] + options,
+            cwd=root,
+            env=env,
+            stdout=f,
+            stderr=subprocess.STDOUT
+        )
+
+    wall_time = time.perf_counter() - start
+
+    if process.returncode != 0 or not os.path.isfile(result_file):
+        with open(log_file) as f:
+            print(f.read()[-4000:], file=sys.stderr)
+
+        raise RuntimeError("The {} mode failed, see {}".format(
+            run_mode,
+            log_file
+        ))
+
+    with open(result_file) as f:
+        result = json.load(f)
+
+    result["wall_time"] = wall_time
+
+    return result
+
+
+def _run(args: Namespace, dependencies: int, directory: str) -> List[Dict]:
+    """Runs the benchmark for the project with the given number of
+    the dependencies and prints the results.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+        dependencies (int): The number of the dependencies.
+        directory (str): The directory of the benchmark.
+
+    Returns:
+        A 'list' of the results of the phases.
+    """
+    root = os.path.join(directory, "root")
+    served = os.path.join(directory, "served")
+    logs = os.path.join(directory, "logs")
+
+    os.makedirs(served)
+    os.makedirs(logs)
+
+    _create_project(
+        root=root,
+        served=served,
+        dependencies=dependencies,
+        kinds=args.kinds
+    )
+
+    results = []
+
+    with serve(directory=served) as url:
+        options = [
+            "--repository",
+            REPOSITORY,
+            "--jobs",
+            str(args.jobs),
+            "--cache-dir",
+            os.path.join(directory, "cache"),
+            "--github-url",
+            url,
+            "--github-api-url",
+            url
+        ]
+
+        for i, (run_mode, up_to_date) in enumerate(PHASES):
+            result = _run_phase(
+                root=root,
+                run_mode=run_mode,
+                options=options,
+                log_file=os.path.join(logs, "{}-{}.log".format(i, run_mode))
+            )
+            result.update({
+                "dependencies": dependencies,
+                "phase": "{}{}".format(
+                    run_mode,
+                    ", no-op" if up_to_date else ""
+                )
+            })
+            results.append(result)
+
+            print(
+                "{:>12} {:>18} {:>10.2f} {:>12.2f} {:>12.2f} {:>10.1f}".format(
+                    dependencies,
+                    result["phase"],
+                    result["wall_time"],
+                    result["script_cpu"],
+                    result["tools_cpu"],
+                    result["peak_rss"] / (1024 * 1024)
+                )
+            )
+
+    return results
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results.
+    """
+    # The subprocesses of the benchmark run the build script.
+    if len(sys.argv) > 2 and sys.argv[1] == "--invoke":
+        _invoke(result_file=sys.argv[2], command=sys.argv[3:])
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dependencies",
+        default=[10, 50, 100],
+        type=int,
+        nargs="+",
+        help="the numbers of the dependencies of the generated projects "
+             "(default: 10 50 100)"
+    )
+    parser.add_argument(
+        "--kinds",
+        default=KINDS,
+        choices=KINDS,
+        nargs="+",
+        help="the kinds of the dependencies (default: all of them)"
+    )
+    parser.add_argument(
+        "--jobs",
+        default=os.cpu_count(),
+        type=int,
+        help="the number of the parallel jobs of the build script"
+    )
+    parser.add_argument(
+        "--directory",
+        default=tempfile.gettempdir(),
+        help="the directory the projects are generated in (default: the "
+             "temporary directory)"
+    )
+    parser.add_argument(
+        "--save",
+        metavar="FILE",
+        help="save the results to the given file"
+    )
+    args = parser.parse_args()
+
+    print("{:>12} {:>18} {:>10} {:>12} {:>12} {:>10}".format(
+        "dependencies",
+        "phase",
+        "wall (s)",
+        "script (s)",
+        "tools (s)",
+        "RSS (MiB)"
+    ))
+
+    results = []
+
+    for dependencies in args.dependencies:
+        with tempfile.TemporaryDirectory(dir=args.directory) as tmp_dir:
+            results.extend(_run(
+                args=args,
+                dependencies=dependencies,
+                directory=tmp_dir
+            ))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"kinds": args.kinds, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A benchmark that compares downloading a large file over one
+connection to downloading it in parallel ranges from a local
+server that limits the transfer rate of each connection.
+
+Run it from the root of the repository:
+
+    python -m benchmark.segmented_download
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from couplet_composer.util import http
+
+from .server import serve
+
+
+def _run(url: str, destination: str, segments: int) -> float:
+    """Downloads the file once and gives the time it took.
+
+    Args:
+        url (str): The URL of the file.
+        destination (str): The path the file is downloaded to.
+        segments (int): The number of the parallel ranges.
+
+    Returns:
+        A 'float' that is the time in seconds.
+    """
+    if os.path.exists(destination):
+        os.remove(destination)
+
+    start = time.perf_counter()
+    http.stream(
+        url=url,
+        destination=destination,
+        segments=segments,
+        segment_threshold=0
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size",
+        default=64,
+        type=int,
+        help="the size of the downloaded file in mebibytes (default: 64)"
+    )
+    parser.add_argument(
+        "--rate",
+        default=16,
+        type=int,
+        help="the transfer rate limit of a connection in mebibytes per "
+             "second (default: 16)"
+    )
+    parser.add_argument(
+        "--segments",
+        default=[1, 2, 4, 8],
+        type=int,
+        nargs="+",
+        help="the numbers of the ranges to compare (default: 1 2 4 8)"
+    )
+    parser.add_argument(
+        "--repeat",
+        default=3,
+        type=int,
+        help="the number of the runs for each number of the ranges"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        served = os.path.join(tmp_dir, "served")
+        os.makedirs(served)
+
+        with open(os.path.join(served, "clang+llvm.tar.xz"), "wb") as f:
+            for _ in range(args.size):
+                f.write(os.urandom(1024 * 1024))
+
+        destination = os.path.join(tmp_dir, "download", "clang+llvm.tar.xz")
+
+        with serve(directory=served, rate=args.rate * 1024 * 1024) as root:
+            url = "{}/clang+llvm.tar.xz".format(root)
+            baseline = None
+
+            print("{:>8} {:>10} {:>10} {:>8}".format(
+                "ranges",
+                "best (s)",
+                "MiB/s",
+                "speedup"
+            ))
+
+            for segments in args.segments:
+                best = min(
+                    _run(url=url, destination=destination, segments=segments)
+                    for _ in range(args.repeat)
+                )
+                baseline = baseline or best
+                print("{:>8} {:>10.2f} {:>10.1f} {:>7.2f}x".format(
+                    segments,
+                    best,
+                    args.size / best,
+                    baseline / best
+                ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains a local HTTP server for the benchmarks.
+The server serves the files in a directory, accepts single byte
+ranges, and can limit the transfer rate of each connection like
+the content delivery networks often do.
+"""
+
+import os
+import re
+import threading
+import time
+
+from contextlib import contextmanager
+
+from functools import partial
+
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """A class for creating the handlers of the requests to the
+    local benchmark server.
+
+    Attributes:
+        rate (int): The maximum transfer rate of a connection in
+            bytes per second, or None for no limit.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, *args, rate: int = None, **kwargs) -> None:
+        self.rate = rate
+        self._range = None
+        super().__init__(*args, **kwargs)
+
+    def send_head(self):
+        """Sends the response code and the headers, and gives the
+        file object of the body.
+        """
+        path = self.translate_path(self.path)
+
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return None
+
+        size = os.path.getsize(path)
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else size - 1
+
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */{}".format(size))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+
+            end = min(end, size - 1)
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                "bytes {}-{}/{}".format(start, end, size)
+            )
+        else:
+            start = 0
+            end = size - 1
+            self.send_response(200)
+
+        self._range = (start, end)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        f = open(path, "rb")
+        f.seek(start)
+        return f
+
+    def copyfile(self, source, outputfile) -> None:
+        """Copies the requested range of the file to the
+        connection and limits the transfer rate if needed.
+        """
+        start, end = self._range
+        remaining = end - start + 1
+        block_size = 64 * 1024
+        began = time.monotonic()
+        sent = 0
+
+        while remaining > 0:
+            block = source.read(min(block_size, remaining))
+            if not block:
+                break
+            try:
+                outputfile.write(block)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client closes the connection of the first
+                # response when it switches to the ranges.
+                self.close_connection = True
+                return
+            remaining -= len(block)
+            sent += len(block)
+
+            if self.rate:
+                ahead = sent / self.rate - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@contextmanager
+def serve(directory: str, rate: int = None) -> str:
+    """Serves the given directory from a local HTTP server while
+    the context is active.
+
+    Args:
+        directory (str): The directory that is served.
+        rate (int): The maximum transfer rate of a connection in
+            bytes per second, or None for no limit.
+
+    Returns:
+        An 'str' that is the root URL of the server.
+    """
+    httpd = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        partial(RangeRequestHandler, directory=directory, rate=rate)
+    )
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield "http://127.0.0.1:{}".format(httpd.server_port)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -5,7 +5,7 @@
 the command line arguments and options of the build script.
 """
 
-import multiprocessing
+import os
 
 from argparse import ArgumentParser
 
@@ -13,17 +13,36 @@ from .support.build_variant import BuildVariant
 
 from .support.cmake_generator import CMakeGenerator
 
+from .support.compiler_launcher import CompilerLauncher
+
 from .support.command_line import DESCRIPTION, EPILOG
 
 from .support.cpp_standard import CppStandard
 
+from .support.install_mode import InstallMode
+
 from .support.run_mode import RunMode
 
+from .support import environment
+
 from .target import Target
 
 from .__version__ import __version__
 
 
+def _mebibytes(value: str) -> int:
+    """Converts the given command line value in mebibytes to
+    bytes.
+
+    Args:
+        value (str): The command line value.
+
+    Returns:
+        An 'int' that is the number of the bytes.
+    """
+    return int(float(value) * 1024 * 1024)
+
+
 def _add_common_arguments(parser: ArgumentParser) -> ArgumentParser:
     """Modifies the given arguments parser by adding the common
     command line options to it.
@@ -56,7 +75,7 @@ def _add_common_arguments(parser: ArgumentParser) -> ArgumentParser:
     parser.add_argument(
         "-j",
         "--jobs",
-        default=multiprocessing.cpu_count(),
+        default=os.cpu_count() or 1,
         type=int,
         help="specify the number of parallel build jobs to use"
     )
@@ -72,6 +91,12 @@ def _add_common_arguments(parser: ArgumentParser) -> ArgumentParser:
         action="store_true",
         help="print the debug-level logging output"
     )
+    parser.add_argument(
+        "--trace",
+        help="write the phases of the run as a trace in the trace event "
+             "format of Chrome to the given file",
+        metavar="FILE"
+    )
     parser.add_argument(
         "--repository",
         default="unsung-anthem",
@@ -79,6 +104,79 @@ def _add_common_arguments(parser: ArgumentParser) -> ArgumentParser:
              "being built"
     )
 
+    # --------------------------------------------------------- #
+    # Cache options
+
+    cache_group = parser.add_mutually_exclusive_group(required=False)
+
+    default_cache_dir = environment.get_default_cache_dir()
+
+    parser.set_defaults(cache_dir=default_cache_dir)
+
+    cache_group.add_argument(
+        "--cache-dir",
+        default=default_cache_dir,
+        help="use the given directory for the persistent caches that are "
+             "shared between the build directories (default: {})".format(
+                 default_cache_dir
+             ),
+        metavar="PATH",
+        dest="cache_dir"
+    )
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_const",
+        const=None,
+        help="don't use the persistent caches",
+        dest="cache_dir"
+    )
+
+    parser.add_argument(
+        "--remote-cache",
+        help="use the remote cache at the given URL in addition to the "
+             "persistent caches",
+        metavar="URL"
+    )
+    parser.add_argument(
+        "--remote-cache-read-only",
+        action="store_true",
+        help="only read from the remote cache and don't upload to it"
+    )
+
+    # --------------------------------------------------------- #
+    # Download options
+
+    parser.add_argument(
+        "--download-segments",
+        default=4,
+        type=int,
+        help="download the large files in the given number of parallel "
+             "ranges if the server accepts ranges (default: 4)",
+        metavar="N"
+    )
+    parser.add_argument(
+        "--download-segment-threshold",
+        default=_mebibytes("32"),
+        type=_mebibytes,
+        help="download the files larger than the given size in mebibytes in "
+             "parallel ranges (default: 32)",
+        metavar="MIB"
+    )
+    parser.add_argument(
+        "--github-url",
+        default=environment.GITHUB_URL,
+        help="download the releases and clone the repositories from GitHub at "
+             "the given URL (default: {})".format(environment.GITHUB_URL),
+        metavar="URL"
+    )
+    parser.add_argument(
+        "--github-api-url",
+        default=environment.GITHUB_API_URL,
+        help="download the source archives from the API of GitHub at the "
+             "given URL (default: {})".format(environment.GITHUB_API_URL),
+        metavar="URL"
+    )
+
     return parser
 
 
@@ -219,6 +317,33 @@ def _add_common_build_arguments(parser: ArgumentParser) -> ArgumentParser:
         dest="cmake_generator"
     )
 
+    # --------------------------------------------------------- #
+    # Compiler cache options
+
+    compiler_cache_group = parser.add_argument_group("Compiler cache options")
+
+    default_compiler_cache = CompilerLauncher.auto.name
+
+    compiler_cache_group.add_argument(
+        "--compiler-cache",
+        default=default_compiler_cache,
+        choices=[name for name, value in CompilerLauncher.__members__.items()],
+        help="use the given compiler cache as the compiler launcher of the "
+             "builds (default: {})".format(default_compiler_cache)
+    )
+    compiler_cache_group.add_argument(
+        "--compiler-cache-dir",
+        help="use the given directory as the directory of the compiler cache "
+             "(default: the 'compilers' directory in the persistent caches)",
+        metavar="PATH"
+    )
+    compiler_cache_group.add_argument(
+        "--compiler-cache-size",
+        help="limit the size of the compiler cache to the given size, for "
+             "example '10G'",
+        metavar="SIZE"
+    )
+
     return parser
 
 
@@ -248,6 +373,9 @@ def create_args_parser() -> ArgumentParser:
     compose = _add_common_build_arguments(  # noqa: F841
         _add_common_arguments(subparsers.add_parser(RunMode.compose.value))
     )
+    serve_cache = _add_common_arguments(  # noqa: F841
+        subparsers.add_parser(RunMode.serve_cache.value)
+    )
 
     # --------------------------------------------------------- #
     # Preset: Positional arguments
@@ -289,6 +417,68 @@ def create_args_parser() -> ArgumentParser:
         help="print the build-script invocation made by the preset, but don't "
              "run it"
     )
+    preset_group.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="run the build-script invocation made by the preset in a new "
+             "process instead of the current one",
+        dest="preset_subprocess"
+    )
+
+    # --------------------------------------------------------- #
+    # Serve cache: Server options
+
+    server_group = serve_cache.add_argument_group("Server options")
+
+    server_group.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="listen on the given address (default: 127.0.0.1)"
+    )
+    server_group.add_argument(
+        "--port",
+        default=8765,
+        type=int,
+        help="listen on the given port (default: 8765)"
+    )
+    server_group.add_argument(
+        "--directory",
+        help="serve the remote cache from the given directory (default: "
+             "the 'remote' directory in the persistent caches)",
+        metavar="PATH",
+        dest="cache_server_directory"
+    )
+    server_group.add_argument(
+        "--read-only",
+        action="store_true",
+        help="reject the uploads to the remote cache"
+    )
+
+    # --------------------------------------------------------- #
+    # Configure: Install options
+
+    default_install_mode = InstallMode.copy.name
+
+    configure.add_argument(
+        "--install-mode",
+        default=default_install_mode,
+        choices=[name for name, value in InstallMode.__members__.items()],
+        help="install the files of the dependencies by copying them or by "
+             "linking them from the persistent store of the extracted "
+             "sources (default: {})".format(default_install_mode)
+    )
+    configure.add_argument(
+        "--clean-shared",
+        action="store_true",
+        help="when cleaning, also remove the tools and the dependencies that "
+             "are shared between the build variants of the target"
+    )
+    configure.add_argument(
+        "--explain",
+        action="store_true",
+        help="print why the dependencies are installed again or why they "
+             "aren't"
+    )
 
     # --------------------------------------------------------- #
     # Compose: C++ standard options
@@ -328,6 +518,31 @@ def create_args_parser() -> ArgumentParser:
         dest="cpp_std"
     )
 
+    # --------------------------------------------------------- #
+    # Compose: Configure options
+
+    compose.add_argument(
+        "--explain",
+        action="store_true",
+        help="print why CMake is run again to configure the build or why it "
+             "isn't"
+    )
+
+    # --------------------------------------------------------- #
+    # Compose: Report options
+
+    compose.add_argument(
+        "--report",
+        action="store_true",
+        help="print the slowest compiles and links, the critical path, and "
+             "the parallelism of the build"
+    )
+    compose.add_argument(
+        "--report-json",
+        help="write the report of the build as JSON to the given file",
+        metavar="FILE"
+    )
+
     # --------------------------------------------------------- #
     # Compose: CMake options
 
@@ -7,15 +7,18 @@ acts on. These dependencies need to be built into binaries for
 linking.
 """
 
+import logging
 import os
 
-from typing import Any
+from typing import TYPE_CHECKING, Any, List
 
 from .support.cmake_generator import CMakeGenerator
 
+from .support.install_mode import InstallMode
+
 from .support.system import System
 
-from .util import shell
+from .util import fingerprint, shell
 
 from .build_directory import BuildDirectory
 
@@ -23,6 +26,9 @@ from .dependency import Dependency
 
 from .runner import Runner
 
+if TYPE_CHECKING:
+    from .util.artifact_cache import ArtifactCache
+
 
 class BinaryDependency(Dependency):
     """A class for creating objects that represent the
@@ -36,6 +42,10 @@ class BinaryDependency(Dependency):
             dependency.
     """
 
+    # The version of the layout of the artifacts that is a part of
+    # the fingerprint.
+    ARTIFACT_FORMAT = 1
+
     def __init__(
         self,
         key: str,
@@ -49,7 +59,11 @@ class BinaryDependency(Dependency):
         asset_name: str,
         repository: str,
         tag_prefix: str,
-        cmake_options: dict
+        depends_on: List[str],
+        sha256: str,
+        cmake_options: dict,
+        variant_independent: bool = None,
+        install_mode: InstallMode = None
     ) -> None:
         """Initializes the dependency object.
 
@@ -74,9 +88,20 @@ class BinaryDependency(Dependency):
                 dependency.
             tag_prefix (str): The prefix added before the
                 downloaded version to the Git tag name.
+            depends_on (list): The keys of the dependencies that
+                must be installed before this dependency.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded source archive of this dependency.
             cmake_options (dict): The optional extra CMake
                 options from the project's information file for
                 this dependency.
+            variant_independent (bool): Whether or not the
+                installed files of the dependency are the same in
+                every build variant. The default value of the
+                class is used if this is None.
+            install_mode (InstallMode): The optional mode of
+                installing the files of the dependency that
+                overrides the mode given on the command line.
         """
         super().__init__(
             key=key,
@@ -89,16 +114,174 @@ class BinaryDependency(Dependency):
             benchmark_only=benchmark_only,
             asset_name=asset_name,
             repository=repository,
-            tag_prefix=tag_prefix
+            tag_prefix=tag_prefix,
+            depends_on=depends_on,
+            sha256=sha256,
+            variant_independent=variant_independent,
+            install_mode=install_mode
         )
         self.cmake_options = cmake_options
 
+    def install(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> List[str]:
+        """Downloads, builds, and installs the dependency. The
+        installed files are restored from the artifact cache
+        instead if the dependency has been built with the same
+        inputs before.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'list' of the installed files relative to the
+            dependencies directory.
+        """
+        artifact_cache = self._resolve_artifact_cache(runner=runner)
+
+        if artifact_cache and artifact_cache.restore(
+            fingerprint=self._resolve_fingerprint(runner=runner),
+            destination=build_dir.dependencies
+        ):
+            logging.info(
+                "Installed %s from the artifact cache without building it",
+                self.name
+            )
+            return self._resolve_declared_files()
+
+        return super().install(runner=runner, build_dir=build_dir)
+
+    def resolve_required_tools(self, runner: Runner) -> List[str]:
+        """Gives the tools of the toolchain that installing the
+        dependency requires so that they can be prepared before
+        the installation needs them. No tools are required if the
+        dependency is restored from the local artifact cache.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            A 'list' of the names of the tools as they're used as
+            the attributes of the toolchain.
+        """
+        artifact_cache = self._resolve_artifact_cache(runner=runner)
+
+        if artifact_cache and os.path.exists(artifact_cache.resolve_entry(
+            fingerprint=self._resolve_fingerprint(runner=runner)
+        )):
+            return []
+
+        tools = super().resolve_required_tools(runner=runner) + ["cmake"]
+
+        # Ninja isn't needed by the other generators.
+        if runner.cmake_generator is CMakeGenerator.ninja:
+            tools.append("ninja")
+
+        return tools
+
+    def resolve_definition(self) -> dict:
+        """Gives the definition of the dependency in the project
+        file normalized for the current platform.
+
+        Returns:
+            A 'dict' that contains the definition.
+        """
+        definition = super().resolve_definition()
+        definition["cmake_options"] = self.cmake_options
+
+        return definition
+
+    def resolve_inputs(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> dict:
+        """Gives the inputs that affect the installed files of the
+        dependency. The dependency is installed again when their
+        fingerprint changes.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'dict' that contains the inputs.
+        """
+        inputs = super().resolve_inputs(runner=runner, build_dir=build_dir)
+        inputs["generator"] = runner.cmake_generator.name
+
+        return inputs
+
+    def _resolve_artifact_cache(self, runner: Runner) -> "ArtifactCache":
+        """Gives the artifact cache of the run.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            An 'ArtifactCache' that is the cache, or None if the
+            cache isn't used.
+        """
+        if runner.args.dry_run or not runner.args.cache_dir:
+            return None
+
+        from .util.artifact_cache import ArtifactCache
+        from .util.remote_cache import RemoteCache
+
+        return ArtifactCache(
+            root=runner.args.cache_dir,
+            remote=RemoteCache.from_args(runner.args)
+        )
+
+    def _resolve_fingerprint(self, runner: Runner) -> str:
+        """Computes the fingerprint of the inputs that affect the
+        installed files of the dependency. The install prefix is
+        included as the installed CMake package configurations and
+        pkg-config files contain it, and so are the fingerprints of
+        the installations of the dependencies that this dependency
+        is built against.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            An 'str' that is the fingerprint.
+        """
+        installs = runner.build_dir.installs
+
+        return fingerprint.compute({
+            "format": self.ARTIFACT_FORMAT,
+            "key": self.key,
+            "repository": "{}/{}".format(self.owner, self.repository),
+            "version": self.version,
+            "commit": self.commit,
+            "cmake_options": self.cmake_options,
+            "build_variant": runner.build_variant.name,
+            "target": str(runner.target),
+            "generator": runner.cmake_generator.name,
+            "compiler": fingerprint.compiler_identity(
+                cache=runner.toolchain.tool_cache
+            ),
+            "prefix": runner.build_dir.dependencies,
+            "depends_on": {
+                key: installs[key]["fingerprint"] if key in installs else None
+                for key in self.depends_on
+            }
+        })
+
     def _build(
         self,
         source_path: str,
         runner: Runner,
         build_dir: BuildDirectory
-    ) -> None:
+    ) -> List[str]:
         """Builds the dependency from the sources.
 
         Args:
@@ -108,6 +291,12 @@ class BinaryDependency(Dependency):
             build_dir (BuildDirectory): The build directory
                 object that is the main build directory of the
                 build script invocation.
+
+        Returns:
+            A 'list' of the installed files relative to the
+            dependencies directory as CMake lists them in its
+            install manifest, or None if the manifest can't be
+            read.
         """
         cmake_call = [
             runner.toolchain.cmake,
@@ -125,6 +314,7 @@ class BinaryDependency(Dependency):
             ])
 
         cmake_call.extend(["-G", runner.cmake_generator.value])
+        cmake_call.extend(runner.resolve_compiler_launcher_options())
 
         if self.cmake_options:
             for k, v in self.cmake_options.items():
@@ -136,9 +326,12 @@ class BinaryDependency(Dependency):
                     cmake_call.extend(["-D{}={}".format(k, v)])
 
         # TODO Add the C and C++ compilers to the environment
-        cmake_env = None
+        cmake_env = runner.resolve_compiler_cache_environment()
 
-        build_directory = os.path.join(build_dir.temporary, "build")
+        build_directory = os.path.join(
+            self._resolve_temporary_directory(build_dir=build_dir),
+            "build"
+        )
 
         if not os.path.isdir(build_directory):
             shell.makedirs(
@@ -161,12 +354,98 @@ class BinaryDependency(Dependency):
             # TODO Take into account all of the different build
             # systems.
             shell.call(
-                [runner.toolchain.ninja],
+                [
+                    runner.toolchain.ninja,
+                    "-j",
+                    str(runner.dependency_jobs)
+                ],
+                env=cmake_env,
                 dry_run=runner.args.dry_run,
                 echo=runner.args.verbose
             )
+
+            artifact_cache = self._resolve_artifact_cache(runner=runner)
+
+            if not artifact_cache:
+                shell.call(
+                    [runner.toolchain.ninja, "install"],
+                    dry_run=runner.args.dry_run,
+                    echo=runner.args.verbose
+                )
+                return self._read_install_manifest(
+                    build_directory=build_directory,
+                    prefix=build_dir.dependencies
+                )
+
+            # The files are installed to a separate directory so
+            # that only the files of this dependency are packed
+            # into the artifact.
+            install_directory = os.path.join(
+                self._resolve_temporary_directory(build_dir=build_dir),
+                "install"
+            )
+
+            # The files of an earlier build mustn't be packed into
+            # the artifact.
+            shell.rmtree(
+                install_directory,
+                dry_run=runner.args.dry_run,
+                echo=runner.args.verbose
+            )
+
             shell.call(
-                [runner.toolchain.ninja, "install"],
+                [
+                    runner.toolchain.cmake,
+                    "--install",
+                    ".",
+                    "--prefix",
+                    install_directory
+                ],
                 dry_run=runner.args.dry_run,
                 echo=runner.args.verbose
             )
+
+        artifact_cache.store(
+            fingerprint=self._resolve_fingerprint(runner=runner),
+            source=install_directory
+        )
+        shell.copytree(
+            install_directory,
+            build_dir.dependencies,
+            dry_run=runner.args.dry_run,
+            echo=runner.args.verbose
+        )
+
+        return self._read_install_manifest(
+            build_directory=build_directory,
+            prefix=install_directory
+        )
+
+    @staticmethod
+    def _read_install_manifest(
+        build_directory: str,
+        prefix: str
+    ) -> List[str]:
+        """Reads the files that CMake has installed from the
+        install manifest in the build directory.
+
+        Args:
+            build_directory (str): The build directory of the
+                dependency.
+            prefix (str): The directory that the files were
+                installed to.
+
+        Returns:
+            A 'list' of the installed files relative to the given
+            directory, or None if the manifest can't be read.
+        """
+        try:
+            with open(
+                os.path.join(build_directory, "install_manifest.txt")
+            ) as f:
+                return [
+                    os.path.relpath(line.strip(), prefix)
+                    for line in f if line.strip()
+                ]
+        except OSError:
+            return None
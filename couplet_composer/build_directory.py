@@ -7,9 +7,11 @@ build directory of the build script.
 
 import argparse
 import json
+import logging
 import os
+import threading
 
-from typing import Any
+from typing import Any, List
 
 from .support.build_variant import BuildVariant
 
@@ -17,6 +19,10 @@ from .support.cmake_generator import CMakeGenerator
 
 from .util import shell
 
+from .util.lock import file_lock
+
+from .util.state import StateDatabase
+
 from .target import Target
 
 
@@ -34,6 +40,12 @@ class BuildDirectory:
             current build variant for creating paths.
         _generator (str): The string representation of the
             current CMake generator for creating paths.
+        _state (StateDatabase): The state database once it has
+            been opened.
+        _state_lock (Lock): The lock that makes sure that the
+            state database is opened only once.
+        _installs (dict): The installed dependencies once they
+            have been read.
 
     Attributes:
         path (str): The path to the build directory root of the
@@ -43,13 +55,28 @@ class BuildDirectory:
             configuration.
         dependencies (str): The root directory of the
             dependencies for the current configuration.
-        versions_file (str): The file where the locally installed
-            versions of the dependencies are.
+        shared_dependencies (str): The root directory of the
+            dependencies that are shared between the build
+            variants of the current target.
+        tools (str): The root directory of the tools for the
+            current target. The tools don't depend on the build
+            variant so they're shared between the variants.
+        versions_file (str): The file where the earlier versions
+            of the build script stored the locally installed
+            versions of the dependencies. The versions are moved
+            to the state database when they're read.
+        state_file (str): The database that holds the state of
+            the build directory.
         build (str): The path to the directory that is used to
             build the project.
         dest (str): The path to the directory where the build
             products are installed into.
         temporary (str): The temporary directory.
+        state (StateDatabase): The database that holds the state
+            of the build directory.
+        installs (dict): The installed dependencies for the
+            current configuration with their versions and the
+            fingerprints of their inputs.
         installed_versions (dict): The installed versions of the
             dependencies for the current configuration.
     """
@@ -91,19 +118,18 @@ class BuildDirectory:
                 variant=self._build_variant
             )
         )
-        self.tools = os.path.join(
+        self.shared_dependencies = os.path.join(
             self.local,
-            "bin",
-            "{target}-{variant}".format(
-                target=self._target,
-                variant=self._build_variant
-            )
+            "lib",
+            str(self._target)
         )
+        self.tools = os.path.join(self.local, "bin", str(self._target))
         versions_file_name = ".versions-{target}-{variant}".format(
             target=self._target,
             variant=self._build_variant
         )
         self.versions_file = os.path.join(self.local, versions_file_name)
+        self.state_file = os.path.join(self.local, "state.db")
         self.build = os.path.join(
             self.path,
             "build",
@@ -122,6 +148,71 @@ class BuildDirectory:
             )
         )
         self.docs_destination = os.path.join(self.destination, "docs")
+        self._state = None
+        self._state_lock = threading.Lock()
+        self._installs = None
+
+    def migrate_tools(self) -> None:
+        """Moves the tools that are installed to the directories
+        of the build variants by the earlier versions of the
+        build script to the shared tools directory of the target
+        so that they don't need to be installed again.
+        """
+        legacy_dirs = [
+            os.path.join(
+                self.local,
+                "bin",
+                "{target}-{variant}".format(
+                    target=self._target,
+                    variant=variant.name
+                )
+            ) for variant in BuildVariant
+        ]
+        legacy_dirs = [d for d in legacy_dirs if os.path.isdir(d)]
+
+        if not legacy_dirs:
+            return
+
+        if self._dry_run:
+            for legacy_dir in legacy_dirs:
+                shell.move(
+                    legacy_dir,
+                    self.tools,
+                    dry_run=self._dry_run,
+                    echo=self._verbose
+                )
+            return
+
+        with file_lock("{}.lock".format(self.tools)):
+            for legacy_dir in legacy_dirs:
+                logging.info(
+                    "Moving the tools in %s to %s",
+                    legacy_dir,
+                    self.tools
+                )
+
+                shell.makedirs(
+                    self.tools,
+                    dry_run=self._dry_run,
+                    echo=self._verbose
+                )
+
+                for item in os.listdir(legacy_dir):
+                    # The tools of the same version are identical
+                    # in every variant so the first one is kept.
+                    if not os.path.exists(os.path.join(self.tools, item)):
+                        shell.move(
+                            os.path.join(legacy_dir, item),
+                            os.path.join(self.tools, item),
+                            dry_run=self._dry_run,
+                            echo=self._verbose
+                        )
+
+                shell.rmtree(
+                    legacy_dir,
+                    dry_run=self._dry_run,
+                    echo=self._verbose
+                )
 
     def __getattr__(self, name) -> Any:
         """Gives the attributes of the build directory that
@@ -149,13 +240,172 @@ class BuildDirectory:
                 )
 
             return tmp_dir
+        elif "state" == name:
+            with self._state_lock:
+                if not self._state:
+                    self._state = StateDatabase(path=self.state_file)
+
+                return self._state
+        elif "installs" == name:
+            if self._installs is None:
+                self._installs = self._read_installs()
+
+            return self._installs
         elif "installed_versions" == name:
-            if not os.path.exists(self.versions_file):
-                return None
-            try:
-                with open(self.versions_file) as f:
-                    return json.load(f)
-            except OSError:
-                raise ValueError
+            return {
+                key: install["version"]
+                for key, install in self.installs.items()
+            }
         else:
             raise AttributeError
+
+    def _read_legacy_versions(self) -> dict:
+        """Reads the installed versions of the dependencies from
+        the file of the earlier versions of the build script.
+
+        Returns:
+            A 'dict' that contains the installed versions, or an
+            empty 'dict' if the file doesn't exist.
+
+        Throws:
+            ValueError: Is thrown if the file can't be read.
+        """
+        if not os.path.exists(self.versions_file):
+            return {}
+
+        try:
+            with open(self.versions_file) as f:
+                return json.load(f)
+        except OSError:
+            raise ValueError
+
+    def _read_installs(self) -> dict:
+        """Reads the installed dependencies of the current
+        configuration from the state database. The versions in the
+        file of the earlier versions of the build script are moved
+        to the database.
+
+        Returns:
+            A 'dict' that contains the installed dependencies.
+        """
+        legacy_versions = self._read_legacy_versions()
+
+        # The state database isn't created in a dry run.
+        if self._dry_run and not os.path.exists(self.state_file):
+            return {
+                key: {"version": version, "fingerprint": None, "inputs": None}
+                for key, version in legacy_versions.items()
+            }
+
+        installs = self.state.installs(
+            target=str(self._target),
+            variant=self._build_variant
+        )
+
+        if legacy_versions and not self._dry_run:
+            if not installs:
+                logging.info(
+                    "Moving the installed versions in %s to %s",
+                    self.versions_file,
+                    self.state_file
+                )
+
+                for key, version in legacy_versions.items():
+                    self.store_install(key=key, version=version)
+
+                installs = self.state.installs(
+                    target=str(self._target),
+                    variant=self._build_variant
+                )
+
+            shell.rm(self.versions_file, echo=self._verbose)
+
+        return installs
+
+    def store_install(
+        self,
+        key: str,
+        version: str,
+        fingerprint: str = None,
+        inputs: dict = None,
+        files: List[str] = None
+    ) -> None:
+        """Stores the given installed dependency of the current
+        configuration. Nothing is stored in a dry run.
+
+        Args:
+            key (str): The key of the dependency.
+            version (str): The installed version.
+            fingerprint (str): The fingerprint of the inputs of
+                the installation.
+            inputs (dict): The inputs of the installation.
+            files (list): The installed files relative to the
+                dependencies directory.
+        """
+        if self._dry_run:
+            return
+
+        self.state.store_install(
+            target=str(self._target),
+            variant=self._build_variant,
+            key=key,
+            version=version,
+            fingerprint=fingerprint,
+            inputs=inputs,
+            files=files
+        )
+
+        if self._installs is not None:
+            self._installs[key] = {
+                "version": version,
+                "fingerprint": fingerprint,
+                "inputs": inputs
+            }
+
+    def resolve_manifest(self, key: str) -> List[str]:
+        """Gives the installed files of the given dependency of
+        the current configuration.
+
+        Args:
+            key (str): The key of the dependency.
+
+        Returns:
+            A 'list' of the files relative to the dependencies
+            directory, or an empty list if they aren't known.
+        """
+        if self._dry_run and not os.path.exists(self.state_file):
+            return []
+
+        return self.state.manifest(
+            target=str(self._target),
+            variant=self._build_variant,
+            key=key
+        )
+
+    def clean_state(self, shared: bool = False) -> None:
+        """Removes the installed dependencies of the current
+        configuration from the state. Nothing is removed from the
+        state database in a dry run.
+
+        Args:
+            shared (bool): Whether the resolved tools of the
+                target, which are shared between the build
+                variants, are also removed.
+        """
+        shell.rm(
+            self.versions_file,
+            dry_run=self._dry_run,
+            echo=self._verbose
+        )
+
+        if self._dry_run:
+            return
+
+        self.state.clear_installs(
+            target=str(self._target),
+            variant=self._build_variant
+        )
+        if shared:
+            self.state.clear_tools(target=str(self._target))
+
+        self._installs = {}
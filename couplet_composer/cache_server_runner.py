@@ -0,0 +1,91 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the class for the objects that run the
+remote cache server mode of the build script.
+"""
+
+import logging
+import os
+import sys
+
+from .util import cache_server
+
+from .runner import Runner
+
+
+class CacheServerRunner(Runner):
+    """A class for creating callable objects that represent the
+    remote cache server mode runners of the build script.
+    """
+
+    DIRECTORY_NAME = "remote"
+
+    def __call__(self) -> int:
+        """Runs the run mode of this runner.
+
+        Returns:
+            An 'int' that is equal to the exit code of the run.
+        """
+        directory = self._resolve_directory()
+
+        if self.args.dry_run:
+            logging.info(
+                "Would serve the remote cache in %s at http://%s:%d",
+                directory,
+                self.args.host,
+                self.args.port
+            )
+            return 0
+
+        cache_server.serve(
+            directory=directory,
+            host=self.args.host,
+            port=self.args.port,
+            read_only=self.args.read_only
+        )
+
+        return 0
+
+    def _resolve_directory(self) -> str:
+        """Gives the directory the remote cache is served from.
+
+        Returns:
+            An 'str' that is the path to the directory.
+        """
+        if self.args.cache_server_directory:
+            return os.path.abspath(self.args.cache_server_directory)
+
+        if not self.args.cache_dir:
+            logging.critical(
+                "The remote cache server needs either the '--directory' "
+                "option or the persistent caches"
+            )
+            sys.exit(1)
+
+        return os.path.join(self.args.cache_dir, self.DIRECTORY_NAME)
+
+    def clean(self) -> None:
+        """Cleans the directories and files of the runner before
+        building when clean build is run.
+        """
+        pass
+
+    def caffeinate(
+        self,
+        command: list,
+        env: dict = None,
+        dry_run: bool = None,
+        echo: bool = None
+    ) -> None:
+        """Runs a command during which system sleep is disabled.
+
+        Args:
+            command (list): The command to call.
+            env (dict): Key-value pairs as the environment
+                variables.
+            dry_run (bool): Whether or not dry run is enabled.
+            echo (bool): Whether or not the command must be
+                printed.
+        """
+        pass
@@ -5,21 +5,30 @@
 composing run mode of the build script.
 """
 
+import json
 import logging
 import os
 
 from argparse import Namespace
 
+from typing import List
+
 from .support.cmake_generator import CMakeGenerator
 
 from .support.cpp_standard import CppStandard
 
-from .util import shell
+from .util import fingerprint, ninja_log, shell
+
+from .util.download_cache import file_sha256
+
+from .util.ninja_log import NinjaLog
 
 from .runner_proper import RunnerProper
 
 from .target import Target
 
+from .__version__ import __version__
+
 
 class ComposingRunner(RunnerProper):
     """A class for creating callable objects that represent the
@@ -29,6 +38,12 @@ class ComposingRunner(RunnerProper):
         cpp_std (CppStandard): The selected C++ standard.
     """
 
+    CMAKE_CACHE_FILE_NAME = "CMakeCache.txt"
+
+    # The scope of the fingerprints of the configurations in the
+    # state database.
+    CONFIGURATION_SCOPE = "configuration"
+
     def __init__(
         self,
         args: Namespace,
@@ -55,6 +70,10 @@ class ComposingRunner(RunnerProper):
         """
         super().__call__()
 
+        # The tools that are needed later in the run are prepared
+        # while CMake is found and run.
+        self.warm_up_toolchain(names=self._resolve_required_tools())
+
         if not os.path.isdir(self.build_dir.build):
             shell.makedirs(
                 self.build_dir.build,
@@ -119,6 +138,8 @@ class ComposingRunner(RunnerProper):
                 key
             ))
 
+        cmake_call.extend(self.resolve_compiler_launcher_options())
+
         if self.project.cmake_options:
             for key, value in self.project.cmake_options.items():
                 if isinstance(value, bool):
@@ -137,32 +158,62 @@ class ComposingRunner(RunnerProper):
                 "found, thus, the documentation isn't built"
             )
 
+        build_env = self.resolve_compiler_cache_environment()
+
+        self.zero_compiler_cache_stats()
+
+        configuration = self._resolve_configuration(
+            cmake_call=cmake_call,
+            env=build_env
+        )
+
         # TODO Run the lint before installing the docs
         with shell.pushd(self.build_dir.build):
-            shell.call(
-                cmake_call,
-                env=None,
-                dry_run=self.args.dry_run,
-                echo=self.args.verbose
-            )
+            if self._should_configure(configuration=configuration):
+                self._remove_configuration()
+                with self.step("configure"):
+                    shell.call(
+                        cmake_call,
+                        env=build_env,
+                        dry_run=self.args.dry_run,
+                        echo=self.args.verbose
+                    )
+                self._store_configuration(configuration=configuration)
+            build_log = NinjaLog(build_dir=self.build_dir.build) \
+                if self._should_report() else None
+
             # TODO Take into account all of the different build
             # systems.
-            shell.call(
-                [self.toolchain.ninja],
-                dry_run=self.args.dry_run,
-                echo=self.args.verbose
-            )
-            shell.call(
-                [self.toolchain.ninja, "install"],
-                dry_run=self.args.dry_run,
-                echo=self.args.verbose
-            )
+            with self.step("build"):
+                if build_log:
+                    build_log.start_build()
+                shell.call(
+                    [self.toolchain.ninja],
+                    env=build_env,
+                    dry_run=self.args.dry_run,
+                    echo=self.args.verbose
+                )
+
+            if build_log:
+                with self.step("report"):
+                    self._report_build(build_log=build_log)
+            with self.step("install"):
+                shell.call(
+                    [self.toolchain.ninja, "install"],
+                    env=build_env,
+                    dry_run=self.args.dry_run,
+                    echo=self.args.verbose
+                )
+
+            self.show_compiler_cache_stats()
 
             if self.args.lint:
-                self._run_linter()
+                with self.step("lint"):
+                    self._run_linter()
 
             if self.args.build_docs:
-                self._install_docs()
+                with self.step("docs"):
+                    self._install_docs()
 
         shell.copytree(
             os.path.join(
@@ -176,8 +227,204 @@ class ComposingRunner(RunnerProper):
             echo=self.args.verbose
         )
 
+        self.toolchain.finish_warm_up()
+
         return 0
 
+    def _resolve_required_tools(self) -> List[str]:
+        """Gives the tools of the toolchain that the run requires.
+
+        Returns:
+            A 'list' of the names of the tools as they're used as
+            the attributes of the toolchain.
+        """
+        tools = ["cmake"]
+
+        if self.cmake_generator is CMakeGenerator.ninja:
+            tools.append("ninja")
+
+        if self.args.build_docs:
+            tools.append("doxygen")
+
+        if self.args.lint:
+            tools.extend([
+                "clang_tidy",
+                self.toolchain.RUN_CLANG_TIDY_TOOL_NAME
+            ])
+
+        return tools
+
+    def _resolve_configuration(self, cmake_call: list, env: dict) -> dict:
+        """Gives the inputs of the configuration of the build.
+        CMake is run again only if they change. The changes to
+        the CMake files of the project aren't included as the
+        build system runs CMake again itself when they change.
+
+        Args:
+            cmake_call (list): The command that configures the
+                build.
+            env (dict): The environment variables of the
+                command.
+
+        Returns:
+            A 'dict' that contains the inputs.
+        """
+        product_json = os.path.join(
+            self.source_root,
+            self.args.repository,
+            "product.json"
+        )
+
+        return {
+            "version": __version__,
+            "command": [str(argument) for argument in cmake_call],
+            "environment": env or {},
+            "product": file_sha256(product_json)
+            if os.path.isfile(product_json) else None,
+            "compiler": fingerprint.compiler_identity(
+                cache=self.toolchain.tool_cache
+            )
+        }
+
+    def _explain_configuration(self, configuration: dict) -> List[str]:
+        """Gives the reasons why the build must be configured
+        again.
+
+        Args:
+            configuration (dict): The inputs of the
+                configuration.
+
+        Returns:
+            A 'list' that contains the reasons, or an empty list
+            if the build doesn't have to be configured.
+        """
+        if not os.path.isfile(os.path.join(
+            self.build_dir.build,
+            self.CMAKE_CACHE_FILE_NAME
+        )):
+            return ["the build directory doesn't contain {}".format(
+                self.CMAKE_CACHE_FILE_NAME
+            )]
+
+        # The state database isn't created in dry run.
+        previous = self.build_dir.state.fingerprint(
+            scope=self.CONFIGURATION_SCOPE,
+            key=self.build_dir.build
+        ) if os.path.exists(self.build_dir.state_file) \
+            or not self.args.dry_run else None
+
+        if not previous or not previous["inputs"]:
+            return ["the configuration of the previous run isn't known"]
+
+        if previous["fingerprint"] == fingerprint.compute(configuration):
+            return []
+
+        return fingerprint.explain(
+            previous=previous["inputs"],
+            current=configuration
+        ) or ["the fingerprint of the configuration changed"]
+
+    def _should_configure(self, configuration: dict) -> bool:
+        """Checks whether CMake must be run to configure the
+        build. The reasons are printed if '--explain' is used.
+
+        Args:
+            configuration (dict): The inputs of the
+                configuration.
+
+        Returns:
+            A 'bool' that tells whether the build must be
+            configured.
+        """
+        reasons = self._explain_configuration(configuration=configuration)
+        log = logging.info if self.args.explain else logging.debug
+
+        if not reasons:
+            log(
+                "The configuration of the build hasn't changed, skipping "
+                "CMake"
+            )
+            return False
+
+        log(
+            "Configuring the build because:\n%s",
+            "\n".join("  - {}".format(reason) for reason in reasons)
+        )
+
+        return True
+
+    def _remove_configuration(self) -> None:
+        """Removes the stored configuration of the previous run
+        so that a failed configuration isn't taken as up to date.
+        Nothing is removed in dry run.
+        """
+        if self.args.dry_run:
+            return
+
+        self.build_dir.state.remove_fingerprint(
+            scope=self.CONFIGURATION_SCOPE,
+            key=self.build_dir.build
+        )
+
+    def _store_configuration(self, configuration: dict) -> None:
+        """Stores the configuration of the build after CMake has
+        configured it.
+
+        Args:
+            configuration (dict): The inputs of the
+                configuration.
+        """
+        if self.args.dry_run:
+            return
+
+        self.build_dir.state.store_fingerprint(
+            scope=self.CONFIGURATION_SCOPE,
+            key=self.build_dir.build,
+            fingerprint=fingerprint.compute(configuration),
+            inputs=configuration
+        )
+
+    def _should_report(self) -> bool:
+        """Checks whether the report of the build is created.
+
+        Returns:
+            A 'bool' that tells whether the report is created.
+        """
+        return not self.args.dry_run \
+            and self.cmake_generator is CMakeGenerator.ninja \
+            and bool(self.args.report or self.args.report_json)
+
+    def _report_build(self, build_log: NinjaLog) -> None:
+        """Prints or writes the report of the build from the
+        build log of Ninja.
+
+        Args:
+            build_log (NinjaLog): The build log.
+        """
+        report = ninja_log.analyze(
+            edges=build_log.update(),
+            jobs=self.args.jobs
+        )
+
+        if self.args.report:
+            logging.info(
+                "The report of the build:\n%s",
+                ninja_log.format_report(report)
+            )
+
+        if self.args.report_json:
+            tmp_file = "{}.tmp".format(self.args.report_json)
+
+            with open(tmp_file, "w") as f:
+                json.dump(report, f, indent=2)
+
+            os.replace(tmp_file, self.args.report_json)
+
+            logging.info(
+                "Wrote the report of the build to %s",
+                self.args.report_json
+            )
+
     def _resolve_make_program(self) -> str:
         """Resolves the path to the correct Make program for CMake.
 
@@ -192,6 +439,8 @@ class ComposingRunner(RunnerProper):
     def _run_linter(self) -> None:
         """Runs the linter on the project.
         """
+        self.toolchain.prepare_extra_tools(names=["clang_tidy"])
+
         logging.warning("The run-clang-tidy is %s", self.toolchain.run_clang_tidy)
 
         linter_call = [
@@ -5,10 +5,14 @@
 configuring run mode of the build script.
 """
 
-import json
+import functools
 import logging
 
-from .util import shell
+from typing import List
+
+from .util import fingerprint, scheduler, shell
+
+from .dependency import Dependency
 
 from .runner_proper import RunnerProper
 
@@ -26,31 +30,116 @@ class ConfiguringRunner(RunnerProper):
         """
         super().__call__()
 
-        version_data = self.build_dir.installed_versions \
-            if self.build_dir.installed_versions else dict()
-
-        for dependency in self.project.dependencies:
-            if dependency.should_install(
-                runner=self,
-                build_dir=self.build_dir
+        with self.step("check dependencies"):
+            dependencies = {
+                dependency.key: dependency
+                for dependency in self.project.dependencies
+                if dependency.should_install(
+                    runner=self,
+                    build_dir=self.build_dir
+                )
+            }
+
+            # The dependencies that are built against the
+            # dependencies that are installed again must be
+            # installed again too.
+            log = logging.info if self.args.explain else logging.debug
+            project_dependencies = {
+                dependency.key: dependency
+                for dependency in self.project.dependencies
+            }
+
+            for key in scheduler.resolve_dependents(
+                requirements={
+                    key: dependency.depends_on
+                    for key, dependency in project_dependencies.items()
+                },
+                keys=list(dependencies)
             ):
-                logging.info(
-                    "Going to install %s version %s",
-                    dependency.name,
-                    dependency.version
+                log(
+                    "Installing %s because the dependencies it depends on are "
+                    "installed again",
+                    project_dependencies[key].name
                 )
-                dependency.install(runner=self, build_dir=self.build_dir)
+                dependencies[key] = project_dependencies[key]
+
+        # The tools are prepared while the sources of the
+        # dependencies are downloaded so that the builds don't
+        # wait for them.
+        tools = []
+
+        for dependency in dependencies.values():
+            for tool in dependency.resolve_required_tools(runner=self):
+                if tool not in tools:
+                    tools.append(tool)
+
+        self.warm_up_toolchain(names=tools)
+
+        # The build jobs are divided between the dependencies that
+        # are installed at the same time so that they don't run
+        # more compilers at once than the jobs allow.
+        install_jobs = 1 if self.args.dry_run else self.args.jobs
+        self.dependency_jobs = max(
+            1,
+            self.args.jobs // max(1, min(install_jobs, len(dependencies)))
+        )
 
-                version_data.update({dependency.key: dependency.version})
+        def _install(dependency: Dependency) -> None:
+            logging.info(
+                "Going to install %s version %s",
+                dependency.name,
+                dependency.version
+            )
+            with self.step(
+                "install {}".format(dependency.name),
+                category="dependency",
+                version=dependency.version
+            ):
+                return dependency.install(
+                    runner=self,
+                    build_dir=self.build_dir
+                )
 
-                with open(self.build_dir.versions_file, "w") as json_file:
-                    json.dump(version_data, json_file)
+        def _finish(key: str, result: List[str]) -> None:
+            # The tasks are finished in the calling thread so the
+            # state is only written by one thread.
+            dependency = dependencies[key]
+            inputs = dependency.resolve_inputs(
+                runner=self,
+                build_dir=self.build_dir
+            )
+
+            self.build_dir.store_install(
+                key=dependency.key,
+                version=dependency.version,
+                fingerprint=fingerprint.compute(inputs),
+                inputs=inputs,
+                files=result
+            )
+
+            logging.info(
+                "Installed version %s of %s",
+                dependency.version,
+                dependency.name
+            )
+
+        # The output of the commands that are only printed would
+        # be interleaved if the dependencies were installed at the
+        # same time.
+        scheduler.run(
+            tasks={
+                key: functools.partial(_install, dependency)
+                for key, dependency in dependencies.items()
+            },
+            requirements={
+                key: dependency.depends_on
+                for key, dependency in dependencies.items()
+            },
+            jobs=install_jobs,
+            on_finish=_finish
+        )
 
-                logging.info(
-                    "Installed version %s of %s",
-                    dependency.version,
-                    dependency.name
-                )
+        self.toolchain.finish_warm_up()
 
         return 0
 
@@ -65,13 +154,20 @@ class ConfiguringRunner(RunnerProper):
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
-        shell.rmtree(
-            self.build_dir.tools,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.rm(
-            self.build_dir.versions_file,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
+
+        # The tools and the shared dependencies are used by every
+        # build variant of the target so they're removed only when
+        # it is asked.
+        if self.args.clean_shared:
+            shell.rmtree(
+                self.build_dir.tools,
+                dry_run=self.args.dry_run,
+                echo=self.args.verbose
+            )
+            shell.rmtree(
+                self.build_dir.shared_dependencies,
+                dry_run=self.args.dry_run,
+                echo=self.args.verbose
+            )
+
+        self.build_dir.clean_state(shared=self.args.clean_shared)
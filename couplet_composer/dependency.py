@@ -6,16 +6,26 @@ represent the dependencies of the project that this build script
 acts on.
 """
 
+import copy
 import logging
 import os
+import sys
 
 from collections import namedtuple
 
-from typing import Any
+from typing import Any, List
 
 from .support.archive_action import ArchiveAction
 
-from .util import http, shell
+from .support.install_mode import InstallMode
+
+from .util import fingerprint, shell, trace
+
+from .util.cache import cached
+
+from .util.download_cache import file_sha256
+
+from .util.lock import file_lock
 
 from .build_directory import BuildDirectory
 
@@ -48,6 +58,17 @@ class Dependency:
             this dependency.
         tag_prefix (str): The prefix added before the downloaded
             version to the Git tag name.
+        depends_on (list): The keys of the dependencies that must
+            be installed before this dependency.
+        sha256 (str): The optional SHA-256 checksum of the
+            downloaded source archive of this dependency.
+        variant_independent (bool): Whether or not the installed
+            files of the dependency are the same in every build
+            variant so that the dependency is installed only once
+            for each target.
+        install_mode (InstallMode): The optional mode of
+            installing the files of the dependency that overrides
+            the mode given on the command line.
     """
 
     SOURCE_KEY = "src"
@@ -55,6 +76,20 @@ class Dependency:
 
     DEFAULT_TAG_PREFIX = "v"
 
+    VARIANT_INDEPENDENT = False
+
+    # The version of the format of the inputs of the installations.
+    # It must be increased when the way the generic dependency
+    # classes install the dependencies changes so that the
+    # dependencies are installed again.
+    INPUTS_FORMAT = 1
+
+    # The package of the modules of the custom dependency classes
+    # whose sources are part of the inputs of the installations.
+    CUSTOM_PACKAGE = "{}.support.dependencies".format(__package__)
+
+    SOURCE_STORE_DIRECTORY_NAME = "sources"
+
     FileInfo = namedtuple("FileInfo", [SOURCE_KEY, DESTINATION_KEY])
 
     def __init__(
@@ -69,7 +104,11 @@ class Dependency:
         benchmark_only: bool,
         asset_name: str,
         repository: str,
-        tag_prefix: str
+        tag_prefix: str,
+        depends_on: List[str],
+        sha256: str,
+        variant_independent: bool = None,
+        install_mode: InstallMode = None
     ) -> None:
         """Initializes the dependency object.
 
@@ -94,6 +133,17 @@ class Dependency:
                 dependency.
             tag_prefix (str): The prefix added before the
                 downloaded version to the Git tag name.
+            depends_on (list): The keys of the dependencies that
+                must be installed before this dependency.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded source archive of this dependency.
+            variant_independent (bool): Whether or not the
+                installed files of the dependency are the same in
+                every build variant. The default value of the
+                class is used if this is None.
+            install_mode (InstallMode): The optional mode of
+                installing the files of the dependency that
+                overrides the mode given on the command line.
         """
         self.key = key
         self.name = name
@@ -220,6 +270,11 @@ class Dependency:
             self.repository = None
 
         self.tag_prefix = tag_prefix if tag_prefix else self.DEFAULT_TAG_PREFIX
+        self.depends_on = list(depends_on) if depends_on else list()
+        self.sha256 = sha256
+        self.variant_independent = self.VARIANT_INDEPENDENT \
+            if variant_independent is None else variant_independent
+        self.install_mode = install_mode
 
     def __repr__(self) -> str:
         """Computes the string representation of the dependency.
@@ -241,7 +296,7 @@ class Dependency:
         self,
         runner: Runner,
         build_dir: BuildDirectory
-    ) -> None:
+    ) -> List[str]:
         """Downloads, builds, and installs the dependency.
 
         Args:
@@ -249,22 +304,396 @@ class Dependency:
             build_dir (BuildDirectory): The build directory
                 object that is the main build directory of the
                 build script invocation.
+
+        Returns:
+            A 'list' of the installed files relative to the
+            dependencies directory.
         """
-        source_dir = self._download(runner=runner, build_dir=build_dir)
+        if self.variant_independent:
+            return self._install_shared(runner=runner, build_dir=build_dir)
+
+        with trace.span("fetch {}".format(self.name), category="dependency"):
+            source_dir = self._fetch_sources(
+                runner=runner,
+                build_dir=build_dir
+            )
 
         logging.debug("%s is downloaded to %s", self.name, source_dir)
 
-        self._build(
-            source_path=source_dir,
+        with trace.span("build {}".format(self.name), category="dependency"):
+            installed_files = self._build(
+                source_path=source_dir,
+                runner=runner,
+                build_dir=build_dir
+            )
+
+        shell.rmtree(
+            self._resolve_temporary_directory(build_dir=build_dir),
+            dry_run=runner.args.dry_run,
+            echo=runner.args.verbose
+        )
+
+        return installed_files or self._resolve_declared_files()
+
+    def _resolve_declared_files(self) -> List[str]:
+        """Gives the files of the dependency that are declared in
+        the project file. They're used as the installed files of
+        the dependency if the build doesn't tell which files it
+        installed.
+
+        Returns:
+            A 'list' of the files relative to the dependencies
+            directory.
+        """
+        return [
+            f.dest if isinstance(f, self.FileInfo) else f
+            for f in self.library_files
+        ]
+
+    def _resolve_install_mode(self, runner: Runner) -> InstallMode:
+        """Gives the mode that is used to install the files of
+        this dependency. The files can be linked only if the
+        dependency is installed by copying the library files from
+        a downloaded source archive, and they're copied
+        otherwise.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            An 'InstallMode' that is the mode of the
+            installation.
+        """
+        if type(self)._build is not Dependency._build or self.commit:
+            return InstallMode.copy
+
+        if self.install_mode:
+            return self.install_mode
+
+        return InstallMode[runner.args.install_mode]
+
+    def _fetch_sources(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> str:
+        """Gives the sources of the dependency for the build. If
+        the files of the dependency are linked, the sources are
+        taken from the persistent store of the extracted sources,
+        and otherwise they're downloaded to the temporary
+        directory.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'str' that points to the sources.
+        """
+        if self._resolve_install_mode(runner=runner) is InstallMode.copy:
+            return self._download(runner=runner, build_dir=build_dir)
+
+        return self._extract_to_store(runner=runner, build_dir=build_dir)
+
+    def _resolve_source_store(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> str:
+        """Gives the directory in the persistent store of the
+        extracted sources where the sources of this dependency
+        are kept. The store is in the cache directory if the
+        cache is enabled and in the local directory of the build
+        directory otherwise.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            An 'str' that is the path to the directory.
+        """
+        return os.path.join(
+            runner.args.cache_dir if runner.args.cache_dir
+            else build_dir.local,
+            self.SOURCE_STORE_DIRECTORY_NAME,
+            self.owner,
+            self.repository,
+            "{}{}".format(self.tag_prefix, self.version)
+        )
+
+    def _extract_to_store(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> str:
+        """Downloads and extracts the source archive of the
+        dependency to the persistent store of the extracted
+        sources unless it is already there. The files in the
+        store are never modified after they're extracted so that
+        they can be linked.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'str' that points to the extracted sources.
+        """
+        from .util import http
+        from .util.remote_cache import RemoteCache
+
+        store_dir = self._resolve_source_store(
             runner=runner,
             build_dir=build_dir
         )
+        staging_dir = "{}.tmp".format(store_dir)
+
+        if runner.args.dry_run:
+            http.extract(
+                url=self._resolve_download_url(runner=runner),
+                destination=staging_dir,
+                action=ArchiveAction.extract,
+                headers={"Accept": "application/vnd.github.v3+json"},
+                dry_run=runner.args.dry_run,
+                echo=runner.args.verbose
+            )
+            shell.move(
+                staging_dir,
+                store_dir,
+                dry_run=runner.args.dry_run,
+                echo=runner.args.verbose
+            )
+            return store_dir
+
+        with file_lock("{}.lock".format(store_dir)):
+            if os.path.isdir(store_dir):
+                logging.debug(
+                    "Found the sources of %s in %s",
+                    self.name,
+                    store_dir
+                )
+            else:
+                shell.rmtree(
+                    staging_dir,
+                    dry_run=runner.args.dry_run,
+                    echo=runner.args.verbose
+                )
+                http.extract(
+                    url=self._resolve_download_url(runner=runner),
+                    destination=staging_dir,
+                    action=ArchiveAction.extract,
+                    headers={"Accept": "application/vnd.github.v3+json"},
+                    cache_dir=runner.args.cache_dir,
+                    remote_cache=RemoteCache.from_args(runner.args),
+                    sha256=self.sha256,
+                    segments=runner.args.download_segments,
+                    segment_threshold=runner.args.download_segment_threshold,
+                    dry_run=runner.args.dry_run,
+                    echo=runner.args.verbose
+                )
+                os.replace(staging_dir, store_dir)
+
+        return os.path.join(store_dir, os.listdir(store_dir)[0])
+
+    def _resolve_download_url(self, runner: Runner) -> str:
+        """Gives the URL of the source archive of the dependency.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            An 'str' that is the URL.
+        """
+        return "{api}/repos/{owner}/{repo}/tarball/" \
+            "refs/tags/{tag_prefix}{version}".format(
+                api=runner.args.github_api_url.rstrip("/"),
+                owner=self.owner,
+                repo=self.repository,
+                tag_prefix=self.tag_prefix,
+                version=self.version
+            )
+
+    def _resolve_shared_name(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> str:
+        """Gives the name of the directory of this dependency in
+        the shared store of the target. The name contains the
+        fingerprint of the inputs of the dependency without the
+        build variant so that it changes whenever the installed
+        files of the dependency change.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            An 'str' that is the name of the directory.
+        """
+        inputs = self.resolve_inputs(runner=runner, build_dir=build_dir)
+        del inputs["build_variant"]
+
+        return "{}-{}-{}".format(
+            self.key,
+            self.version,
+            fingerprint.compute(inputs)[:16]
+        )
+
+    def _install_shared(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> List[str]:
+        """Installs the dependency to the shared store of the
+        target unless it is already there, and copies the files
+        from the store to the dependencies of the build variant.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'list' of the installed files relative to the
+            dependencies directory.
+        """
+        store_dir = os.path.join(
+            build_dir.shared_dependencies,
+            self._resolve_shared_name(runner=runner, build_dir=build_dir)
+        )
+
+        # The dependency is built with a build directory that
+        # installs it to the store instead of the dependencies of
+        # the build variant.
+        store_build_dir = copy.copy(build_dir)
+
+        if runner.args.dry_run:
+            store_build_dir.dependencies = store_dir
+            source_dir = self._fetch_sources(
+                runner=runner,
+                build_dir=store_build_dir
+            )
+            self._build(
+                source_path=source_dir,
+                runner=runner,
+                build_dir=store_build_dir
+            )
+        else:
+            with file_lock("{}.lock".format(store_dir)):
+                if os.path.isdir(store_dir):
+                    logging.info(
+                        "Found %s in the shared dependencies of the target",
+                        self.name
+                    )
+                else:
+                    staging_dir = "{}.tmp".format(store_dir)
+                    store_build_dir.dependencies = staging_dir
+
+                    shell.rmtree(
+                        staging_dir,
+                        dry_run=runner.args.dry_run,
+                        echo=runner.args.verbose
+                    )
+                    shell.makedirs(
+                        staging_dir,
+                        dry_run=runner.args.dry_run,
+                        echo=runner.args.verbose
+                    )
+
+                    source_dir = self._fetch_sources(
+                        runner=runner,
+                        build_dir=store_build_dir
+                    )
+                    self._build(
+                        source_path=source_dir,
+                        runner=runner,
+                        build_dir=store_build_dir
+                    )
+
+                    os.replace(staging_dir, store_dir)
 
         shell.rmtree(
-            build_dir.temporary,
+            self._resolve_temporary_directory(build_dir=build_dir),
             dry_run=runner.args.dry_run,
             echo=runner.args.verbose
         )
+        shell.makedirs(
+            build_dir.dependencies,
+            dry_run=runner.args.dry_run,
+            echo=runner.args.verbose
+        )
+        shell.copytree(
+            store_dir,
+            build_dir.dependencies,
+            dry_run=runner.args.dry_run,
+            echo=runner.args.verbose
+        )
+
+        if runner.args.dry_run:
+            return self._resolve_declared_files()
+
+        return [
+            os.path.relpath(os.path.join(root, name), store_dir)
+            for root, dirs, files in os.walk(store_dir)
+            for name in files + [d for d in dirs if os.path.islink(
+                os.path.join(root, d)
+            )]
+        ]
+
+    def _resolve_temporary_directory(self, build_dir: BuildDirectory) -> str:
+        """Gives the temporary directory of this dependency. Each
+        dependency has its own temporary directory so that the
+        dependencies can be installed at the same time.
+
+        Args:
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            An 'str' that is the path to the directory.
+        """
+        return os.path.join(
+            build_dir.temporary,
+            "dependencies",
+            self.key
+        )
+
+    def _resolve_archive_members(self) -> List[str]:
+        """Gives the filters of the archive members that are
+        needed for installing this dependency. Only the library
+        files are extracted from the archive if the dependency is
+        installed by copying them, and otherwise the whole
+        archive is needed for the build.
+
+        Returns:
+            A 'list' of the filters, or None if the whole archive
+            must be extracted.
+        """
+        if type(self)._build is not Dependency._build \
+                or not self.library_files:
+            return None
+
+        members = []
+
+        for f in self.library_files:
+            src_file = f if isinstance(f, str) else f.src
+            # The archives of GitHub have the sources in a single
+            # top-level directory that has a generated name.
+            members.append("*/{}".format(src_file.replace(os.sep, "/")))
+
+        return members
 
     def _download(
         self,
@@ -283,7 +712,16 @@ class Dependency:
         Returns:
             A 'str' that points to the downloads.
         """
-        tmp_dir = build_dir.temporary
+        from .util import http
+        from .util.remote_cache import RemoteCache
+
+        tmp_dir = self._resolve_temporary_directory(build_dir=build_dir)
+
+        shell.makedirs(
+            tmp_dir,
+            dry_run=runner.args.dry_run,
+            echo=runner.args.verbose
+        )
 
         if self.commit:
             with shell.pushd(
@@ -295,7 +733,8 @@ class Dependency:
                     [
                         runner.toolchain.git,
                         "clone",
-                        "https://github.com/{owner}/{repo}.git".format(
+                        "{github}/{owner}/{repo}.git".format(
+                            github=runner.args.github_url.rstrip("/"),
                             owner=self.owner,
                             repo=self.repository
                         )
@@ -316,41 +755,27 @@ class Dependency:
 
             return os.path.join(tmp_dir, self.repository)
         else:
-            download_file = os.path.join(tmp_dir, "{}.tar.gz".format(self.key))
-
-            download_url = "https://api.github.com/repos/{owner}/{repo}/tarball/" \
-                "refs/tags/{tag_prefix}{version}".format(
-                    owner=self.owner,
-                    repo=self.repository,
-                    tag_prefix=self.tag_prefix,
-                    version=self.version
-                )
+            download_url = self._resolve_download_url(runner=runner)
+
+            source_dir = os.path.join(tmp_dir, self.key)
 
             logging.debug(
                 "Going to download from %s to %s",
                 download_url,
-                download_file
+                source_dir
             )
 
-            http.stream(
+            http.extract(
                 url=download_url,
-                destination=download_file,
-                headers={"Accept": "application/vnd.github.v3+json"},
-                dry_run=runner.args.dry_run,
-                echo=runner.args.verbose
-            )
-
-            source_dir = os.path.join(tmp_dir, self.key)
-
-            shell.makedirs(
-                path=source_dir,
-                dry_run=runner.args.dry_run,
-                echo=runner.args.verbose
-            )
-            shell.tar(
-                path=download_file,
+                destination=source_dir,
                 action=ArchiveAction.extract,
-                dest=source_dir,
+                members=self._resolve_archive_members(),
+                headers={"Accept": "application/vnd.github.v3+json"},
+                cache_dir=runner.args.cache_dir,
+                remote_cache=RemoteCache.from_args(runner.args),
+                sha256=self.sha256,
+                segments=runner.args.download_segments,
+                segment_threshold=runner.args.download_segment_threshold,
                 dry_run=runner.args.dry_run,
                 echo=runner.args.verbose
             )
@@ -380,6 +805,8 @@ class Dependency:
         #         echo=invocation.args.verbose
         #     )
 
+        install_mode = self._resolve_install_mode(runner=runner)
+
         for f in self.library_files:
             dest_file = None
             src_file = None
@@ -392,13 +819,20 @@ class Dependency:
                 src_file = os.path.join(source_path, f.src)
 
             logging.debug(
-                "Installing %s by copying %s to %s",
+                "Installing %s by placing %s to %s with %s",
                 self.name,
                 src_file,
-                dest_file
+                dest_file,
+                install_mode.name
             )
 
-            if os.path.isdir(dest_file):
+            if os.path.islink(dest_file):
+                shell.rm(
+                    dest_file,
+                    dry_run=runner.args.dry_run,
+                    echo=runner.args.verbose
+                )
+            elif os.path.isdir(dest_file):
                 shell.rmtree(
                     dest_file,
                     dry_run=runner.args.dry_run,
@@ -411,7 +845,20 @@ class Dependency:
                     echo=runner.args.verbose
                 )
 
-            if os.path.isdir(src_file):
+            if install_mode is not InstallMode.copy:
+                shell.makedirs(
+                    os.path.dirname(dest_file),
+                    dry_run=runner.args.dry_run,
+                    echo=runner.args.verbose
+                )
+                shell.link(
+                    src_file,
+                    dest_file,
+                    symbolic=install_mode is InstallMode.symlink,
+                    dry_run=runner.args.dry_run,
+                    echo=runner.args.verbose
+                )
+            elif os.path.isdir(src_file):
                 shell.copytree(
                     src_file,
                     dest_file,
@@ -426,13 +873,100 @@ class Dependency:
                     echo=runner.args.verbose
                 )
 
+    def resolve_required_tools(self, runner: Runner) -> List[str]:
+        """Gives the tools of the toolchain that installing the
+        dependency requires so that they can be prepared before
+        the installation needs them.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            A 'list' of the names of the tools as they're used as
+            the attributes of the toolchain.
+        """
+        return ["git"] if self.commit else []
+
+    def resolve_definition(self) -> dict:
+        """Gives the definition of the dependency in the project
+        file normalized for the current platform. The files of
+        the other platforms aren't included so that changing them
+        doesn't affect this platform.
+
+        Returns:
+            A 'dict' that contains the definition.
+        """
+        return {
+            "class": "{}.{}".format(
+                type(self).__module__,
+                type(self).__qualname__
+            ),
+            "name": self.name,
+            "version": self.version,
+            "commit": self.commit,
+            "files": [
+                {"src": f.src, "dest": f.dest}
+                if isinstance(f, self.FileInfo) else f
+                for f in self.library_files
+            ],
+            "asset_name": self.asset_name,
+            "repository": "{}/{}".format(self.owner, self.repository)
+            if self.repository else None,
+            "tag_prefix": self.tag_prefix,
+            "depends_on": self.depends_on,
+            "sha256": self.sha256,
+            "variant_independent": self.variant_independent
+        }
+
+    def resolve_inputs(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> dict:
+        """Gives the inputs that affect the installed files of the
+        dependency. The dependency is installed again when their
+        fingerprint changes. The inputs contain the fingerprints of
+        the installations of the dependencies that this dependency
+        depends on so that it is installed again when they are.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'dict' that contains the inputs.
+        """
+        module = type(self).__module__
+        installs = build_dir.installs
+
+        return {
+            "format": self.INPUTS_FORMAT,
+            "definition": self.resolve_definition(),
+            "module": _resolve_source_checksum(
+                path=sys.modules[module].__file__
+            ) if module.startswith(self.CUSTOM_PACKAGE + ".") else None,
+            "compiler": fingerprint.compiler_identity(
+                cache=runner.toolchain.tool_cache
+            ),
+            "build_variant": runner.build_variant.name,
+            "depends_on": {
+                key: installs[key]["fingerprint"] if key in installs else None
+                for key in self.depends_on
+            }
+        }
+
     def should_install(
         self,
         runner: Runner,
         build_dir: BuildDirectory
     ) -> bool:
-        """Tells whether the build of the dependency should be
-        skipped.
+        """Tells whether the dependency should be installed. It is
+        installed if it hasn't been installed, if the fingerprint
+        of its inputs has changed, or if any of its installed
+        files is missing. The reasons are printed if '--explain'
+        is used.
 
         Args:
             runner (Runner): The current runner.
@@ -445,59 +979,76 @@ class Dependency:
         """
         logging.debug("Checking if %s needs to be installed", self.key)
 
-        installed_versions = build_dir.installed_versions
-
-        if not installed_versions:
-            logging.debug("The file of installed versions doesn't exist")
-            return True
-
-        if self.key not in installed_versions:
-            logging.debug(
-                "The key '%s' wasn't found from the installed versions",
-                self.key
-            )
-            return True
+        reasons = self._explain_install(runner=runner, build_dir=build_dir)
+        log = logging.info if runner.args.explain else logging.debug
 
-        installed_version = build_dir.installed_versions[self.key]
+        if not reasons:
+            log("%s is up to date", self.name)
+            return False
 
-        logging.debug(
-            "The installed version of %s is %s",
+        log(
+            "Installing %s because:\n%s",
             self.name,
-            installed_version
+            "\n".join("  - {}".format(reason) for reason in reasons)
         )
 
-        if self.version == installed_version:
-            logging.debug(
-                "The installed version and required version of %s match",
-                self.name
-            )
-            return False
+        return True
 
-        if not self.library_files:
-            return True
+    def _explain_install(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> List[str]:
+        """Gives the reasons why the dependency must be installed.
 
-        logging.debug(
-            "The library files of %s are: %s",
-            self.name,
-            ", ".join(self.library_files)
-        )
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'list' that contains the reasons, or an empty list
+            if the dependency doesn't have to be installed.
+        """
+        install = build_dir.installs.get(self.key)
+
+        if not install:
+            return ["it hasn't been installed"]
+
+        # The dependencies that the earlier versions of the build
+        # script have installed have only their versions stored.
+        if not install["inputs"]:
+            return ["the inputs of the previous installation aren't known"]
+
+        inputs = self.resolve_inputs(runner=runner, build_dir=build_dir)
 
-        found_file = False
-
-        for lib_file in self.library_files:
-            logging.debug("Checking if the file '%s' exists", lib_file)
-
-            if isinstance(lib_file, str):
-                if os.path.exists(os.path.join(build_dir.dependencies, lib_file)):
-                    logging.debug("Found the file '%s'", lib_file)
-                    found_file = True
-                    break
-            elif isinstance(lib_file, self.FileInfo):
-                if os.path.exists(
-                    os.path.join(build_dir.dependencies, lib_file.dest)
-                ):
-                    logging.debug("Found the file '%s'", lib_file.dest)
-                    found_file = True
-                    break
-
-        return not found_file
+        if install["fingerprint"] != fingerprint.compute(inputs):
+            return fingerprint.explain(
+                previous=install["inputs"],
+                current=inputs
+            ) or ["the fingerprint of the inputs changed"]
+
+        for installed_file in build_dir.resolve_manifest(key=self.key):
+            if not os.path.lexists(
+                os.path.join(build_dir.dependencies, installed_file)
+            ):
+                return ["the installed file '{}' is missing".format(
+                    installed_file
+                )]
+
+        return []
+
+
+@cached
+def _resolve_source_checksum(path: str) -> str:
+    """Computes the checksum of the given source file of a
+    dependency class.
+
+    Args:
+        path (str): The source file.
+
+    Returns:
+        An 'str' that is the hexadecimal SHA-256 checksum.
+    """
+    return file_sha256(path)
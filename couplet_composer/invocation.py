@@ -8,34 +8,19 @@ of the build script.
 import logging
 import os
 import platform
-import sys
 
 from collections import namedtuple
 
-from .support.build_variant import BuildVariant
-
-from .support.cmake_generator import CMakeGenerator
-
-from .support.cpp_standard import CppStandard
-
 from .support.run_mode import RunMode
 
 from .support.system import System
 
+from .util import trace
+
 from .util.formatter import Formatter
 
 from .args_parser import create_args_parser
 
-from .composing_runner import ComposingRunner
-
-from .configuring_runner import ConfiguringRunner
-
-from .preset_runner import PresetRunner
-
-from .project import Project
-
-from .runner_proper import RunnerProper
-
 from .runner import Runner
 
 from .target import Target
@@ -95,19 +80,42 @@ class Invocation:
                 "recognized: {}".format(", ".join(unknown_args))
             )
 
+        # The invocation that the preset mode runs in a new process
+        # records the trace itself.
+        if self.args.trace and not (
+            self.run_mode is RunMode.preset and self.args.preset_subprocess
+        ):
+            trace.start(path=self.args.trace)
+
         self.repository = self.args.repository
         self.platform = System(platform.system().lower())
         self.targets = self._resolve_targets()
 
-        def _resolve_runner_type() -> RunnerProper:
+        # The runners are imported only for the run mode that uses
+        # them so that the modes that don't build anything don't
+        # import the modules of the tools, the dependencies, and
+        # the HTTP client.
+        def _resolve_runner_type() -> type:
             if self.run_mode is RunMode.configure:
+                from .configuring_runner import ConfiguringRunner
                 return ConfiguringRunner
             elif self.run_mode is RunMode.compose:
+                from .composing_runner import ComposingRunner
                 return ComposingRunner
             else:
                 raise ValueError
 
-        if self.run_mode is not RunMode.preset:
+        if self.run_mode is RunMode.serve_cache:
+            from .cache_server_runner import CacheServerRunner
+
+            self.runners = self.Runners(
+                host=CacheServerRunner(
+                    args=self.args,
+                    source_root=self.source_root
+                ),
+                cross_compile=list()
+            )
+        elif self.run_mode is not RunMode.preset:
             runner_type = _resolve_runner_type()
 
             self.runners = self.Runners(
@@ -125,6 +133,8 @@ class Invocation:
                 ]
             )
         else:
+            from .preset_runner import PresetRunner
+
             self.runners = self.Runners(
                 host=PresetRunner(
                     args=self.args,
@@ -139,18 +149,29 @@ class Invocation:
 
         Returns:
             An 'int' that is equal to the exit code of the
-            invocation.
+            invocation. It is the exit code of the host runner if
+            it failed, and otherwise the exit code of the first
+            cross compile runner that failed.
         """
         logging.debug("Calling the invocation")
 
-        # First the host runner should be run.
-        self.runners.host()
+        try:
+            with trace.span(self.run_mode.value, category="invocation"):
+                # First the host runner should be run.
+                with trace.span(str(self.targets.host), category="runner"):
+                    exit_code = self.runners.host()
+
+                if self.run_mode is not RunMode.preset:
+                    for runner in self.runners.cross_compile:
+                        with trace.span(str(runner.target), category="runner"):
+                            runner_exit_code = runner()
 
-        if self.run_mode is not RunMode.preset:
-            for runner in self.runners.cross_compile:
-                runner()
+                        if runner_exit_code and not exit_code:
+                            exit_code = runner_exit_code
+        finally:
+            trace.finish()
 
-        return 0
+        return exit_code or 0
 
     def _configure_logging(self) -> None:
         """Sets the logging level according to the configuration
@@ -182,7 +203,7 @@ class Invocation:
             cross compile targets.
         """
         host_target = Target.resolve_host_target() \
-            if self.run_mode is RunMode.preset \
+            if self.run_mode in [RunMode.preset, RunMode.serve_cache] \
             else Target.to_target(self.args.host_target)
 
         return self.Targets(host=host_target, cross_compile=list())
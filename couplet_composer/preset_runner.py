@@ -8,18 +8,25 @@ preset run mode of the build script.
 import logging
 import os
 import platform
+import subprocess
 import sys
 
+from contextlib import contextmanager
+
 from typing import List
 
 from .support.run_mode import RunMode
 
 from .support import environment, preset
 
-from .util import shell
+from .util import shell, trace
+
+from .args_parser import create_args_parser
 
 from .runner import Runner
 
+from .target import Target
+
 
 class PresetRunner(Runner):
     """A class for creating callable objects that represent the
@@ -32,14 +39,17 @@ class PresetRunner(Runner):
         Returns:
             An 'int' that is equal to the exit code of the run.
         """
+        # The presets in the files given later override the
+        # presets with the same names.
         preset_file_names = [os.path.join(
             self.source_root,
             self.args.repository,
             environment.PRESET_FILE_PATH
-        )]
+        )] + [
+            os.path.abspath(file_name)
+            for file_name in self.args.preset_file_names
+        ]
 
-        # TODO Include the preset files from the command line
-        # arguments
         logging.debug("The preset files are %s", ", ".join(preset_file_names))
 
         if self.args.show_presets:
@@ -47,8 +57,15 @@ class PresetRunner(Runner):
 
         if not self.args.preset_name:
             logging.critical("Missing the '--name' option")
+            return 1
 
-        build_call = self._compose_call(preset_file_names=preset_file_names)
+        try:
+            build_call = self._compose_call(
+                preset_file_names=preset_file_names
+            )
+        except ValueError as e:
+            logging.critical("%s", e)
+            return 1
 
         logging.info(
             "Using preset '%s', which expands to \n\n%s\n",
@@ -65,12 +82,83 @@ class PresetRunner(Runner):
             logging.debug("The build script invocation is printed")
             return 0
 
-        self.caffeinate(command=build_call, echo=True)
+        if self.args.preset_subprocess:
+            self.caffeinate(command=build_call, echo=True)
+            return 0
 
-        return 0
+        return self._run_in_process(build_call=build_call)
+
+    def _run_in_process(self, build_call: list) -> int:
+        """Runs the build script invocation composed from the
+        preset in the current process. The arguments of the
+        invocation are parsed into a new namespace, and the
+        runner of its run mode is called directly.
 
-    @staticmethod
-    def _show_presets(file_names):
+        Args:
+            build_call (list): The complete build call including
+                the name of the executable.
+
+        Returns:
+            An 'int' that is equal to the exit code of the run.
+        """
+        args, unknown_args = create_args_parser().parse_known_args(
+            build_call[1:]
+        )
+
+        if unknown_args:
+            logging.warning(
+                "The following arguments of the preset weren't recognized: "
+                "%s",
+                ", ".join(unknown_args)
+            )
+
+        # The preset may enable the verbose output although the
+        # preset mode was run without it.
+        if args.verbose:
+            for logger in [logging.getLogger()] \
+                    + logging.getLogger().handlers:
+                logger.setLevel(logging.DEBUG)
+
+        run_mode = RunMode(args.run_mode)
+
+        if run_mode is RunMode.configure:
+            from .configuring_runner import ConfiguringRunner
+            runner_type = ConfiguringRunner
+        else:
+            from .composing_runner import ComposingRunner
+            runner_type = ComposingRunner
+
+        runner = runner_type(
+            args=args,
+            source_root=self.source_root,
+            target=Target.to_target(args.host_target)
+        )
+
+        with self._prevent_sleep():
+            with trace.span(run_mode.value, category="invocation"):
+                return runner()
+
+    @contextmanager
+    def _prevent_sleep(self) -> None:
+        """Disables system sleep, if possible, while the context
+        is active.
+        """
+        if platform.system() != "Darwin":
+            yield
+            return
+
+        # The utility exits when the given process exits so that
+        # the system sleep isn't left disabled.
+        process = subprocess.Popen(
+            ["caffeinate", "-i", "-w", str(os.getpid())]
+        )
+
+        try:
+            yield
+        finally:
+            process.terminate()
+
+    def _show_presets(self, file_names: List[str]) -> int:
         """Shows the available presets and returns the end code
         of this execution.
 
@@ -84,7 +172,10 @@ class PresetRunner(Runner):
         """
         logging.info("The available presets are:")
 
-        all_preset_names = preset.get_all_preset_names(file_names)
+        all_preset_names = preset.get_all_preset_names(
+            file_names=file_names,
+            cache_dir=self.args.cache_dir
+        )
         preset_names = []
 
         for name in all_preset_names:
@@ -120,7 +211,8 @@ class PresetRunner(Runner):
         options, options_after_end = preset.get_preset_options(
             file_names=preset_file_names,
             preset_name=self.args.preset_name,
-            run_mode=RunMode(self.args.preset_run_mode)
+            run_mode=RunMode(self.args.preset_run_mode),
+            cache_dir=self.args.cache_dir
         )
 
         build_call = [sys.argv[0]]
@@ -135,6 +227,20 @@ class PresetRunner(Runner):
         if self.args.verbose:
             build_call.append("--verbose")
         build_call.extend(["--repository", self.args.repository])
+        if self.args.trace:
+            build_call.extend(["--trace", os.path.abspath(self.args.trace)])
+        if not self.args.cache_dir:
+            build_call.append("--no-cache")
+        elif self.args.cache_dir != environment.get_default_cache_dir():
+            build_call.extend(["--cache-dir", self.args.cache_dir])
+        if self.args.remote_cache:
+            build_call.extend(["--remote-cache", self.args.remote_cache])
+        if self.args.remote_cache_read_only:
+            build_call.append("--remote-cache-read-only")
+        if self.args.github_url != environment.GITHUB_URL:
+            build_call.extend(["--github-url", self.args.github_url])
+        if self.args.github_api_url != environment.GITHUB_API_URL:
+            build_call.extend(["--github-api-url", self.args.github_api_url])
 
         for key, value in options.items():
             if value:
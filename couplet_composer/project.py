@@ -12,6 +12,8 @@ import os
 
 from typing import Any, List
 
+from .support.install_mode import InstallMode
+
 from .support.system import System
 
 from .support import environment
@@ -58,6 +60,10 @@ class Project:
     CMAKE_OPTIONS_KEY = "cmakeOptions"
     BINARY_KEY = "binary"
     PLATFORMS_KEY = "platforms"
+    DEPENDS_ON_KEY = "dependsOn"
+    SHA256_KEY = "sha256"
+    VARIANT_INDEPENDENT_KEY = "variantIndependent"
+    INSTALL_MODE_KEY = "installMode"
 
     def __init__(
         self,
@@ -157,6 +163,19 @@ class Project:
                 platform=platform
             ))
 
+        dependency_keys = [d.key for d in self.dependencies]
+
+        for dependency in self.dependencies:
+            for key in dependency.depends_on:
+                if key not in dependency_keys:
+                    logging.critical(
+                        "The dependency '%s' depends on an unknown "
+                        "dependency '%s'",
+                        dependency.key,
+                        key
+                    )
+                    raise ValueError
+
     def _get_from_project_data(self, data: object, key: str) -> Any:
         """Reads and resolves the given entry from the data got
         from the project data JSON file.
@@ -272,6 +291,20 @@ class Project:
         needs_binary = data[self.BINARY_KEY] if self.BINARY_KEY in data \
             else None
 
+        depends_on = data[self.DEPENDS_ON_KEY] \
+            if self.DEPENDS_ON_KEY in data else None
+
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+
+        sha256 = data[self.SHA256_KEY] if self.SHA256_KEY in data else None
+
+        variant_independent = data[self.VARIANT_INDEPENDENT_KEY] \
+            if self.VARIANT_INDEPENDENT_KEY in data else None
+
+        install_mode = InstallMode[data[self.INSTALL_MODE_KEY]] \
+            if self.INSTALL_MODE_KEY in data else None
+
         if self.MODULE_KEY not in data or \
                 data[self.MODULE_KEY] == self.MODULE_DEFAULT_VALUE:
 
@@ -288,7 +321,11 @@ class Project:
                     asset_name=asset_name,
                     repository=repository,
                     tag_prefix=tag_prefix,
-                    cmake_options=cmake_options
+                    depends_on=depends_on,
+                    sha256=sha256,
+                    cmake_options=cmake_options,
+                    variant_independent=variant_independent,
+                    install_mode=install_mode
                 )
             else:
                 return Dependency(
@@ -302,7 +339,11 @@ class Project:
                     benchmark_only=benchmark_only,
                     asset_name=asset_name,
                     repository=repository,
-                    tag_prefix=tag_prefix
+                    tag_prefix=tag_prefix,
+                    depends_on=depends_on,
+                    sha256=sha256,
+                    variant_independent=variant_independent,
+                    install_mode=install_mode
                 )
         else:
             if self.CLASS_KEY not in data:
@@ -328,7 +369,11 @@ class Project:
                     asset_name=asset_name,
                     repository=repository,
                     tag_prefix=tag_prefix,
-                    cmake_options=cmake_options
+                    depends_on=depends_on,
+                    sha256=sha256,
+                    cmake_options=cmake_options,
+                    variant_independent=variant_independent,
+                    install_mode=install_mode
                 )
             else:
                 return dependency_class(
@@ -342,5 +387,9 @@ class Project:
                     benchmark_only=benchmark_only,
                     asset_name=asset_name,
                     repository=repository,
-                    tag_prefix=tag_prefix
+                    tag_prefix=tag_prefix,
+                    depends_on=depends_on,
+                    sha256=sha256,
+                    variant_independent=variant_independent,
+                    install_mode=install_mode
                 )
@@ -5,27 +5,10 @@
 a run mode of the build script.
 """
 
-import sys
-import time
-
 from abc import ABC, abstractmethod
 
 from argparse import Namespace
 
-from .support.build_variant import BuildVariant
-
-from .support.cmake_generator import CMakeGenerator
-
-from .support.system import System
-
-from .util import shell
-
-from .build_directory import BuildDirectory
-
-from .target import Target
-
-from .toolchain import Toolchain
-
 
 class Runner(ABC):
     """A class for creating callable objects that represent the
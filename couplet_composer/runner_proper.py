@@ -5,20 +5,28 @@
 a run mode of the build script.
 """
 
+import logging
+import os
 import sys
 import time
 
 from argparse import Namespace
 
+from contextlib import contextmanager
+
+from typing import List
+
 from .support.build_variant import BuildVariant
 
 from .support.cmake_generator import CMakeGenerator
 
+from .support.compiler_launcher import CompilerLauncher
+
 from .support.cpp_standard import CppStandard
 
 from .support.system import System
 
-from .util import shell
+from .util import shell, trace
 
 from .build_directory import BuildDirectory
 
@@ -43,6 +51,12 @@ class RunnerProper(Runner):
             that is the main build directory of the run.
         toolchain (Toolchain): The toolchain that contains the
             tools of this run.
+        dependency_jobs (int): The number of the parallel build
+            jobs that each build of a dependency uses.
+
+    Private attributes:
+        _run (int): The identifier of the run in the state
+            database, or None in dry run.
     """
 
     def __init__(
@@ -82,6 +96,8 @@ class RunnerProper(Runner):
             build_dir=self.build_dir,
             target=self.target
         )
+        self.dependency_jobs = self.args.jobs
+        self._run = None
 
     def __call__(self) -> int:
         """Runs the run mode of this runner.
@@ -92,8 +108,175 @@ class RunnerProper(Runner):
         if self.args.clean:
             self.clean()
 
+        self.build_dir.migrate_tools()
+
+        if not self.args.dry_run:
+            self._run = self.build_dir.state.start_run(
+                mode=self.args.run_mode,
+                target=str(self.target),
+                variant=self.build_variant.name
+            )
+
         return 0
 
+    def warm_up_toolchain(self, names: List[str]) -> None:
+        """Starts preparing the given tools of the toolchain in
+        the background. The tools are prepared when they're used
+        in dry run as the printed commands would be interleaved.
+
+        Args:
+            names (list): The names of the tools as they're used
+                as the attributes of the toolchain.
+        """
+        if self.args.dry_run or not names:
+            return
+
+        logging.debug("Preparing the tools %s", ", ".join(names))
+
+        self.toolchain.warm_up(names=names, jobs=self.args.jobs)
+
+    @contextmanager
+    def step(self, name: str, category: str = "phase", **kwargs) -> None:
+        """Records the time the context is active as a step of the
+        run in the trace and in the state database so that the
+        durations of the steps can be compared between the runs.
+        Nothing is stored in the state database in dry run.
+
+        Args:
+            name (str): The name of the step.
+            category (str): The category of the step.
+            **kwargs: The arguments that are added to the event of
+                the step in the trace.
+        """
+        start = time.time()
+        start_counter = time.perf_counter()
+
+        with trace.span(name, category=category, **kwargs):
+            yield
+
+        if self._run is None:
+            return
+
+        self.build_dir.state.store_timing(
+            run=self._run,
+            step=name,
+            category=category,
+            start=start,
+            duration=time.perf_counter() - start_counter
+        )
+
+    def _resolve_compiler_cache_directory(self, key: str) -> str:
+        """Gives the directory of the compiler cache.
+
+        Args:
+            key (str): The key of the compiler cache tool.
+
+        Returns:
+            An 'str' that is the path to the directory, or None
+            if the default directory of the compiler cache is
+            used.
+        """
+        if self.args.compiler_cache_dir:
+            return os.path.abspath(self.args.compiler_cache_dir)
+
+        if self.args.cache_dir:
+            return os.path.join(self.args.cache_dir, "compilers", key)
+
+        return None
+
+    def resolve_compiler_launcher_options(self) -> List[str]:
+        """Gives the CMake options that set the compiler cache as
+        the launcher of the C and C++ compilers.
+
+        Returns:
+            A 'list' that contains the CMake options, or an empty
+            list if the compiler cache isn't used.
+        """
+        compiler_cache = self.toolchain.resolve_compiler_cache(
+            launcher=CompilerLauncher[self.args.compiler_cache]
+        )
+
+        if not compiler_cache:
+            return []
+
+        launcher = getattr(self.toolchain, compiler_cache.key).replace(
+            os.path.sep,
+            "/"
+        )
+
+        return [
+            "-DCMAKE_C_COMPILER_LAUNCHER={}".format(launcher),
+            "-DCMAKE_CXX_COMPILER_LAUNCHER={}".format(launcher)
+        ]
+
+    def resolve_compiler_cache_environment(self) -> dict:
+        """Gives the environment variables that configure the
+        compiler cache for the builds.
+
+        Returns:
+            A 'dict' that contains the environment variables, or
+            None if the compiler cache isn't used.
+        """
+        compiler_cache = self.toolchain.resolve_compiler_cache(
+            launcher=CompilerLauncher[self.args.compiler_cache]
+        )
+
+        if not compiler_cache:
+            return None
+
+        return compiler_cache.resolve_environment(
+            directory=self._resolve_compiler_cache_directory(
+                key=compiler_cache.key
+            ),
+            size=self.args.compiler_cache_size
+        )
+
+    def _call_compiler_cache(self, show_stats: bool) -> None:
+        """Shows or resets the statistics of the compiler cache
+        if the compiler cache is used.
+
+        Args:
+            show_stats (bool): Whether the statistics are shown
+                instead of reset.
+        """
+        compiler_cache = self.toolchain.resolve_compiler_cache(
+            launcher=CompilerLauncher[self.args.compiler_cache]
+        )
+
+        if not compiler_cache:
+            return
+
+        path = getattr(self.toolchain, compiler_cache.key)
+
+        if show_stats:
+            command = compiler_cache.resolve_show_stats_command(path=path)
+        else:
+            command = compiler_cache.resolve_zero_stats_command(path=path)
+
+        shell.call(
+            command,
+            env=self.resolve_compiler_cache_environment(),
+            dry_run=self.args.dry_run,
+            echo=self.args.verbose
+        )
+
+    def zero_compiler_cache_stats(self) -> None:
+        """Resets the statistics of the compiler cache so that
+        the statistics that are shown after the build are the
+        statistics of the build. The statistics are reset only if
+        the compiler cache has a directory of its own as other
+        builds may share the default directory.
+        """
+        if not self.args.compiler_cache_dir:
+            return
+
+        self._call_compiler_cache(show_stats=False)
+
+    def show_compiler_cache_stats(self) -> None:
+        """Prints the hits and the misses of the compiler cache.
+        """
+        self._call_compiler_cache(show_stats=True)
+
     def clean(self) -> None:
         """Cleans the directories and files of the runner before
         building when clean build is run.
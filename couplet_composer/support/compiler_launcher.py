@@ -0,0 +1,20 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains a helper enumeration that represents
+the possible compiler caches that are used as the compiler
+launchers of the builds.
+"""
+
+from enum import Enum, unique
+
+
+@unique
+class CompilerLauncher(Enum):
+    """An enumeration that represents the possible compiler
+    caches that are used as the compiler launchers of the builds.
+    """
+    auto = "auto"
+    ccache = "ccache"
+    sccache = "sccache"
+    none = "none"
@@ -22,8 +22,36 @@ from ...runner import Runner
 class GladDependency(Dependency):
     """A class for creating objects that represent the Glad
     dependency of the project that this build script acts on.
+
+    The generated loader depends only on the OpenGL version of
+    the project so it is shared between the build variants.
     """
 
+    VARIANT_INDEPENDENT = True
+
+    def resolve_inputs(
+        self,
+        runner: Runner,
+        build_dir: BuildDirectory
+    ) -> dict:
+        """Gives the inputs that affect the installed files of the
+        dependency. The dependency is installed again when their
+        fingerprint changes.
+
+        Args:
+            runner (Runner): The current runner.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                build script invocation.
+
+        Returns:
+            A 'dict' that contains the inputs.
+        """
+        inputs = super().resolve_inputs(runner=runner, build_dir=build_dir)
+        inputs["gl_version"] = runner.project.gl_version
+
+        return inputs
+
     def _build(
         self,
         source_path: str,
@@ -8,9 +8,11 @@ script acts on.
 
 import os
 
+from typing import List
+
 from ..archive_action import ArchiveAction
 
-from ...util import http, shell
+from ...util import shell
 
 from ...dependency import Dependency
 
@@ -37,9 +39,16 @@ class SdlDependency(Dependency):
         Returns:
             A 'str' that points to the downloads.
         """
-        tmp_dir = build_dir.temporary
+        from ...util import http
+        from ...util.remote_cache import RemoteCache
+
+        tmp_dir = self._resolve_temporary_directory(build_dir=build_dir)
 
-        download_file = os.path.join(tmp_dir, "{}.tar.gz".format(self.key))
+        shell.makedirs(
+            tmp_dir,
+            dry_run=runner.args.dry_run,
+            echo=runner.args.verbose
+        )
 
         download_url = "https://www.libsdl.org/release/SDL2-{version}" \
             ".tar.gz".format(
@@ -47,30 +56,37 @@ class SdlDependency(Dependency):
                 version=self.version
             )
 
-        http.stream(
-            url=download_url,
-            destination=download_file,
-            dry_run=runner.args.dry_run,
-            echo=runner.args.verbose
-        )
-
         source_dir = os.path.join(tmp_dir, self.key)
 
-        shell.makedirs(
-            path=source_dir,
-            dry_run=runner.args.dry_run,
-            echo=runner.args.verbose
-        )
-        shell.tar(
-            path=download_file,
+        http.extract(
+            url=download_url,
+            destination=source_dir,
             action=ArchiveAction.extract,
-            dest=source_dir,
+            cache_dir=runner.args.cache_dir,
+            remote_cache=RemoteCache.from_args(runner.args),
+            sha256=self.sha256,
+            segments=runner.args.download_segments,
+            segment_threshold=runner.args.download_segment_threshold,
             dry_run=runner.args.dry_run,
             echo=runner.args.verbose
         )
 
         return os.path.join(source_dir, os.listdir(source_dir)[0])
 
+    def resolve_required_tools(self, runner: Runner) -> List[str]:
+        """Gives the tools of the toolchain that installing the
+        dependency requires so that they can be prepared before
+        the installation needs them.
+
+        Args:
+            runner (Runner): The current runner.
+
+        Returns:
+            A 'list' of the names of the tools as they're used as
+            the attributes of the toolchain.
+        """
+        return super().resolve_required_tools(runner=runner) + ["make"]
+
     def _build(
         self,
         source_path: str,
@@ -87,7 +103,10 @@ class SdlDependency(Dependency):
                 object that is the main build directory of the
                 build script invocation.
         """
-        tmp_build_dir = os.path.join(build_dir.temporary, "build")
+        tmp_build_dir = os.path.join(
+            self._resolve_temporary_directory(build_dir=build_dir),
+            "build"
+        )
 
         shell.makedirs(
             tmp_build_dir,
@@ -23,4 +23,24 @@ def is_path_source_root(path: str, repo: str) -> bool:
     return os.path.exists(os.path.join(path, repo, "CMakeLists.txt"))
 
 
+def get_default_cache_dir() -> str:
+    """Gives the default root directory of the persistent caches
+    of the build script that are shared between the build
+    directories and the invocations.
+
+    Returns:
+        An 'str' that is the path to the directory.
+    """
+    if "COUPLET_COMPOSER_CACHE_DIR" in os.environ:
+        return os.environ["COUPLET_COMPOSER_CACHE_DIR"]
+
+    if "XDG_CACHE_HOME" in os.environ:
+        return os.path.join(os.environ["XDG_CACHE_HOME"], "couplet-composer")
+
+    return os.path.join(os.path.expanduser("~"), ".cache", "couplet-composer")
+
+
 PRESET_FILE_PATH = os.path.join("util", "composer-presets.ini")
+
+GITHUB_URL = "https://github.com"
+GITHUB_API_URL = "https://api.github.com"
@@ -0,0 +1,18 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains a helper enumeration that represents
+the possible modes of installing the files of the dependencies.
+"""
+
+from enum import Enum, auto, unique
+
+
+@unique
+class InstallMode(Enum):
+    """An enumeration that represents the possible modes of
+    installing the files of the dependencies.
+    """
+    copy = auto()
+    hardlink = auto()
+    symlink = auto()
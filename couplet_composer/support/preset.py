@@ -3,12 +3,25 @@
 
 """A support module that contains helper functions for parsing
 and displaying the presets.
+
+The preset files are read into a table that contains the options of
+their sections and the presets that have been requested, resolved
+for the run mode. Every section is resolved only once even if it is
+mixed in to many presets, and the mix-ins that form a cycle are
+reported instead of followed. The table can be stored in the cache
+directory so that the files are only read and the presets resolved
+again when the preset files change.
 """
 
 import configparser
+import hashlib
+import json
 import logging
+import os
+
+from typing import Dict, List, Tuple
 
-from typing import List, Tuple
+from ..util import fingerprint
 
 from .run_mode import RunMode
 
@@ -19,6 +32,18 @@ COMPOSING_PRESET_PREFIX = "{}:".format(RunMode.compose.value)
 _MIXIN_OPTION = "mix-in-preset"
 _DASH_DASH_OPTION = "dash-dash"
 
+# The run modes that the presets are resolved for and the prefixes
+# of their mode-specific preset portions.
+_RUN_MODE_PREFIXES = {
+    RunMode.configure: CONFIGURATION_PRESET_PREFIX,
+    RunMode.compose: COMPOSING_PRESET_PREFIX
+}
+
+# The directory in the cache directory that contains the resolved
+# preset tables and the version of their format.
+CACHE_DIRECTORY_NAME = "presets"
+CACHE_VERSION = 1
+
 
 def _create_configuration_parser(
     substitutions: dict = None
@@ -38,23 +63,77 @@ def _create_configuration_parser(
     return configparser.ConfigParser(substitute_values, allow_no_value=True)
 
 
-def _read_preset(
-    parser: configparser.ConfigParser,
+def _read_sections(parser: configparser.ConfigParser) -> Dict[str, list]:
+    """Reads the options of every section loaded into the
+    configuration parser.
+
+    Args:
+        parser (ConfigParser): The parser that reads the options.
+
+    Returns:
+        A 'dict' that contains a list of the options of each
+        section as tuples of the name of the option, its value, and
+        the reference of the missing option if the value couldn't
+        be interpolated.
+    """
+    sections = {}
+
+    for name in parser.sections():
+        entries = []
+
+        for option in parser.options(name):
+            try:
+                entries.append(
+                    (option, parser.get(section=name, option=option), None)
+                )
+            except configparser.InterpolationMissingOptionError as e:
+                # e.reference contains the correctly formatted
+                # option.
+                entries.append((option, None, e.reference))
+
+        sections[name] = entries
+
+    return sections
+
+
+def _strip_prefix(name: str) -> str:
+    """Removes the prefix of the run mode from the name of a
+    mode-specific preset portion.
+
+    Args:
+        name (str): The name of the section.
+
+    Returns:
+        An 'str' that is the name of the preset.
+    """
+    for prefix in _RUN_MODE_PREFIXES.values():
+        if name.startswith(prefix):
+            return name[len(prefix):]
+
+    return name
+
+
+def _resolve_preset(
+    sections: Dict[str, list],
     name: str,
     run_mode: RunMode,
-    substitutions: dict = None
+    resolved: dict,
+    chain: List[str]
 ) -> Tuple[dict, dict, list]:
-    """Reads the options from the given preset loaded into the
-    configuration parser.
+    """Resolves the options of the given preset. The mix-in
+    presets are resolved recursively, and every resolved preset is
+    stored so that it is resolved only once.
 
-    Arguments:
-        parser (ConfigParser): The parser that reads the options.
+    Args:
+        sections (dict): The options of the sections of the preset
+            files.
         name (str): The name of the preset.
         run_mode (RunMode): The mode that the script is invoked
             in.
-        substitutions (dict): The values that should override the
-            arguments in the preset files. The substitutions are
-            currently disabled.
+        resolved (dict): The presets that are already resolved for
+            the run mode.
+        chain (list): The names of the presets that are being
+            resolved and mix in this preset.
 
     Returns:
         Three values: the first one is a dictionary containing
@@ -64,65 +143,47 @@ def _read_preset(
         with them that are given after the double dash, and the
         third one contains a list of the erroneous options.
     """
-    logging.debug("Starting to read the preset '%s'", name)
+    if name in resolved:
+        return resolved[name]
 
-    is_mode_specific_preset = name.startswith(CONFIGURATION_PRESET_PREFIX) \
-        or name.startswith(COMPOSING_PRESET_PREFIX)
+    if name in chain:
+        raise ValueError("The presets mix in each other: {}".format(
+            " -> ".join(chain[chain.index(name):] + [name])
+        ))
 
-    name_with_prefix = None
+    is_mode_specific_preset = _strip_prefix(name) != name
+    name_with_prefix = "{}{}".format(_RUN_MODE_PREFIXES[run_mode], name)
 
-    if run_mode is RunMode.configure:
-        name_with_prefix = "{}{}".format(CONFIGURATION_PRESET_PREFIX, name)
-        logging.debug(
-            "Checking whether a mode-specific preset portion '%s' exists for "
-            "the preset '%s'",
-            name_with_prefix,
-            name
-        )
-    elif run_mode is RunMode.compose:
-        name_with_prefix = "{}{}".format(COMPOSING_PRESET_PREFIX, name)
-        logging.debug(
-            "Checking whether a mode-specific preset portion '%s' exists for "
-            "the preset '%s'",
-            name_with_prefix,
-            name
-        )
-
-    if name not in parser.sections() \
-            and name_with_prefix not in parser.sections():
-        return None
+    if name not in sections and name_with_prefix not in sections:
+        raise ValueError("The preset '{}' isn't found".format(name))
 
     options = {}
     options_after_end = {}
     missing_options = []
     dash_dash_seen = False
 
-    for option in parser.options(name):
-        value = None
+    chain.append(name)
 
-        try:
-            value = parser.get(section=name, option=option)
-        except configparser.InterpolationMissingOptionError as e:
-            # e.reference contains the correctly formatted
-            # option.
-            missing_options.append(e.reference)
-
-        if substitutions and option in substitutions:
-            # TODO Substitute the value
-            pass
+    for option, value, missing_reference in sections.get(name, []):
+        if missing_reference:
+            missing_options.append(missing_reference)
 
         if option == _MIXIN_OPTION and not is_mode_specific_preset:
             # Multiple mix-in presets are allowed in one option.
-            mixins = [mixin.strip() for mixin in value.splitlines()]
+            mixins = [
+                mixin.strip() for mixin in (value or "").splitlines()
+                if mixin.strip()
+            ]
 
             for mixin in mixins:
                 (mixin_options,
                  mixin_options_after_end,
-                 missing_mixin_options) = _read_preset(
-                    parser=parser,
+                 missing_mixin_options) = _resolve_preset(
+                    sections=sections,
                     name=mixin,
                     run_mode=run_mode,
-                    substitutions=substitutions
+                    resolved=resolved,
+                    chain=chain
                 )
                 options.update(mixin_options)
                 options_after_end.update(mixin_options_after_end)
@@ -141,27 +202,388 @@ def _read_preset(
             else:
                 options.update(pair_to_add)
 
-    if name_with_prefix and name_with_prefix in parser.sections():
+    if not is_mode_specific_preset and name_with_prefix in sections:
         (mode_options,
          mode_options_after_end,
-         missing_mode_options) = _read_preset(
-            parser=parser,
+         missing_mode_options) = _resolve_preset(
+            sections=sections,
             name=name_with_prefix,
             run_mode=run_mode,
-            substitutions=substitutions
+            resolved=resolved,
+            chain=chain
         )
         options.update(mode_options)
         options_after_end.update(mode_options_after_end)
         missing_options.extend(missing_mode_options)
 
-    return options, options_after_end, missing_options
+    chain.pop()
+
+    resolved[name] = (options, options_after_end, missing_options)
+
+    return resolved[name]
+
+
+class PresetTable:
+    """A class for creating objects that contain the presets read
+    from the preset files. The presets are resolved when they are
+    requested, and the requested presets are kept in the table so
+    that they can be stored with it.
+
+    Attributes:
+        names (list): The names of the sections in the preset
+            files.
+        sections (dict): The options of the sections.
+        presets (dict): The requested presets for each run mode.
+            A preset that can't be resolved contains the error
+            instead of the options.
+        cache_file (str): The file that the table is stored in,
+            or 'None' if the table isn't stored.
+        files (list): The descriptions of the preset files for
+            checking whether they have changed.
+        changed (bool): Whether the table has changed since it was
+            stored.
+
+    Private attributes:
+        _resolved (dict): The presets that have been resolved for
+            each run mode, including the mix-in presets.
+    """
+
+    def __init__(
+        self,
+        sections: Dict[str, list],
+        presets: Dict[str, dict] = None
+    ) -> None:
+        """Initializes the preset table object.
+
+        Args:
+            sections (dict): The options of the sections.
+            presets (dict): The requested presets for each run
+                mode that have been resolved earlier.
+        """
+        self.names = list(sections)
+        self.sections = sections
+        self.presets = presets or {
+            run_mode.value: {} for run_mode in _RUN_MODE_PREFIXES
+        }
+        self.cache_file = None
+        self.files = []
+        self.changed = False
+        self._resolved = {run_mode: {} for run_mode in _RUN_MODE_PREFIXES}
+
+    def resolve(self, name: str, run_mode: RunMode) -> dict:
+        """Gives the given preset resolved for the given run mode.
+
+        Args:
+            name (str): The name of the preset.
+            run_mode (RunMode): The mode that the script is
+                invoked in.
+
+        Returns:
+            A 'dict' that contains the options of the preset, the
+            options given after the double dash, and the missing
+            options, or the error that prevents resolving the
+            preset.
+        """
+        presets = self.presets[run_mode.value]
+
+        if name not in presets:
+            try:
+                options, options_after_end, missing_options = \
+                    _resolve_preset(
+                        sections=self.sections,
+                        name=name,
+                        run_mode=run_mode,
+                        resolved=self._resolved[run_mode],
+                        chain=[]
+                    )
+                presets[name] = {
+                    "options": options,
+                    "options_after_end": options_after_end,
+                    "missing_options": missing_options
+                }
+            except ValueError as e:
+                presets[name] = {"error": str(e)}
+
+            self.changed = True
+
+        return presets[name]
+
+
+def _stat_file(path: str) -> dict:
+    """Gives the modification time and the size of the given
+    preset file for checking whether it has changed.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        A 'dict' that describes the file, or 'None' if the file
+        doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _read_files(
+    file_names: List[str],
+    substitutions: dict = None
+) -> Tuple[Dict[str, list], list]:
+    """Reads the given preset files.
+
+    Args:
+        file_names (list): The files from which the presets are
+            read.
+        substitutions (dict): The values that should override the
+            arguments in the preset files.
+
+    Returns:
+        Two values: the first one is a dictionary containing the
+        options of the sections of the files and the second one is
+        a list that describes the files for checking whether they
+        have changed. The first value is 'None' if none of the
+        files exist.
+    """
+    config_parser = _create_configuration_parser(substitutions=substitutions)
+    files = []
+    files_read = 0
+
+    for file_name in file_names:
+        path = os.path.abspath(file_name)
+        # The file is described before it is read so that a change
+        # made while reading it is noticed the next time.
+        entry = {"path": path, "stat": _stat_file(path), "sha256": None}
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            entry["stat"] = None
+        else:
+            entry["sha256"] = hashlib.sha256(data).hexdigest()
+            config_parser.read_string(data.decode("utf-8"), source=path)
+            files_read += 1
+
+        files.append(entry)
+
+    if not files_read:
+        return None, files
+
+    return _read_sections(parser=config_parser), files
+
+
+def _is_cache_valid(files: list) -> Tuple[bool, bool]:
+    """Checks whether the preset files described in a cached table
+    are unchanged. The checksum of a file is only computed if its
+    modification time or size has changed, and the description of
+    such file is updated if its contents are the same.
+
+    Args:
+        files (list): The descriptions of the files.
+
+    Returns:
+        Two values: the first one tells whether the files are
+        unchanged and the second one tells whether the descriptions
+        were updated.
+    """
+    updated = False
+
+    for entry in files:
+        stat = _stat_file(entry["path"])
+
+        if stat == entry["stat"]:
+            continue
+
+        if not stat or not entry["sha256"]:
+            return False, updated
+
+        try:
+            with open(entry["path"], "rb") as f:
+                sha256 = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return False, updated
+
+        if sha256 != entry["sha256"]:
+            return False, updated
+
+        entry["stat"] = stat
+        updated = True
+
+    return True, updated
+
+
+def _resolve_cache_file(
+    file_names: List[str],
+    cache_dir: str,
+    substitutions: dict = None
+) -> str:
+    """Gives the path to the file that contains the resolved table
+    of the given preset files.
+
+    Args:
+        file_names (list): The files from which the presets are
+            read.
+        cache_dir (str): The root directory of the persistent
+            caches.
+        substitutions (dict): The values that should override the
+            arguments in the preset files.
+
+    Returns:
+        An 'str' that is the path to the file.
+    """
+    key = fingerprint.compute({
+        "files": [os.path.abspath(file_name) for file_name in file_names],
+        "substitutions": substitutions or {}
+    })
+
+    return os.path.join(
+        cache_dir,
+        CACHE_DIRECTORY_NAME,
+        "{}.json".format(key)
+    )
+
+
+def _load_cached_table(path: str) -> PresetTable:
+    """Reads the table from the given cache file if the preset
+    files haven't changed.
+
+    Args:
+        path (str): The path to the cache file.
+
+    Returns:
+        A 'PresetTable' that contains the presets, or 'None' if the
+        cached table can't be used.
+    """
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+
+        if cached["version"] != CACHE_VERSION:
+            return None
+
+        is_valid, updated = _is_cache_valid(files=cached["files"])
+
+        if not is_valid:
+            logging.debug("The preset files have changed since %s", path)
+            return None
+
+        table = PresetTable(
+            sections=cached["sections"],
+            presets=cached["presets"]
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    table.cache_file = path
+    table.files = cached["files"]
+    table.changed = updated
+
+    logging.debug("Using the presets from %s", path)
+
+    return table
+
+
+def _store_cached_table(table: PresetTable) -> None:
+    """Writes the given table to its cache file if it has changed.
+    The file is replaced atomically.
+
+    Args:
+        table (PresetTable): The presets.
+    """
+    if not table.cache_file or not table.changed:
+        return
+
+    tmp_file = "{}.{}.tmp".format(table.cache_file, os.getpid())
+
+    try:
+        os.makedirs(os.path.dirname(table.cache_file), exist_ok=True)
+
+        with open(tmp_file, "w") as f:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "files": table.files,
+                    "sections": table.sections,
+                    "presets": table.presets
+                },
+                f,
+                separators=(",", ":")
+            )
+
+        os.replace(tmp_file, table.cache_file)
+    except OSError as e:
+        logging.debug(
+            "Couldn't store the presets to %s: %s",
+            table.cache_file,
+            e
+        )
+
+    table.changed = False
+
+
+def load_presets(
+    file_names: List[str],
+    cache_dir: str = None,
+    substitutions: dict = None
+) -> PresetTable:
+    """Reads the presets from the given preset files.
+
+    Args:
+        file_names (list): The files from which the presets are
+            read.
+        cache_dir (str): The root directory of the persistent
+            caches. If it is given, the presets are stored there
+            and read from there while the preset files don't
+            change.
+        substitutions (dict): The values that should override the
+            arguments in the preset files. The substitutions are
+            currently disabled.
+
+    Returns:
+        A 'PresetTable' that contains the presets, or 'None' if
+        none of the preset files exist.
+    """
+    cache_file = _resolve_cache_file(
+        file_names=file_names,
+        cache_dir=cache_dir,
+        substitutions=substitutions
+    ) if cache_dir else None
+
+    if cache_file:
+        table = _load_cached_table(path=cache_file)
+
+        if table:
+            return table
+
+    sections, files = _read_files(
+        file_names=file_names,
+        substitutions=substitutions
+    )
+
+    if sections is None:
+        logging.warning(
+            "The preset files aren't found (tried %s)",
+            file_names
+        )
+        return None
+
+    table = PresetTable(sections=sections)
+    table.cache_file = cache_file
+    table.files = files
+    table.changed = True
+
+    return table
 
 
 def get_preset_options(
     file_names: List[str],
     preset_name: str,
     run_mode: RunMode,
-    substitutions: dict = None
+    substitutions: dict = None,
+    cache_dir: str = None
 ) -> Tuple[dict, dict]:
     """Gets the options in the given preset.
 
@@ -174,6 +596,8 @@ def get_preset_options(
         substitutions (dict): The values that should override the
             arguments in the preset files. The substitutions are
             currently disabled.
+        cache_dir (str): The root directory of the persistent
+            caches that the presets are stored in.
 
     Returns:
         Two values: the first one is a dictionary containing the
@@ -182,23 +606,25 @@ def get_preset_options(
         the names of the preset options and the values associated
         with them that are given after the double dash.
     """
-    config_parser = _create_configuration_parser(substitutions=substitutions)
+    table = load_presets(
+        file_names=file_names,
+        cache_dir=cache_dir,
+        substitutions=substitutions
+    )
 
-    files_read = config_parser.read(file_names)
+    if not table:
+        return {}, {}
 
-    if files_read == []:
-        logging.warning(
-            "The preset files aren't found (tried %s)",
-            file_names
-        )
-        return []
+    preset = table.resolve(name=preset_name, run_mode=run_mode)
 
-    options, options_after_end, missing_options = _read_preset(
-        parser=config_parser,
-        name=preset_name,
-        run_mode=run_mode,
-        substitutions=substitutions
-    )
+    _store_cached_table(table=table)
+
+    if "error" in preset:
+        raise ValueError(preset["error"])
+
+    options = preset["options"]
+    options_after_end = preset["options_after_end"]
+    missing_options = preset["missing_options"]
 
     if not options and not options_after_end:
         logging.warning("No options were found for preset '%s'", preset_name)
@@ -213,22 +639,26 @@ def get_preset_options(
     return options, options_after_end
 
 
-def get_all_preset_names(file_names: List[str]) -> list:
+def get_all_preset_names(
+    file_names: List[str],
+    cache_dir: str = None
+) -> list:
     """Gets the names of the presets in a preset file.
 
     Args:
         file_names (list): The files from which the presets are
             read.
+        cache_dir (str): The root directory of the persistent
+            caches that the presets are stored in.
 
     Returns:
         A list with the names of the presets.
     """
-    config_parser = _create_configuration_parser()
-    files_read = config_parser.read(file_names)
-    if files_read == []:
-        logging.warning(
-            "The preset files aren't found (tried %s)",
-            file_names
-        )
+    table = load_presets(file_names=file_names, cache_dir=cache_dir)
+
+    if not table:
         return []
-    return config_parser.sections()
+
+    _store_cached_table(table=table)
+
+    return table.names
@@ -16,3 +16,4 @@ class RunMode(Enum):
     preset = "preset"
     configure = "configure"
     compose = "compose"
+    serve_cache = "serve-cache"
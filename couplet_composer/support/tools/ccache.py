@@ -0,0 +1,124 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the class for the object that
+represents ccache in the toolchain of the build script.
+"""
+
+from argparse import Namespace
+
+from ...build_directory import BuildDirectory
+
+from ...target import Target
+
+from ...tool import Tool
+
+
+class CCache(Tool):
+    """A class for creating object that represents ccache in the
+    toolchain of the build script. The tool is used as the
+    compiler launcher of the builds.
+    """
+
+    DIRECTORY_VARIABLE = "CCACHE_DIR"
+    SIZE_VARIABLE = "CCACHE_MAXSIZE"
+    SHOW_STATS_OPTION = "--show-stats"
+    ZERO_STATS_OPTION = "--zero-stats"
+
+    def __init__(
+        self,
+        args: Namespace,
+        build_dir: BuildDirectory,
+        target: Target,
+        key: str = "ccache",
+        name: str = "ccache"
+    ) -> None:
+        """Initializes the ccache tool object.
+
+        Args:
+            args (Namespace): A namespace that contains the
+                parsed command line arguments.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                run.
+            target (Target): The current target.
+            key (str): The simple identifier of this tool.
+            name (str): The full name of this tool.
+        """
+        super().__init__(
+            key=key,
+            cmd=key,
+            name=name,
+            version=None,
+            tool_files=None,
+            args=args,
+            build_dir=build_dir,
+            target=target
+        )
+
+    def _download(self) -> str:
+        """Downloads the asset or the source code of the
+        tool.
+
+        Returns:
+            A 'str' that points to the downloads.
+        """
+        pass
+
+    def _build(self, source_path: str) -> str:
+        """Builds the tool from the sources.
+
+        Args:
+            source_path (str): The path to the source directory
+                of the tool.
+
+        Returns:
+            An 'str' that is the path to the build executable.
+        """
+        pass
+
+    def resolve_environment(self, directory: str, size: str) -> dict:
+        """Gives the environment variables that set the cache
+        directory and the maximum size of the cache.
+
+        Args:
+            directory (str): The optional cache directory.
+            size (str): The optional maximum size of the cache,
+                for example '10G'.
+
+        Returns:
+            A 'dict' that contains the environment variables.
+        """
+        env = {}
+
+        if directory:
+            env[self.DIRECTORY_VARIABLE] = directory
+
+        if size:
+            env[self.SIZE_VARIABLE] = size
+
+        return env
+
+    def resolve_show_stats_command(self, path: str) -> list:
+        """Gives the command that prints the statistics of the
+        cache.
+
+        Args:
+            path (str): The path to the executable of the tool.
+
+        Returns:
+            A 'list' that is the command.
+        """
+        return [path, self.SHOW_STATS_OPTION]
+
+    def resolve_zero_stats_command(self, path: str) -> list:
+        """Gives the command that resets the statistics of the
+        cache.
+
+        Args:
+            path (str): The path to the executable of the tool.
+
+        Returns:
+            A 'list' that is the command.
+        """
+        return [path, self.ZERO_STATS_OPTION]
@@ -5,11 +5,14 @@
 represents CMake in the toolchain of the build script.
 """
 
+import logging
 import os
 
 from argparse import Namespace
 
-from ...util import http, shell
+from ...util import shell
+
+from ...util.lock import file_lock
 
 from ...build_directory import BuildDirectory
 
@@ -49,6 +52,9 @@ class CMake(Tool):
         Returns:
             A 'str' that points to the downloads.
         """
+        from ...util import http
+        from ...util.remote_cache import RemoteCache
+
         tmp_dir = os.path.join(self.build_dir.temporary, self.key)
 
         if not os.path.isdir(tmp_dir):
@@ -58,38 +64,26 @@ class CMake(Tool):
                 echo=self.args.verbose
             )
 
-        download_file = os.path.join(tmp_dir, "{}.{}".format(
-            self.key,
-            self._resolve_download_format(self.target.system)
-        ))
-
-        download_url = "https://github.com/Kitware/CMake/releases/download/" \
+        download_url = "{github}/Kitware/CMake/releases/download/" \
             "v{version}/cmake-{version}-{platform}.{format}".format(
+                github=self.args.github_url.rstrip("/"),
                 version=self.version,
                 platform=self._resolve_download_target(self.target.system),
                 format=self._resolve_download_format(self.target.system)
             )
 
-        http.stream(
-            url=download_url,
-            destination=download_file,
-            headers={"Accept": "application/vnd.github.v3+json"},
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-
         source_dir = os.path.join(tmp_dir, self.key)
 
-        shell.makedirs(
-            path=source_dir,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.tar(
-            path=download_file,
+        http.extract(
+            url=download_url,
+            destination=source_dir,
             action=ArchiveAction.unzip if self.target.system is System.windows
                    else ArchiveAction.extract,
-            dest=source_dir,
+            headers={"Accept": "application/vnd.github.v3+json"},
+            cache_dir=self.args.cache_dir,
+            remote_cache=RemoteCache.from_args(self.args),
+            segments=self.args.download_segments,
+            segment_threshold=self.args.download_segment_threshold,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
@@ -118,27 +112,40 @@ class CMake(Tool):
             self.build_dir.tools,
             "{}-{}".format(self.key, self.target)
         )
-
-        if os.path.isdir(dest_dir):
-            shell.rmtree(dest_dir)
-
-        shell.copytree(
-            cmake_dir,
-            dest_dir,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.rmtree(
-            source_path,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-
-        return os.path.join(
+        dest_tool = os.path.join(
             dest_dir,
             self.resolve_binary(platform=self.target.system)
         )
 
+        if self.args.dry_run:
+            shell.copytree(
+                cmake_dir,
+                dest_dir,
+                dry_run=True,
+                echo=self.args.verbose
+            )
+            shell.rmtree(source_path, dry_run=True, echo=self.args.verbose)
+            return dest_tool
+
+        with file_lock("{}.lock".format(dest_dir)):
+            # Another build may have installed CMake while this one
+            # waited for the lock.
+            if os.path.exists(dest_tool):
+                logging.debug("Using the CMake in %s", dest_dir)
+            else:
+                # CMake is copied next to the final directory first
+                # so that an interrupted copy isn't taken for CMake.
+                tmp_dir = "{}.tmp".format(dest_dir)
+
+                shell.rmtree(tmp_dir, echo=self.args.verbose)
+                shell.copytree(cmake_dir, tmp_dir, echo=self.args.verbose)
+                shell.rmtree(dest_dir, echo=self.args.verbose)
+                os.replace(tmp_dir, dest_dir)
+
+        shell.rmtree(source_path, echo=self.args.verbose)
+
+        return dest_tool
+
     def _resolve_download_format(self, platform: System) -> str:
         """Resolves the file format of the CMake archive that
         will be downloaded.
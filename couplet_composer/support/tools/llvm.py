@@ -6,12 +6,17 @@ represents LLVM and various LLVM tools in the toolchain of the
 build script.
 """
 
+import logging
 import os
 import stat
 
 from argparse import Namespace
 
-from ...util import http, shell
+from typing import Dict, List
+
+from ...util import shell
+
+from ...util.lock import file_lock
 
 from ...build_directory import BuildDirectory
 
@@ -27,13 +32,22 @@ class LLVM(Tool):
     various LLVM tools in the toolchain of the build script.
     """
 
-    def _download(self) -> str:
+    CACHE_DIRECTORY_NAME = "tools"
+
+    def _download(self, members: List[str] = None) -> str:
         """Downloads the asset or the source code of the
         tool.
 
+        Args:
+            members (list): The optional filters of the members
+                that are extracted from the downloaded archive.
+
         Returns:
             A 'str' that points to the downloads.
         """
+        from ...util import http
+        from ...util.remote_cache import RemoteCache
+
         tmp_dir = os.path.join(self.build_dir.temporary, self.key)
 
         if not os.path.isdir(tmp_dir):
@@ -43,32 +57,24 @@ class LLVM(Tool):
                 echo=self.args.verbose
             )
 
-        download_file = os.path.join(tmp_dir, "{}.{}".format(self.key, 'tar.xz'))
-
-        download_url = "https://github.com/llvm/llvm-project/releases/download/llvmorg-{version}/clang+llvm-{version}-{platform}.tar.xz".format(
+        download_url = "{github}/llvm/llvm-project/releases/download/llvmorg-{version}/clang+llvm-{version}-{platform}.tar.xz".format(
+            github=self.args.github_url.rstrip("/"),
             version=self.version,
             platform=self._resolve_download_target(self.target.system),
         )
 
-        http.stream(
-            url=download_url,
-            destination=download_file,
-            headers={"Accept": "application/vnd.github.v3+json"},
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-
         source_dir = os.path.join(tmp_dir, self.key)
 
-        shell.makedirs(
-            path=source_dir,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.tar(
-            path=download_file,
+        http.extract(
+            url=download_url,
+            destination=source_dir,
             action=ArchiveAction.extract,
-            dest=source_dir,
+            members=members,
+            headers={"Accept": "application/vnd.github.v3+json"},
+            cache_dir=self.args.cache_dir,
+            remote_cache=RemoteCache.from_args(self.args),
+            segments=self.args.download_segments,
+            segment_threshold=self.args.download_segment_threshold,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
@@ -122,9 +128,30 @@ class LLVM(Tool):
             An 'str' that is the path to the build tool
             executable.
         """
-        source_dir = self._download()
+        return self.install_extra_tools(tool_names=[tool_name])[tool_name]
+
+    def install_extra_tools(self, tool_names: List[str]) -> Dict[str, str]:
+        """Downloads, builds, and installs the given Clang extra
+        tools. The binaries of LLVM are downloaded and extracted
+        only once and they're kept so that the tools that are
+        installed later don't need a new download.
+
+        Args:
+            tool_names (list): The names of the extra tools to
+                install.
+
+        Returns:
+            A 'dict' that maps the names of the tools to the
+            paths of the installed executables.
+        """
+        bin_dir = self._prepare_binaries()
 
-        return self._build_extra_tool(source_dir, tool_name)
+        return {
+            tool_name: self._build_extra_tool(
+                source_path=bin_dir,
+                tool_name=tool_name
+            ) for tool_name in tool_names
+        }
 
     def install_run_clang_tidy(self) -> str:
         """Downloads, builds, and installs the run-clang-tidy.py
@@ -134,7 +161,9 @@ class LLVM(Tool):
             An 'str' that is the path to the build tool
             executable.
         """
-        source_dir = self._download_clang_tools_extra_source()
+        source_dir = self._download_clang_tools_extra_source(
+            members=["*/clang-tidy/tool/run-clang-tidy.py"]
+        )
 
         return self._build_run_clang_tidy(source_dir)
 
@@ -180,12 +209,93 @@ class LLVM(Tool):
 
         raise ValueError  # TODO Add explanation or logging.
 
+    def _resolve_binaries_directory(self) -> str:
+        """Gives the directory where the extracted binaries of
+        LLVM are kept. The directory is in the persistent cache
+        if the cache is enabled so that it is shared between the
+        build directories, and otherwise it is kept in the
+        temporary directory for the rest of the run.
+
+        Returns:
+            An 'str' that is the path to the directory.
+        """
+        if self.args.cache_dir:
+            root = os.path.join(self.args.cache_dir, self.CACHE_DIRECTORY_NAME)
+        else:
+            root = self.build_dir.temporary
+
+        return os.path.join(
+            root,
+            self.key,
+            "{}-{}".format(
+                self.version,
+                self._resolve_download_target(self.target.system)
+            ),
+            "bin"
+        )
+
+    def _prepare_binaries(self) -> str:
+        """Downloads and extracts the binaries of LLVM unless
+        they're already extracted.
+
+        Returns:
+            An 'str' that is the path to the directory that
+            contains the binaries.
+        """
+        bin_dir = self._resolve_binaries_directory()
+
+        if self.args.dry_run:
+            self._download(members=["*/bin"])
+            return bin_dir
+
+        with file_lock("{}.lock".format(bin_dir)):
+            if os.path.isdir(bin_dir):
+                logging.debug("Using the LLVM binaries in %s", bin_dir)
+                return bin_dir
+
+            source_dir = self._download(members=["*/bin"])
+
+            # The binaries are moved next to the final directory
+            # first as the move may copy them from another file
+            # system, and an interrupted copy mustn't be taken for
+            # the binaries.
+            tmp_dir = "{}.tmp".format(bin_dir)
+
+            shell.rmtree(
+                tmp_dir,
+                dry_run=self.args.dry_run,
+                echo=self.args.verbose
+            )
+            shell.move(
+                os.path.join(
+                    source_dir,
+                    "clang+llvm-{version}-{platform}".format(
+                        version=self.version,
+                        platform=self._resolve_download_target(
+                            self.target.system
+                        )
+                    ),
+                    "bin"
+                ),
+                tmp_dir,
+                dry_run=self.args.dry_run,
+                echo=self.args.verbose
+            )
+            os.replace(tmp_dir, bin_dir)
+            shell.rmtree(
+                source_dir,
+                dry_run=self.args.dry_run,
+                echo=self.args.verbose
+            )
+
+        return bin_dir
+
     def _build_extra_tool(self, source_path: str, tool_name: str) -> str:
         """Builds the given LLVM extra tool from the sources.
 
         Args:
-            source_path (str): The path to the source directory
-                of the tool.
+            source_path (str): The path to the directory that
+                contains the extracted binaries of LLVM.
             tool_name (str): The name of the extra tool to
                 install.
 
@@ -193,15 +303,9 @@ class LLVM(Tool):
             An 'str' that is the path to the build extra tool
             executable.
         """
-        bin_dir = os.path.join(
-            source_path,
-            "clang+llvm-{version}-{platform}".format(
-                version=self.version,
-                platform=self._resolve_download_target(self.target.system),
-            ),
-            "bin"
-        )
-        source_tool = os.path.join(bin_dir, tool_name)
+        # The tool may be a link to another binary of LLVM, and
+        # only the tool itself is copied.
+        source_tool = os.path.realpath(os.path.join(source_path, tool_name))
         dest_dir = os.path.join(
             self.build_dir.tools,
             "{}-{}".format(self.key, self.target)
@@ -216,25 +320,30 @@ class LLVM(Tool):
 
         shell.copy(
             source_tool,
-            dest_dir,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.rmtree(
-            source_path,
+            dest_tool,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
 
         return dest_tool
 
-    def _download_clang_tools_extra_source(self) -> str:
+    def _download_clang_tools_extra_source(
+        self,
+        members: List[str] = None
+    ) -> str:
         """Downloads the asset or the source code of the
         tool.
 
+        Args:
+            members (list): The optional filters of the members
+                that are extracted from the downloaded archive.
+
         Returns:
             A 'str' that points to the downloads.
         """
+        from ...util import http
+        from ...util.remote_cache import RemoteCache
+
         tmp_dir = os.path.join(self.build_dir.temporary, self.key)
 
         if not os.path.isdir(tmp_dir):
@@ -244,29 +353,23 @@ class LLVM(Tool):
                 echo=self.args.verbose
             )
 
-        download_file = os.path.join(tmp_dir, "{}.{}".format(self.key, 'tar.xz'))
-
-        download_url = "https://github.com/llvm/llvm-project/releases/download/llvmorg-{version}/clang-tools-extra-{version}.src.tar.xz".format(version=self.version)
-
-        http.stream(
-            url=download_url,
-            destination=download_file,
-            headers={"Accept": "application/vnd.github.v3+json"},
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
+        download_url = "{github}/llvm/llvm-project/releases/download/llvmorg-{version}/clang-tools-extra-{version}.src.tar.xz".format(
+            github=self.args.github_url.rstrip("/"),
+            version=self.version
         )
 
         source_dir = os.path.join(tmp_dir, self.key)
 
-        shell.makedirs(
-            path=source_dir,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.tar(
-            path=download_file,
+        http.extract(
+            url=download_url,
+            destination=source_dir,
             action=ArchiveAction.extract,
-            dest=source_dir,
+            members=members,
+            headers={"Accept": "application/vnd.github.v3+json"},
+            cache_dir=self.args.cache_dir,
+            remote_cache=RemoteCache.from_args(self.args),
+            segments=self.args.download_segments,
+            segment_threshold=self.args.download_segment_threshold,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
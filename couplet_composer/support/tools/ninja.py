@@ -5,10 +5,13 @@
 represents Ninja in the toolchain of the build script.
 """
 
+import logging
 import os
 import stat
 
-from ...util import http, shell
+from ...util import shell
+
+from ...util.lock import file_lock
 
 from ...build_directory import BuildDirectory
 
@@ -54,6 +57,9 @@ class Ninja(Tool):
         Returns:
             A 'str' that points to the downloads.
         """
+        from ...util import http
+        from ...util.remote_cache import RemoteCache
+
         tmp_dir = os.path.join(self.build_dir.temporary, self.key)
 
         if not os.path.isdir(tmp_dir):
@@ -63,33 +69,24 @@ class Ninja(Tool):
                 echo=self.args.verbose
             )
 
-        download_file = os.path.join(tmp_dir, "{}.zip".format(self.key))
-
-        download_url = "https://github.com/ninja-build/ninja/releases/" \
+        download_url = "{github}/ninja-build/ninja/releases/" \
             "download/v{version}/ninja-{platform}.zip".format(
+                github=self.args.github_url.rstrip("/"),
                 version=self.version,
                 platform=self._resolve_download_target(self.target.system)
             )
 
-        http.stream(
-            url=download_url,
-            destination=download_file,
-            headers={"Accept": "application/vnd.github.v3+json"},
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-
         source_dir = os.path.join(tmp_dir, self.key)
 
-        shell.makedirs(
-            path=source_dir,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-        shell.tar(
-            path=download_file,
+        http.extract(
+            url=download_url,
+            destination=source_dir,
             action=ArchiveAction.unzip,
-            dest=source_dir,
+            headers={"Accept": "application/vnd.github.v3+json"},
+            cache_dir=self.args.cache_dir,
+            remote_cache=RemoteCache.from_args(self.args),
+            segments=self.args.download_segments,
+            segment_threshold=self.args.download_segment_threshold,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
@@ -112,20 +109,50 @@ class Ninja(Tool):
             "{}-{}".format(self.key, self.target),
             "bin"
         )
+        dest_tool = os.path.join(
+            dest_dir,
+            self.resolve_binary(platform=self.target.system)
+        )
 
-        if os.path.isdir(dest_dir):
-            shell.rmtree(
-                dest_dir,
-                dry_run=self.args.dry_run,
-                echo=self.args.verbose
-            )
+        if self.args.dry_run:
+            self._copy_binary(source_path=source_path, dest_dir=dest_dir)
+            shell.rmtree(source_path, dry_run=True, echo=self.args.verbose)
+            return dest_tool
+
+        with file_lock("{}.lock".format(dest_dir)):
+            # Another build may have installed Ninja while this one
+            # waited for the lock.
+            if os.path.exists(dest_tool):
+                logging.debug("Using the Ninja in %s", dest_dir)
+            else:
+                # Ninja is copied next to the final directory first
+                # so that an interrupted copy isn't taken for Ninja.
+                tmp_dir = "{}.tmp".format(dest_dir)
 
+                shell.rmtree(tmp_dir, echo=self.args.verbose)
+                self._copy_binary(source_path=source_path, dest_dir=tmp_dir)
+                shell.rmtree(dest_dir, echo=self.args.verbose)
+                os.replace(tmp_dir, dest_dir)
+
+        shell.rmtree(source_path, echo=self.args.verbose)
+
+        return dest_tool
+
+    def _copy_binary(self, source_path: str, dest_dir: str) -> None:
+        """Copies the Ninja executable from the sources to the
+        given directory and makes it executable.
+
+        Args:
+            source_path (str): The path to the source directory
+                of the tool.
+            dest_dir (str): The directory the executable is
+                copied to.
+        """
         shell.makedirs(
             dest_dir,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
-
         shell.copy(
             os.path.join(
                 source_path,
@@ -136,26 +163,16 @@ class Ninja(Tool):
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
-        shell.rmtree(
-            source_path,
-            dry_run=self.args.dry_run,
-            echo=self.args.verbose
-        )
-
-        dest_tool = os.path.join(
-            dest_dir,
-            self.resolve_binary(platform=self.target.system)
-        )
-
         shell.chmod(
-            dest_tool,
+            os.path.join(
+                dest_dir,
+                self.resolve_binary(platform=self.target.system)
+            ),
             stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH,
             dry_run=self.args.dry_run,
             echo=self.args.verbose
         )
 
-        return dest_tool
-
     def _resolve_download_target(self, platform: System) -> str:
         """Resolves the target platform of the Ninja archive that
         will be downloaded.
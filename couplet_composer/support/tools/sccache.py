@@ -0,0 +1,48 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the class for the object that
+represents sccache in the toolchain of the build script.
+"""
+
+from argparse import Namespace
+
+from ...build_directory import BuildDirectory
+
+from ...target import Target
+
+from .ccache import CCache
+
+
+class SCCache(CCache):
+    """A class for creating object that represents sccache in the
+    toolchain of the build script. The tool is used as the
+    compiler launcher of the builds.
+    """
+
+    DIRECTORY_VARIABLE = "SCCACHE_DIR"
+    SIZE_VARIABLE = "SCCACHE_CACHE_SIZE"
+
+    def __init__(
+        self,
+        args: Namespace,
+        build_dir: BuildDirectory,
+        target: Target
+    ) -> None:
+        """Initializes the sccache tool object.
+
+        Args:
+            args (Namespace): A namespace that contains the
+                parsed command line arguments.
+            build_dir (BuildDirectory): The build directory
+                object that is the main build directory of the
+                run.
+            target (Target): The current target.
+        """
+        super().__init__(
+            args=args,
+            build_dir=build_dir,
+            target=target,
+            key="sccache",
+            name="sccache"
+        )
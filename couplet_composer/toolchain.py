@@ -5,9 +5,19 @@
 of the build script.
 """
 
+import logging
+import os
+import threading
+
 from argparse import Namespace
 
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Callable, List
+
+from .support.compiler_launcher import CompilerLauncher
+
+from .support.tools.ccache import CCache
 
 from .support.tools.cmake import CMake
 
@@ -21,8 +31,14 @@ from .support.tools.make import Make
 
 from .support.tools.ninja import Ninja
 
+from .support.tools.sccache import SCCache
+
+from .util import trace
+
 from .util.cache import cached
 
+from .util.tool_cache import ToolCache
+
 from .build_directory import BuildDirectory
 
 from .target import Target
@@ -39,13 +55,24 @@ class Toolchain:
             paths to use the tools in the toolchain. The
             dictionary is modified in the invocation each time a
             new tool is required and found.
+        _lock (RLock): The lock that protects the locks of the
+            tools and the warm-up of the toolchain.
+        _tool_locks (dict): The locks that make sure that only
+            one thread at a time finds or installs each tool. The
+            Clang extra tools share the lock of LLVM.
+        _warm_up_executor (ThreadPoolExecutor): The thread pool
+            that prepares the tools in the background, or None if
+            the toolchain isn't being warmed up.
 
     Attributes:
         runner (Runner): The runner that this toolchain belongs
             to.
+        tool_cache (ToolCache): The persistent cache of the
+            resolved tools, or None if the tools aren't cached.
     """
 
     LLVM_TOOL_NAME = "llvm"
+    CLANG_TOOL_PREFIX = "clang_"
     RUN_CLANG_TIDY_TOOL_NAME = "run_clang_tidy"
 
     def __init__(
@@ -65,6 +92,7 @@ class Toolchain:
             target (Target): The current target.
         """
         self._tools = {
+            "ccache": CCache(args=args, build_dir=build_dir, target=target),
             "cmake": CMake(
                 key="cmake",
                 cmd="cmake",
@@ -97,9 +125,15 @@ class Toolchain:
                 args=args,
                 build_dir=build_dir,
                 target=target
-            )
+            ),
+            "sccache": SCCache(args=args, build_dir=build_dir, target=target)
         }
         self._tool_paths = {}
+        self._lock = threading.RLock()
+        self._tool_locks = {}
+        self._warm_up_executor = None
+        self.tool_cache = None if args.dry_run \
+            else ToolCache(state=build_dir.state, target=str(target))
 
     @cached
     def __getattr__(self, name: str) -> str:
@@ -124,45 +158,199 @@ class Toolchain:
             AttributeError: Is thrown if the given tool isn't
             found or possible to be built.
         """
-        if name == self.RUN_CLANG_TIDY_TOOL_NAME:
-            if name in self._tool_paths and self._tool_paths[name]:
-                return self._tool_paths[name]
-            else:
-                tool_path = self._tools[self.LLVM_TOOL_NAME].find_tool_extra("run-clang-tidy.py")
+        with self._resolve_tool_lock(name=name), trace.span(
+            "resolve {}".format(name),
+            category="toolchain"
+        ):
+            return self._resolve_tool(name=name)
+
+    def warm_up(self, names: List[str], jobs: int) -> None:
+        """Starts finding the given tools and installing the ones
+        that aren't found in the background so that they're ready
+        when the run needs them. Using a tool that is still being
+        prepared waits for it.
 
-                if tool_path:
-                    self._tool_paths[name] = tool_path
-                    return tool_path
+        Args:
+            names (list): The names of the tools as they're used
+                as the attributes of the toolchain.
+            jobs (int): The maximum number of the tools that are
+                prepared at the same time.
+        """
+        with self._lock:
+            if not self._warm_up_executor:
+                self._warm_up_executor = ThreadPoolExecutor(
+                    max_workers=max(1, jobs),
+                    thread_name_prefix="toolchain"
+                )
+
+            for name in names:
+                self._warm_up_executor.submit(self._warm_up_tool, name)
+
+    def finish_warm_up(self) -> None:
+        """Waits until the tools that are prepared in the
+        background are ready.
+        """
+        with self._lock:
+            executor = self._warm_up_executor
+            self._warm_up_executor = None
 
-                tool_path = self._tools[self.LLVM_TOOL_NAME].install_run_clang_tidy()
+        if executor:
+            executor.shutdown(wait=True)
+
+    def _warm_up_tool(self, name: str) -> None:
+        """Finds or installs the given tool in the background.
+
+        Args:
+            name (str): The name of the tool.
+        """
+        try:
+            getattr(self, name)
+        except Exception as e:
+            # The error is raised again when the run uses the
+            # tool.
+            logging.debug("Couldn't prepare %s in advance: %s", name, e)
+
+    def prepare_extra_tools(self, names: List[str]) -> None:
+        """Finds the given Clang extra tools and installs the
+        ones that aren't found. The missing tools are installed
+        together so that LLVM is downloaded only once for all of
+        the tools that the run needs.
+
+        Args:
+            names (list): The names of the tools as they're used
+                as the attributes of the toolchain, for example
+                'clang_tidy'.
+        """
+        with self._resolve_tool_lock(name=self.LLVM_TOOL_NAME), trace.span(
+            "resolve {}".format(", ".join(names)),
+            category="toolchain"
+        ):
+            llvm = self._tools[self.LLVM_TOOL_NAME]
+            missing = {}
+
+            for name in names:
+                if name in self._tool_paths and self._tool_paths[name]:
+                    continue
+
+                tool_cmd = name.replace("_", "-")
+                tool_path = self._find(
+                    name=name,
+                    find=lambda: llvm.find_tool_extra(tool_cmd)
+                )
 
                 if tool_path:
                     self._tool_paths[name] = tool_path
-                    return tool_path
+                else:
+                    missing[name] = tool_cmd
 
-            raise AttributeError
-        elif name.startswith("clang_"):
+            if not missing:
+                return
+
+            tool_paths = llvm.install_extra_tools(
+                tool_names=list(missing.values())
+            )
+
+            for name, tool_cmd in missing.items():
+                self._tool_paths[name] = tool_paths[tool_cmd]
+                self._store(name=name, tool_path=tool_paths[tool_cmd])
+
+    @cached
+    def resolve_compiler_cache(self, launcher: CompilerLauncher) -> CCache:
+        """Finds the compiler cache that is used as the compiler
+        launcher of the builds. The compiler caches are only
+        looked up from the system and they're never installed.
+
+        Args:
+            launcher (CompilerLauncher): The selected compiler
+                cache. If it is 'auto', ccache is used if it is
+                found and sccache otherwise.
+
+        The return value is cached so that the compiler cache
+        is looked up only once.
+
+        Returns:
+            The tool object of the compiler cache, or None if the
+            compiler cache isn't used or found. The path to the
+            executable is given by the attribute of the toolchain
+            that has the key of the tool as the name.
+        """
+        if launcher is CompilerLauncher.none:
+            return None
+
+        if launcher is CompilerLauncher.auto:
+            names = [CompilerLauncher.ccache.name, CompilerLauncher.sccache.name]
+        else:
+            names = [launcher.name]
+
+        with self._lock:
+            for name in names:
+                if name not in self._tool_paths:
+                    self._tool_paths[name] = self._find(
+                        name=name,
+                        find=self._tools[name].find
+                    )
+
+                if self._tool_paths[name]:
+                    return self._tools[name]
+
+        if launcher is not CompilerLauncher.auto:
+            logging.warning(
+                "The compiler cache %s wasn't found, thus, the builds don't "
+                "use a compiler cache",
+                launcher.name
+            )
+
+        return None
+
+    def _resolve_tool(self, name: str) -> str:
+        """Finds the given tool or downloads and builds it if it
+        isn't found.
+
+        Args:
+            name (str): The name of the tool.
+
+        Returns:
+            The tool.
+
+        Throws:
+            AttributeError: Is thrown if the given tool isn't
+            found or possible to be built.
+        """
+        if name == self.RUN_CLANG_TIDY_TOOL_NAME:
             if name in self._tool_paths and self._tool_paths[name]:
                 return self._tool_paths[name]
             else:
-                tool_path = self._tools[self.LLVM_TOOL_NAME].find_tool_extra(name.replace("_", "-"))
+                tool_path = self._find(
+                    name=name,
+                    find=lambda: self._tools[
+                        self.LLVM_TOOL_NAME
+                    ].find_tool_extra("run-clang-tidy.py")
+                )
 
                 if tool_path:
                     self._tool_paths[name] = tool_path
                     return tool_path
 
-                tool_path = self._tools[self.LLVM_TOOL_NAME].install_extra_tool(name.replace("_", "-"))
+                tool_path = self._tools[self.LLVM_TOOL_NAME].install_run_clang_tidy()
 
                 if tool_path:
                     self._tool_paths[name] = tool_path
+                    self._store(name=name, tool_path=tool_path)
                     return tool_path
 
+            raise AttributeError
+        elif name.startswith(self.CLANG_TOOL_PREFIX):
+            self.prepare_extra_tools(names=[name])
+
+            if name in self._tool_paths and self._tool_paths[name]:
+                return self._tool_paths[name]
+
             raise AttributeError
         else:
             if name in self._tool_paths and self._tool_paths[name]:
                 return self._tool_paths[name]
             else:
-                tool_path = self._tools[name].find()
+                tool_path = self._find(name=name, find=self._tools[name].find)
 
                 if tool_path:
                     self._tool_paths[name] = tool_path
@@ -172,6 +360,85 @@ class Toolchain:
 
                 if tool_path:
                     self._tool_paths[name] = tool_path
+                    self._store(name=name, tool_path=tool_path)
                     return tool_path
 
             raise AttributeError
+
+    @staticmethod
+    def _resolve_query(name: str) -> dict:
+        """Gives the data that is used to find the given tool and
+        that must be the same for a cached path of the tool to be
+        used.
+
+        Args:
+            name (str): The name of the tool.
+
+        Returns:
+            A 'dict' that contains the data.
+        """
+        return {"name": name, "search_path": os.environ.get("PATH")}
+
+    def _find(self, name: str, find: Callable[[], str]) -> str:
+        """Finds the given tool from the persistent cache of the
+        resolved tools or by using the given function.
+
+        Args:
+            name (str): The name of the tool.
+            find (Callable): The function that finds the tool if
+                it isn't cached.
+
+        Returns:
+            An 'str' with the path to the tool executable, or
+            None if it wasn't found.
+        """
+        if self.tool_cache:
+            entry = self.tool_cache.lookup(
+                key=name,
+                query=self._resolve_query(name=name)
+            )
+
+            if entry:
+                return entry["path"]
+
+        tool_path = find()
+
+        if tool_path:
+            self._store(name=name, tool_path=tool_path)
+
+        return tool_path
+
+    def _store(self, name: str, tool_path: str) -> None:
+        """Stores the given resolved tool to the persistent cache
+        of the resolved tools.
+
+        Args:
+            name (str): The name of the tool.
+            tool_path (str): The path to the tool executable.
+        """
+        if self.tool_cache:
+            self.tool_cache.store(
+                key=name,
+                query=self._resolve_query(name=name),
+                path=tool_path
+            )
+
+    def _resolve_tool_lock(self, name: str) -> threading.RLock:
+        """Gives the lock that must be held while the given tool
+        is found or installed.
+
+        Args:
+            name (str): The name of the tool.
+
+        Returns:
+            An 'RLock' that is the lock of the tool.
+        """
+        if name == self.RUN_CLANG_TIDY_TOOL_NAME \
+                or name.startswith(self.CLANG_TOOL_PREFIX):
+            name = self.LLVM_TOOL_NAME
+
+        with self._lock:
+            if name not in self._tool_locks:
+                self._tool_locks[name] = threading.RLock()
+
+            return self._tool_locks[name]
@@ -0,0 +1,211 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the persistent cache of the installed
+files of the dependencies that are built from source.
+"""
+
+import logging
+import os
+import tarfile
+
+from contextlib import contextmanager
+
+from typing import TYPE_CHECKING
+
+from .lock import file_lock
+
+if TYPE_CHECKING:
+    from .remote_cache import RemoteCache
+
+
+__all__ = ["ArtifactCache"]
+
+
+def _check_members(archive: tarfile.TarFile, destination: str) -> None:
+    """Checks that the members of the given archive stay in the
+    destination when they're extracted.
+
+    Args:
+        archive (TarFile): The archive.
+        destination (str): The directory the archive is extracted
+            to.
+
+    Throws:
+        ValueError: Is thrown if a member would be extracted
+            outside the destination, if a link member points
+            outside the destination, or if a member is a special
+            file.
+    """
+    root = os.path.realpath(destination)
+
+    def _is_inside(path: str) -> bool:
+        return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+    for member in archive.getmembers():
+        path = os.path.join(root, member.name)
+
+        if os.path.isabs(member.name) or not _is_inside(path):
+            raise ValueError(
+                "The member {} is outside the destination".format(member.name)
+            )
+
+        if member.isdev():
+            raise ValueError(
+                "The member {} is a special file".format(member.name)
+            )
+
+        if member.issym():
+            target = os.path.join(os.path.dirname(path), member.linkname)
+        elif member.islnk():
+            target = os.path.join(root, member.linkname)
+        else:
+            continue
+
+        if os.path.isabs(member.linkname) or not _is_inside(target):
+            raise ValueError(
+                "The link {} points outside the destination".format(
+                    member.name
+                )
+            )
+
+
+class ArtifactCache:
+    """A class for creating objects that represent the persistent
+    cache of the built dependencies.
+
+    The installed files of a dependency are packed into an
+    archive that is stored by the fingerprint of everything that
+    affects the build of the dependency. The artifacts that
+    aren't in the cache are looked up from the remote cache if
+    the remote cache is used.
+
+    Attributes:
+        path (str): The directory of the cached artifacts.
+        remote (RemoteCache): The optional remote cache.
+    """
+
+    DIRECTORY_NAME = "artifacts"
+    ARCHIVE_SUFFIX = ".tar.gz"
+
+    def __init__(self, root: str, remote: "RemoteCache" = None) -> None:
+        """Initializes the artifact cache object.
+
+        Args:
+            root (str): The root directory of the caches of the
+                build script.
+            remote (RemoteCache): The optional remote cache.
+        """
+        self.path = os.path.join(root, self.DIRECTORY_NAME)
+        self.remote = remote
+
+    def resolve_entry(self, fingerprint: str) -> str:
+        """Gives the path of the cached artifact with the given
+        fingerprint.
+
+        Args:
+            fingerprint (str): The fingerprint of the build.
+
+        Returns:
+            An 'str' that is the path to the cached archive.
+        """
+        return os.path.join(
+            self.path,
+            fingerprint[:2],
+            "{}{}".format(fingerprint, self.ARCHIVE_SUFFIX)
+        )
+
+    @contextmanager
+    def lock(self, fingerprint: str) -> str:
+        """Locks the cache entry of the given fingerprint while
+        the context is active.
+
+        Args:
+            fingerprint (str): The fingerprint of the build.
+
+        Returns:
+            An 'str' that is the path to the cached archive.
+        """
+        entry = self.resolve_entry(fingerprint=fingerprint)
+
+        with file_lock("{}.lock".format(entry)):
+            yield entry
+
+    def restore(self, fingerprint: str, destination: str) -> bool:
+        """Unpacks the cached artifact with the given fingerprint
+        to the destination if it is in the cache.
+
+        Args:
+            fingerprint (str): The fingerprint of the build.
+            destination (str): The directory the artifact is
+                unpacked to.
+
+        Returns:
+            A 'bool' that tells whether the artifact was found in
+            the cache or in the remote cache. An artifact that
+            would be unpacked outside the destination is removed
+            from the cache and not found.
+        """
+        with self.lock(fingerprint=fingerprint) as entry:
+            if not os.path.exists(entry) and not (
+                self.remote and self.remote.fetch(
+                    key=fingerprint,
+                    destination=entry
+                )
+            ):
+                logging.debug("Didn't find %s in the artifact cache", entry)
+                return False
+
+            logging.info("Restoring %s from the artifact cache", entry)
+
+            os.makedirs(destination, exist_ok=True)
+
+            with tarfile.open(entry, mode="r:gz") as archive:
+                # The members are checked before anything is
+                # unpacked so that a bad artifact isn't unpacked
+                # only partly.
+                try:
+                    _check_members(archive=archive, destination=destination)
+                except ValueError as e:
+                    logging.warning(
+                        "Removing %s from the artifact cache: %s",
+                        entry,
+                        e
+                    )
+                    os.remove(entry)
+                    return False
+
+                if hasattr(tarfile, "data_filter"):
+                    archive.extractall(destination, filter="data")
+                else:
+                    archive.extractall(destination)
+
+        return True
+
+    def store(self, fingerprint: str, source: str) -> None:
+        """Packs the given directory to the cache as the artifact
+        with the given fingerprint. The archive is written next to
+        the entry and moved into place only after it's complete.
+
+        Args:
+            fingerprint (str): The fingerprint of the build.
+            source (str): The directory that contains the
+                installed files.
+        """
+        with self.lock(fingerprint=fingerprint) as entry:
+            tmp_file = "{}.tmp".format(entry)
+
+            try:
+                with tarfile.open(tmp_file, mode="w:gz") as archive:
+                    for name in sorted(os.listdir(source)):
+                        archive.add(os.path.join(source, name), arcname=name)
+
+                os.replace(tmp_file, entry)
+            finally:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+
+            if self.remote:
+                self.remote.store(key=fingerprint, path=entry)
+
+        logging.info("Stored %s in the artifact cache", entry)
@@ -0,0 +1,305 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the HTTP server of the remote cache.
+
+The server stores the files in a directory by the layout of the
+remote cache: the blobs under 'cas/' by the SHA-256 checksum of
+their contents and the keys that are mapped to the checksums of
+the blobs under 'ac/'. The uploaded blobs are verified before
+they're stored so that a broken upload can't end up in the
+cache.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import socketserver
+import tempfile
+
+from functools import partial
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+__all__ = ["CacheRequestHandler", "create_server", "serve"]
+
+
+# The pattern of the paths of the files in the cache.
+PATH_PATTERN = re.compile(r"^/(cas|ac)/([0-9a-f]{64})$")
+
+# The pattern of the checksums the keys are mapped to.
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# The size of the chunks the files are read and written in.
+CHUNK_SIZE = 1024 * 1024
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """A class for creating the handlers of the requests to the
+    remote cache server.
+
+    Attributes:
+        directory (str): The directory of the files of the
+            cache.
+        read_only (bool): Whether or not the uploads are
+            rejected.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def __init__(
+        self,
+        *args,
+        directory: str = None,
+        read_only: bool = False,
+        **kwargs
+    ) -> None:
+        self.directory = directory
+        self.read_only = read_only
+        super().__init__(*args, **kwargs)
+
+    def _resolve_path(self) -> tuple:
+        """Gives the namespace, the key, and the file of the
+        requested path.
+
+        Returns:
+            A 'tuple' of the namespace, the key, and the path to
+            the file, or None if the path isn't valid.
+        """
+        match = PATH_PATTERN.match(self.path.split("?", 1)[0])
+
+        if not match:
+            return None
+
+        namespace, key = match.groups()
+
+        return namespace, key, os.path.join(
+            self.directory,
+            namespace,
+            key[:2],
+            key
+        )
+
+    def _send_empty(self, code: int) -> None:
+        """Sends a response that has no body.
+
+        Args:
+            code (int): The status code of the response.
+        """
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_head(self) -> str:
+        """Sends the status code and the headers of a response to
+        a GET or a HEAD request.
+
+        Returns:
+            An 'str' that is the path to the requested file, or
+            None if there is no body to send.
+        """
+        resolved = self._resolve_path()
+
+        if not resolved:
+            self._send_empty(400)
+            return None
+
+        path = resolved[2]
+
+        if not os.path.isfile(path):
+            self._send_empty(404)
+            return None
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.end_headers()
+
+        return path
+
+    def do_HEAD(self) -> None:
+        """Responds to a HEAD request.
+        """
+        self._send_head()
+
+    def do_GET(self) -> None:
+        """Responds to a GET request.
+        """
+        path = self._send_head()
+
+        if path:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+
+    def do_PUT(self) -> None:
+        """Responds to a PUT request by storing the uploaded file.
+        The file is written next to its final path and moved into
+        place only after it has been verified.
+        """
+        if "Content-Length" not in self.headers:
+            self._send_empty(411)
+            return
+
+        length = int(self.headers["Content-Length"])
+
+        resolved = self._resolve_path()
+
+        # The body must be read even if the request is rejected so
+        # that the connection can be kept alive.
+        if self.read_only or not resolved:
+            self._discard(length)
+            self._send_empty(403 if self.read_only else 400)
+            return
+
+        namespace, key, path = resolved
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            digest = hashlib.sha256()
+
+            with os.fdopen(fd, "wb") as f:
+                remaining = length
+
+                while remaining:
+                    chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+
+                    if not chunk:
+                        break
+
+                    digest.update(chunk)
+                    f.write(chunk)
+                    remaining -= len(chunk)
+
+            if remaining:
+                self.close_connection = True
+                self._send_empty(400)
+                return
+
+            if namespace == "cas" and digest.hexdigest() != key:
+                logging.warning(
+                    "Rejected the blob %s that didn't match its checksum",
+                    key
+                )
+                self._send_empty(400)
+                return
+
+            if namespace == "ac":
+                with open(tmp_file, "rb") as f:
+                    value = f.read().decode("ascii", errors="replace").strip()
+
+                if not KEY_PATTERN.match(value):
+                    self._send_empty(400)
+                    return
+
+            os.replace(tmp_file, path)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+        self._send_empty(201)
+
+    def _discard(self, length: int) -> None:
+        """Reads and discards the given number of bytes of the
+        request body.
+
+        Args:
+            length (int): The number of the bytes.
+        """
+        while length > 0:
+            chunk = self.rfile.read(min(CHUNK_SIZE, length))
+
+            if not chunk:
+                break
+
+            length -= len(chunk)
+
+    def log_message(self, format, *args) -> None:
+        logging.debug(
+            "%s - %s",
+            self.address_string(),
+            format % args
+        )
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """A class for creating HTTP servers that handle each request
+    in its own thread.
+    """
+
+    daemon_threads = True
+
+
+def create_server(
+    directory: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    read_only: bool = False
+) -> HTTPServer:
+    """Creates the remote cache server for the given directory.
+
+    Args:
+        directory (str): The directory of the files of the cache.
+        host (str): The address the server listens on.
+        port (int): The port the server listens on, or 0 for any
+            free port.
+        read_only (bool): Whether or not the uploads are
+            rejected.
+
+    Returns:
+        The 'HTTPServer' that isn't started yet.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    return _ThreadingHTTPServer(
+        (host, port),
+        partial(
+            CacheRequestHandler,
+            directory=directory,
+            read_only=read_only
+        )
+    )
+
+
+def serve(
+    directory: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    read_only: bool = False
+) -> None:
+    """Serves the given directory as the remote cache until the
+    server is interrupted.
+
+    Args:
+        directory (str): The directory of the files of the cache.
+        host (str): The address the server listens on.
+        port (int): The port the server listens on, or 0 for any
+            free port.
+        read_only (bool): Whether or not the uploads are
+            rejected.
+    """
+    httpd = create_server(
+        directory=directory,
+        host=host,
+        port=port,
+        read_only=read_only
+    )
+
+    logging.info(
+        "Serving the remote cache in %s at http://%s:%d%s",
+        directory,
+        *httpd.server_address[:2],
+        " (read-only)" if read_only else ""
+    )
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stopping the remote cache server")
+    finally:
+        httpd.server_close()
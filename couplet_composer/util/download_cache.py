@@ -0,0 +1,269 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the persistent cache of the downloaded
+files that is shared between the build directories and the
+invocations of the build script.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+
+from contextlib import contextmanager
+
+from typing import TYPE_CHECKING, Callable
+
+from .lock import file_lock
+
+if TYPE_CHECKING:
+    from .remote_cache import RemoteCache
+
+
+__all__ = ["DownloadCache", "file_sha256"]
+
+
+def file_sha256(path: str) -> str:
+    """Computes the SHA-256 checksum of the given file.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        An 'str' that is the hexadecimal checksum.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+class DownloadCache:
+    """A class for creating objects that represent the persistent
+    cache of the downloaded files.
+
+    The files are stored by the SHA-256 checksum of their
+    contents if the checksum is known beforehand, and otherwise
+    by the SHA-256 checksum of the URL they're downloaded from.
+    The files that aren't in the cache are looked up from the
+    remote cache before they're downloaded if the remote cache is
+    used.
+
+    Attributes:
+        path (str): The directory of the cached downloads.
+        remote (RemoteCache): The optional remote cache.
+    """
+
+    DIRECTORY_NAME = "downloads"
+
+    def __init__(self, root: str, remote: "RemoteCache" = None) -> None:
+        """Initializes the download cache object.
+
+        Args:
+            root (str): The root directory of the caches of the
+                build script.
+            remote (RemoteCache): The optional remote cache.
+        """
+        self.path = os.path.join(root, self.DIRECTORY_NAME)
+        self.remote = remote
+
+    def resolve_entry(self, url: str, sha256: str = None) -> str:
+        """Gives the path of the cached file for the given
+        download.
+
+        Args:
+            url (str): The URL of the download.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded file.
+
+        Returns:
+            An 'str' that is the path to the cached file.
+        """
+        if sha256:
+            key = sha256.lower()
+            category = "sha256"
+        else:
+            key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+            category = "url"
+
+        return os.path.join(self.path, category, key[:2], key)
+
+    @staticmethod
+    def resolve_download_file(entry: str) -> str:
+        """Gives the path that the given cache entry is
+        downloaded to before it is moved into the cache.
+
+        Args:
+            entry (str): The path to the cached file.
+
+        Returns:
+            An 'str' that is the path to the download.
+        """
+        return "{}.download".format(entry)
+
+    @contextmanager
+    def lock(self, url: str, sha256: str = None) -> str:
+        """Locks the cache entry of the given download while the
+        context is active.
+
+        Args:
+            url (str): The URL of the download.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded file.
+
+        Returns:
+            An 'str' that is the path to the cached file.
+        """
+        entry = self.resolve_entry(url=url, sha256=sha256)
+
+        with file_lock("{}.lock".format(entry)):
+            yield entry
+
+    @staticmethod
+    def _resolve_remote_key(url: str) -> str:
+        """Gives the key of the given download in the remote
+        cache when the checksum of the file isn't known.
+
+        Args:
+            url (str): The URL of the download.
+
+        Returns:
+            An 'str' that is the key.
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def fetch_remote(self, url: str, entry: str, sha256: str = None) -> bool:
+        """Downloads the given file from the remote cache to its
+        entry. The entry must be locked.
+
+        Args:
+            url (str): The URL of the download.
+            entry (str): The path to the cached file.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded file.
+
+        Returns:
+            A 'bool' that tells whether the file was found in the
+            remote cache.
+        """
+        if not self.remote:
+            return False
+
+        if sha256:
+            return self.remote.fetch_blob(digest=sha256, destination=entry)
+
+        return self.remote.fetch(
+            key=self._resolve_remote_key(url=url),
+            destination=entry
+        )
+
+    def store_remote(self, url: str, entry: str, sha256: str = None) -> None:
+        """Uploads the given cached file to the remote cache.
+
+        Args:
+            url (str): The URL of the download.
+            entry (str): The path to the cached file.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded file.
+        """
+        if not self.remote:
+            return
+
+        if sha256:
+            self.remote.store_blob(path=entry, digest=sha256)
+        else:
+            self.remote.store(
+                key=self._resolve_remote_key(url=url),
+                path=entry
+            )
+
+    def fetch(
+        self,
+        url: str,
+        destination: str,
+        download: Callable[[str], None],
+        sha256: str = None
+    ) -> bool:
+        """Places the given download to the destination either
+        from the cache or by downloading it into the cache first.
+
+        The cache entry is locked while it is checked and
+        written so that the concurrent invocations download each
+        file only once, and the downloads are moved into the
+        cache only after they're complete and verified. The
+        download is always written to the same path next to the
+        entry so that the function given as 'download' can
+        continue an interrupted download.
+
+        Args:
+            url (str): The URL of the download.
+            destination (str): The path where the file is placed.
+            download (Callable): The function that downloads the
+                file to the path it is given.
+            sha256 (str): The optional SHA-256 checksum of the
+                downloaded file.
+
+        Returns:
+            A 'bool' that tells whether the file was found in the
+            cache or in the remote cache.
+
+        Throws:
+            ValueError: Is thrown if the downloaded file doesn't
+                match the given checksum.
+        """
+        with self.lock(url=url, sha256=sha256) as entry:
+            hit = os.path.exists(entry)
+
+            if hit:
+                logging.info("Found %s in the download cache", url)
+            elif self.fetch_remote(url=url, entry=entry, sha256=sha256):
+                hit = True
+            else:
+                logging.info(
+                    "Didn't find %s in the download cache, downloading it",
+                    url
+                )
+
+                download_file = self.resolve_download_file(entry=entry)
+
+                try:
+                    download(download_file)
+
+                    if sha256 and file_sha256(download_file) != sha256.lower():
+                        raise ValueError(
+                            "The file downloaded from {} doesn't match the "
+                            "checksum {}".format(url, sha256)
+                        )
+
+                    os.replace(download_file, entry)
+                finally:
+                    if os.path.exists(download_file):
+                        os.remove(download_file)
+
+                self.store_remote(url=url, entry=entry, sha256=sha256)
+
+        self._place(entry=entry, destination=destination)
+
+        return hit
+
+    @staticmethod
+    def _place(entry: str, destination: str) -> None:
+        """Places the cached file to the destination by linking
+        it if possible and by copying it otherwise. The cached
+        files are never modified in place so the link is safe.
+
+        Args:
+            entry (str): The cached file.
+            destination (str): The path where the file is placed.
+        """
+        if os.path.lexists(destination):
+            os.remove(destination)
+
+        try:
+            os.link(entry, destination)
+        except OSError:
+            shutil.copyfile(entry, destination)
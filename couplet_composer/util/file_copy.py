@@ -0,0 +1,465 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the helpers for copying files and
+directory trees with the fastest method that the file systems
+support.
+
+The contents of a file are copied by cloning them if the file
+system supports copy-on-write reflinks, then by copying them in
+the kernel with 'copy_file_range' or 'sendfile', and only then by
+reading and writing them in user space.
+"""
+
+import errno
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Callable, List, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+__all__ = ["STRATEGIES", "copy_file", "copy_tree", "link_file", "link_tree"]
+
+
+# The request code of the 'FICLONE' ioctl of Linux.
+_FICLONE = 0x40049409
+
+# The largest number of bytes copied in the kernel in one call.
+_KERNEL_CHUNK_SIZE = 1024 * 1024 * 1024
+
+# The size of the buffer of the copying in user space.
+_BUFFER_SIZE = 1024 * 1024
+
+# The total size of the small files that are copied as one task
+# of the thread pool.
+_BATCH_SIZE = 4 * 1024 * 1024
+
+# The errors that tell that a method isn't supported between the
+# given files rather than that the copying has failed.
+_UNSUPPORTED_ERRORS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EXDEV
+}
+
+# The number of the threads that copy the files of a tree by
+# default.
+COPY_JOBS = min(32, (os.cpu_count() or 1) + 4)
+
+# The methods that have been found to be unsupported, mapped to
+# the devices of the source and the destination.
+_unsupported = set()
+_unsupported_lock = threading.Lock()
+
+
+class _UnsupportedError(Exception):
+    """An exception that is raised when a copying method isn't
+    supported for the given files.
+    """
+
+
+def _copy_reflink(src_fd: int, dest_fd: int, size: int) -> None:
+    """Clones the contents of the source file to the destination
+    file.
+
+    Args:
+        src_fd (int): The file descriptor of the source file.
+        dest_fd (int): The file descriptor of the destination.
+        size (int): The size of the source file.
+    """
+    if not fcntl or not sys.platform.startswith("linux"):
+        raise _UnsupportedError
+
+    try:
+        fcntl.ioctl(dest_fd, _FICLONE, src_fd)
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRORS:
+            raise _UnsupportedError
+        raise
+
+
+def _copy_kernel(
+    function: Callable[[int, int, int], int],
+    src_fd: int,
+    dest_fd: int,
+    size: int
+) -> None:
+    """Copies the contents of the source file to the destination
+    file in the kernel by using the given function.
+
+    Args:
+        function (Callable): The function that copies the given
+            number of bytes from the current offset of the
+            source to the destination and gives the number of
+            the copied bytes.
+        src_fd (int): The file descriptor of the source file.
+        dest_fd (int): The file descriptor of the destination.
+        size (int): The size of the source file.
+    """
+    copied = 0
+
+    while True:
+        try:
+            written = function(
+                src_fd,
+                dest_fd,
+                min(max(size - copied, 1), _KERNEL_CHUNK_SIZE)
+            )
+        except OSError as e:
+            # Nothing is written to the destination if the method
+            # is unsupported, so the next method can start over.
+            if copied == 0 and e.errno in _UNSUPPORTED_ERRORS:
+                raise _UnsupportedError
+            raise
+
+        copied += written
+
+        # The file is copied up to the size it had when it was
+        # opened, and an empty write means the file was shrunk.
+        if written == 0 or copied >= size:
+            break
+
+
+def _copy_file_range(src_fd: int, dest_fd: int, size: int) -> None:
+    """Copies the contents of the source file to the destination
+    file with 'copy_file_range'.
+
+    Args:
+        src_fd (int): The file descriptor of the source file.
+        dest_fd (int): The file descriptor of the destination.
+        size (int): The size of the source file.
+    """
+    if not hasattr(os, "copy_file_range"):
+        raise _UnsupportedError
+
+    _copy_kernel(
+        function=os.copy_file_range,
+        src_fd=src_fd,
+        dest_fd=dest_fd,
+        size=size
+    )
+
+
+def _copy_sendfile(src_fd: int, dest_fd: int, size: int) -> None:
+    """Copies the contents of the source file to the destination
+    file with 'sendfile'.
+
+    Args:
+        src_fd (int): The file descriptor of the source file.
+        dest_fd (int): The file descriptor of the destination.
+        size (int): The size of the source file.
+    """
+    # Only Linux supports regular files as the destination.
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        raise _UnsupportedError
+
+    _copy_kernel(
+        function=lambda src, dest, count: os.sendfile(dest, src, None, count),
+        src_fd=src_fd,
+        dest_fd=dest_fd,
+        size=size
+    )
+
+
+def _copy_buffered(src_fd: int, dest_fd: int, size: int) -> None:
+    """Copies the contents of the source file to the destination
+    file by reading and writing them in user space.
+
+    Args:
+        src_fd (int): The file descriptor of the source file.
+        dest_fd (int): The file descriptor of the destination.
+        size (int): The size of the source file.
+    """
+    buffer = memoryview(bytearray(_BUFFER_SIZE))
+
+    with open(src_fd, "rb", buffering=0, closefd=False) as src_file:
+        while True:
+            read = src_file.readinto(buffer)
+
+            if not read:
+                break
+
+            written = 0
+
+            while written < read:
+                written += os.write(dest_fd, buffer[written:read])
+
+
+# The copying methods in the order they're tried.
+STRATEGIES = {
+    "reflink": _copy_reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _copy_sendfile,
+    "buffered": _copy_buffered
+}
+
+
+def _copy(src: str, dest: str, strategies: List[str] = None) -> None:
+    """Copies the contents, the permission bits, and the times of
+    the given file to the destination file. The file is copied to
+    a temporary file next to the destination that then replaces
+    the destination so that the copying never writes to an
+    existing file, which may be a hard link to the source.
+
+    Args:
+        src (str): The file to copy.
+        dest (str): The file where the source is copied to.
+        strategies (list): The optional names of the methods that
+            are tried, in order.
+    """
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+
+    try:
+        src_stat = os.fstat(src_fd)
+        dest_fd, tmp_file = tempfile.mkstemp(
+            prefix=".{}.".format(os.path.basename(dest)),
+            dir=os.path.dirname(dest) or os.curdir
+        )
+
+        try:
+            devices = (src_stat.st_dev, os.fstat(dest_fd).st_dev)
+
+            for name in strategies or STRATEGIES:
+                if (name, devices) in _unsupported:
+                    continue
+
+                try:
+                    STRATEGIES[name](src_fd, dest_fd, src_stat.st_size)
+                except _UnsupportedError:
+                    logging.debug(
+                        "Copying with %s isn't supported from %s to %s",
+                        name,
+                        src,
+                        dest
+                    )
+                    with _unsupported_lock:
+                        _unsupported.add((name, devices))
+                    continue
+
+                break
+            else:
+                raise OSError(
+                    errno.ENOTSUP,
+                    "None of the methods could copy the file",
+                    src
+                )
+
+            # The metadata is set through the open descriptor so
+            # that the paths aren't looked up again.
+            if os.chmod in os.supports_fd:
+                os.chmod(dest_fd, src_stat.st_mode & 0o7777)
+            else:
+                os.chmod(tmp_file, src_stat.st_mode & 0o7777)
+        except BaseException:
+            os.close(dest_fd)
+            os.remove(tmp_file)
+            raise
+        else:
+            os.close(dest_fd)
+    finally:
+        os.close(src_fd)
+
+    try:
+        os.utime(tmp_file, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(tmp_file, dest)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+
+def copy_file(
+    src: str,
+    dest: str,
+    strategies: List[str] = None
+) -> str:
+    """Copies a file, its permission bits, and its times like
+    'cp -p' by using the fastest method that works for the files.
+    A method that isn't supported between two file systems isn't
+    tried again for them.
+
+    Args:
+        src (str): The file to copy.
+        dest (str): The directory or file where the source is
+            copied to.
+        strategies (list): The optional names of the methods that
+            are tried, in order. By default every method in
+            'STRATEGIES' is tried.
+
+    Returns:
+        An 'str' that is the path to the copy.
+    """
+    if os.path.isdir(dest):
+        dest = os.path.join(dest, os.path.basename(src))
+
+    if os.path.exists(dest) and os.path.samefile(src, dest):
+        raise shutil.SameFileError(
+            "{!r} and {!r} are the same file".format(src, dest)
+        )
+
+    _copy(src=src, dest=dest, strategies=strategies)
+
+    return dest
+
+
+def _copy_files(files: List[Tuple[str, str]]) -> None:
+    """Copies the given files.
+
+    Args:
+        files (list): The pairs of the source and the destination
+            of the files.
+    """
+    for src, dest in files:
+        _copy(src=src, dest=dest)
+
+
+def copy_tree(src: str, dest: str, jobs: int = None) -> None:
+    """Copies a directory and its contents like 'shutil.copytree'
+    by using the fastest methods of 'copy_file' for the files.
+    The files are copied in a thread pool, and the source is
+    merged into the destination if the destination already
+    exists.
+
+    Args:
+        src (str): The directory to copy.
+        dest (str): The directory where the source is copied to.
+        jobs (int): The optional number of the threads that copy
+            the files.
+    """
+    if os.path.exists(dest) and os.path.samefile(src, dest):
+        raise shutil.SameFileError(
+            "{!r} and {!r} are the same directory".format(src, dest)
+        )
+
+    directories = []
+
+    with ThreadPoolExecutor(max_workers=jobs or COPY_JOBS) as executor:
+        futures = []
+
+        for root, dirs, files in os.walk(src, followlinks=True):
+            dest_root = os.path.join(dest, os.path.relpath(root, src))
+
+            os.makedirs(dest_root, exist_ok=True)
+            directories.append((root, dest_root))
+
+            # The small files are copied in batches as scheduling
+            # them one by one would cost more than copying them.
+            batch = []
+            batch_size = 0
+
+            for name in files:
+                pair = (os.path.join(root, name), os.path.join(dest_root, name))
+                batch.append(pair)
+                batch_size += os.path.getsize(pair[0])
+
+                if batch_size >= _BATCH_SIZE:
+                    futures.append(executor.submit(_copy_files, batch))
+                    batch = []
+                    batch_size = 0
+
+            if batch:
+                futures.append(executor.submit(_copy_files, batch))
+
+        for future in futures:
+            future.result()
+
+    # The metadata of the directories is copied last so that
+    # copying the files doesn't change the times.
+    for root, dest_root in reversed(directories):
+        shutil.copystat(root, dest_root)
+
+
+def link_file(src: str, dest: str, symbolic: bool = False) -> bool:
+    """Links the given file to the destination. The file is
+    copied instead if the link can't be created, for example
+    because the source and the destination are on different file
+    systems.
+
+    Args:
+        src (str): The file to link.
+        dest (str): The path of the link.
+        symbolic (bool): Whether or not a symbolic link is
+            created instead of a hard link.
+
+    Returns:
+        A 'bool' that tells whether the file was linked.
+    """
+    # A symbolic link to a missing file would be created without
+    # an error.
+    if symbolic and not os.path.exists(src):
+        raise FileNotFoundError(errno.ENOENT, "No such file", src)
+
+    try:
+        if symbolic:
+            os.symlink(os.path.abspath(src), dest)
+        else:
+            os.link(src, dest)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        logging.debug(
+            "Couldn't link %s to %s, copying it instead: %s",
+            src,
+            dest,
+            e
+        )
+        _copy(src=src, dest=dest)
+        return False
+
+    return True
+
+
+def link_tree(src: str, dest: str, symbolic: bool = False) -> None:
+    """Links the given directory to the destination. A symbolic
+    link is created for the whole directory, and the files of the
+    directory are hard linked one by one otherwise as directories
+    can't be hard linked. The files that can't be linked are
+    copied instead.
+
+    Args:
+        src (str): The directory to link.
+        dest (str): The path of the linked directory.
+        symbolic (bool): Whether or not a symbolic link is
+            created instead of hard links.
+    """
+    if not os.path.isdir(src):
+        raise NotADirectoryError(errno.ENOTDIR, "Not a directory", src)
+
+    if symbolic:
+        try:
+            os.symlink(os.path.abspath(src), dest, target_is_directory=True)
+            return
+        except FileExistsError:
+            raise
+        except OSError as e:
+            logging.debug(
+                "Couldn't link %s to %s, copying it instead: %s",
+                src,
+                dest,
+                e
+            )
+            copy_tree(src, dest)
+            return
+
+    for root, dirs, files in os.walk(src, followlinks=True):
+        dest_root = os.path.join(dest, os.path.relpath(root, src))
+
+        os.makedirs(dest_root, exist_ok=True)
+
+        for name in files:
+            link_file(os.path.join(root, name), os.path.join(dest_root, name))
@@ -0,0 +1,138 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains helpers for computing the fingerprints
+that identify the inputs of the builds.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+
+from typing import TYPE_CHECKING, Any, List
+
+from . import shell
+
+from .cache import cached
+
+if TYPE_CHECKING:
+    from .tool_cache import ToolCache
+
+
+__all__ = ["compute", "compiler_identity", "explain"]
+
+
+def compute(data: Any) -> str:
+    """Computes the fingerprint of the given data. The data must
+    be serializable to JSON, and the order of the keys of the
+    dictionaries doesn't affect the fingerprint.
+
+    Args:
+        data (Any): The data that is fingerprinted.
+
+    Returns:
+        An 'str' that is the hexadecimal SHA-256 checksum of the
+        data.
+    """
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def explain(previous: dict, current: dict) -> List[str]:
+    """Describes how the given inputs of a fingerprint differ
+    from the inputs of an earlier fingerprint.
+
+    Args:
+        previous (dict): The earlier inputs.
+        current (dict): The current inputs.
+
+    Returns:
+        A 'list' that contains a description of each changed
+        input, or an empty list if the inputs are the same.
+    """
+    changes = []
+
+    for key in sorted(set(previous) | set(current)):
+        if key not in previous:
+            changes.append("'{}' was added".format(key))
+        elif key not in current:
+            changes.append("'{}' was removed".format(key))
+        elif compute(previous[key]) != compute(current[key]):
+            old = previous[key]
+            new = current[key]
+
+            if isinstance(old, list) and isinstance(new, list):
+                added = [v for v in new if v not in old]
+                removed = [v for v in old if v not in new]
+                details = ["added {}".format(v) for v in added] \
+                    + ["removed {}".format(v) for v in removed]
+                changes.append("'{}' changed: {}".format(
+                    key,
+                    ", ".join(details) if details else "the order changed"
+                ))
+            elif isinstance(old, dict) and isinstance(new, dict):
+                changes.extend(
+                    "'{}': {}".format(key, change)
+                    for change in explain(previous=old, current=new)
+                )
+            else:
+                changes.append("'{}' changed from {} to {}".format(
+                    key,
+                    json.dumps(old, sort_keys=True),
+                    json.dumps(new, sort_keys=True)
+                ))
+
+    return changes
+
+
+@cached
+def compiler_identity(cache: "ToolCache" = None) -> dict:
+    """Resolves the identity of the C and C++ compilers that CMake
+    uses by default. The compilers are taken from the environment
+    variables 'CC' and 'CXX' like CMake does, and their identity
+    consists of their paths and the first lines of their version
+    output.
+
+    Args:
+        cache (ToolCache): The optional persistent cache of the
+            resolved tools. The compilers that are found in it
+            aren't searched or run again.
+
+    Returns:
+        A 'dict' that contains the identity of the compilers.
+    """
+    windows = platform.system() == "Windows"
+    identity = {}
+
+    for language, variable, default in [
+        ("c", "CC", "cl" if windows else "cc"),
+        ("cxx", "CXX", "cl" if windows else "c++")
+    ]:
+        command = os.environ.get(variable, default)
+        key = "compiler_{}".format(language)
+        query = {"command": command, "search_path": os.environ.get("PATH")}
+        entry = cache.lookup(key=key, query=query) if cache else None
+
+        if entry:
+            identity[language] = {
+                "path": entry["path"],
+                "version": entry["version"]
+            }
+            continue
+
+        compiler = shutil.which(command)
+        version = None
+
+        if compiler and not windows:
+            output = shell.capture([compiler, "--version"], optional=True)
+            version = output.splitlines()[0] if output else None
+
+        if compiler and cache:
+            cache.store(key=key, query=query, path=compiler, version=version)
+
+        identity[language] = {"path": compiler, "version": version}
+
+    return identity
@@ -2,19 +2,813 @@
 # Licensed under the MIT License
 
 """A module that contains helpers for streaming from internet.
+
+The module imports 'requests', which is slow to import, so the
+modules that only download files on some code paths import this
+module in the functions that download.
 """
 
+import logging
 import os
+import shutil
+import sys
+import tarfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import TYPE_CHECKING, List
 
 import requests
+import urllib3
+
+from requests.adapters import HTTPAdapter
+
+from ..support.archive_action import ArchiveAction
+
+from . import shell, trace
+
+from .download_cache import DownloadCache, file_sha256
+
+if TYPE_CHECKING:
+    from .remote_cache import RemoteCache
+
+
+# The timeouts for connecting to the server and for waiting for
+# data from the server in seconds.
+TIMEOUT = (15, 60)
+
+# The number of the times a failed transfer is retried and the
+# delay before the first retry in seconds. The delay is doubled
+# after every retry.
+RETRIES = 5
+RETRY_DELAY = 1.0
+
+# The HTTP status codes that are worth retrying.
+RETRY_STATUS_CODES = [408, 429, 500, 502, 503, 504]
+
+# The limits of the size of the chunks read from the responses.
+# The chunk size starts from the minimum and is adapted to the
+# speed of the transfer.
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+
+# The number of the kept-alive connections per host.
+POOL_SIZE = 16
+
+# The default number of the parallel ranges a large file is
+# downloaded in and the default size in bytes from which on a file
+# is downloaded in ranges if the server accepts them.
+SEGMENTS = 4
+SEGMENT_THRESHOLD = 32 * 1024 * 1024
+
+PART_FILE_SUFFIX = ".part"
+
+# The suffix of the file next to a partial file that contains the
+# validator of the version of the file that the partial file is a
+# part of.
+VALIDATOR_FILE_SUFFIX = ".validator"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class _ChangedError(Exception):
+    """An exception that is raised when the file changes on the
+    server while it is downloaded in ranges.
+    """
+    pass
+
+
+class _RetryableError(Exception):
+    """An exception that is raised when a transfer fails in a way
+    that is worth retrying.
+    """
+    pass
+
+
+def get_session() -> requests.Session:
+    """Gives the HTTP session that is shared by all of the
+    transfers so that the connections to the hosts are kept alive
+    and pooled.
+
+    Returns:
+        The shared 'Session'.
+    """
+    global _session
+
+    with _session_lock:
+        if not _session:
+            adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE,
+                pool_maxsize=POOL_SIZE
+            )
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+
+        return _session
+
+
+def _adapt_chunk_size(chunk_size: int, elapsed: float, full: bool) -> int:
+    """Computes the size of the next chunk that is read from a
+    response from the time it took to read the previous chunk.
+
+    Args:
+        chunk_size (int): The size of the previous chunk.
+        elapsed (float): The time it took to read the previous
+            chunk in seconds.
+        full (bool): Whether the previous chunk was read in full.
+
+    Returns:
+        An 'int' that is the size of the next chunk.
+    """
+    if full and elapsed < 0.05:
+        return min(chunk_size * 2, MAX_CHUNK_SIZE)
+    elif elapsed > 0.5:
+        return max(chunk_size // 2, MIN_CHUNK_SIZE)
+
+    return chunk_size
+
+
+def _write_response(response: requests.Response, file) -> int:
+    """Writes the body of the given response to the given file in
+    chunks the size of which is adapted to the speed of the
+    transfer.
+
+    Args:
+        response (Response): The streamed response.
+        file (file): The file object the body is written to.
+
+    Returns:
+        An 'int' that is the number of the bytes written.
+    """
+    chunk_size = MIN_CHUNK_SIZE
+    written = 0
+
+    while True:
+        start = time.monotonic()
+        chunk = response.raw.read(chunk_size, decode_content=True)
+
+        if not chunk:
+            break
+
+        file.write(chunk)
+        written += len(chunk)
+        chunk_size = _adapt_chunk_size(
+            chunk_size=chunk_size,
+            elapsed=time.monotonic() - start,
+            full=len(chunk) == chunk_size
+        )
+
+    return written
+
+
+def _resolve_validator(response: requests.Response) -> str:
+    """Gives the validator of the file in the given response. Only
+    a strong entity tag or the modification time can be used as
+    the validator of a range request.
+
+    Args:
+        response (Response): The response to a request for the
+            whole file.
+
+    Returns:
+        An 'str' that is the validator, or None if the response
+        doesn't have one.
+    """
+    validator = response.headers.get("ETag")
+
+    if not validator or validator.startswith("W/"):
+        validator = response.headers.get("Last-Modified")
+
+    return validator
+
+
+def _store_validator(part_file: str, response: requests.Response) -> None:
+    """Stores the validator of the file in the given response next
+    to the partial file so that the partial file is continued only
+    if the file hasn't changed.
+
+    Args:
+        part_file (str): The partial file.
+        response (Response): The response to a request for the
+            whole file.
+    """
+    validator_file = "{}{}".format(part_file, VALIDATOR_FILE_SUFFIX)
+    validator = _resolve_validator(response=response)
+
+    if not validator:
+        if os.path.exists(validator_file):
+            os.remove(validator_file)
+        return
+
+    with open(validator_file, "w") as f:
+        f.write(validator)
+
+
+def _read_validator(part_file: str) -> str:
+    """Reads the validator of the file that the given partial file
+    is a part of.
+
+    Args:
+        part_file (str): The partial file.
+
+    Returns:
+        An 'str' that is the validator, or None if it isn't known.
+    """
+    try:
+        with open("{}{}".format(part_file, VALIDATOR_FILE_SUFFIX)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _remove_partial_file(part_file: str) -> None:
+    """Removes the given partial file and its validator.
+
+    Args:
+        part_file (str): The partial file.
+    """
+    for path in [part_file, "{}{}".format(part_file, VALIDATOR_FILE_SUFFIX)]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _resolve_range_start(content_range: str) -> int:
+    """Gives the first byte of the range in the given
+    'Content-Range' header.
+
+    Args:
+        content_range (str): The value of the header.
+
+    Returns:
+        An 'int' that is the first byte, or None if the header
+        isn't a valid byte range.
+    """
+    try:
+        unit, bounds = content_range.split(" ", 1)
+
+        if unit != "bytes":
+            return None
+
+        return int(bounds.split("-", 1)[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+def _can_segment(
+    response: requests.Response,
+    segments: int,
+    segment_threshold: int
+) -> bool:
+    """Checks whether the file in the given response should be
+    downloaded in parallel ranges.
+
+    Args:
+        response (Response): The response to a request for the
+            whole file.
+        segments (int): The number of the ranges.
+        segment_threshold (int): The size in bytes from which on
+            the file is downloaded in ranges.
+
+    Returns:
+        A 'bool' telling whether the file should be downloaded in
+        ranges.
+    """
+    # The ranges are written to their offsets in the file, which
+    # requires 'os.pwrite'.
+    if not segments or segments < 2 or not hasattr(os, "pwrite"):
+        return False
+
+    # The ranges can be joined only if it can be checked that they
+    # are of the same version of the file.
+    if response.status_code != 200 \
+            or not _resolve_validator(response=response) \
+            or response.headers.get("Accept-Ranges") != "bytes" \
+            or response.headers.get("Content-Encoding", "identity") \
+            != "identity" \
+            or "Content-Length" not in response.headers:
+        return False
+
+    return int(response.headers["Content-Length"]) >= segment_threshold
+
+
+def _transfer_segment(
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    headers: dict,
+    validator: str
+) -> None:
+    """Transfers the given range of a file and writes it to its
+    offset in the given file. A failed transfer is retried from
+    the first byte that wasn't written.
+
+    Args:
+        url (str): The url where the file is streamed from.
+        fd (int): The file descriptor of the file the range is
+            written to.
+        start (int): The first byte of the range.
+        end (int): The last byte of the range.
+        headers (dict): The headers for the HTTP call.
+        validator (str): The validator of the version of the file
+            the range must be from.
+
+    Throws:
+        _ChangedError: Is thrown if the file has changed since the
+            download was started.
+        _RetryableError: Is thrown if the transfer fails after all
+            of the retries.
+    """
+    position = start
+
+    for attempt in range(RETRIES + 1):
+        request_headers = dict(headers)
+        request_headers["Range"] = "bytes={}-{}".format(position, end)
+        # The server sends the whole file instead of the range if
+        # the file has changed.
+        request_headers["If-Range"] = validator
+
+        try:
+            with get_session().get(
+                url=url,
+                headers=request_headers,
+                stream=True,
+                timeout=TIMEOUT
+            ) as response:
+                if response.status_code == 200 or (
+                    response.status_code == 206
+                    and _resolve_validator(response=response)
+                    not in (None, validator)
+                ):
+                    raise _ChangedError(
+                        "{} changed while it was downloaded".format(url)
+                    )
+
+                if response.status_code == 206 and _resolve_range_start(
+                    response.headers.get("Content-Range")
+                ) != position:
+                    raise _RetryableError(
+                        "The server didn't send the range from byte "
+                        "{}".format(position)
+                    )
+
+                if response.status_code != 206:
+                    raise _RetryableError(
+                        "The server responded {} to a range request".format(
+                            response.status_code
+                        )
+                    )
+
+                chunk_size = MIN_CHUNK_SIZE
+
+                while position <= end:
+                    begin = time.monotonic()
+                    chunk = response.raw.read(
+                        min(chunk_size, end - position + 1)
+                    )
+
+                    if not chunk:
+                        raise _RetryableError(
+                            "The connection was closed at byte {}".format(
+                                position
+                            )
+                        )
+
+                    os.pwrite(fd, chunk, position)
+                    position += len(chunk)
+                    chunk_size = _adapt_chunk_size(
+                        chunk_size=chunk_size,
+                        elapsed=time.monotonic() - begin,
+                        full=len(chunk) == chunk_size
+                    )
+
+            return
+        except (
+            _RetryableError,
+            requests.ConnectionError,
+            requests.Timeout,
+            urllib3.exceptions.HTTPError
+        ) as e:
+            if attempt == RETRIES:
+                raise _RetryableError(str(e))
+            logging.debug(
+                "Downloading the bytes %d-%d of %s failed (%s), retrying",
+                position,
+                end,
+                url,
+                e
+            )
+            time.sleep(RETRY_DELAY * 2 ** attempt)
+
+
+def _transfer_segmented(
+    url: str,
+    part_file: str,
+    size: int,
+    segments: int,
+    headers: dict,
+    validator: str
+) -> None:
+    """Transfers a file in parallel ranges into the given partial
+    file. The partial file is allocated to its full size first and
+    each range is written straight to its offset so the ranges
+    don't need to be joined afterwards.
+
+    Args:
+        url (str): The url where the file is streamed from.
+        part_file (str): The partial file the file is written to.
+        size (int): The size of the file in bytes.
+        segments (int): The number of the ranges.
+        headers (dict): The headers for the HTTP call.
+        validator (str): The validator of the version of the file
+            that is downloaded.
+
+    Throws:
+        _ChangedError: Is thrown if the file changes while it is
+            downloaded.
+        _RetryableError: Is thrown if a range can't be
+            transferred.
+    """
+    segment_size = -(-size // segments)
+    bounds = [
+        (start, min(start + segment_size, size) - 1)
+        for start in range(0, size, segment_size)
+    ]
+
+    logging.debug(
+        "Downloading %s in %d ranges of %d bytes",
+        url,
+        len(bounds),
+        segment_size
+    )
+
+    fd = os.open(part_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+
+    try:
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                os.ftruncate(fd, size)
+        else:
+            os.ftruncate(fd, size)
+
+        with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+            futures = [
+                executor.submit(
+                    _transfer_segment,
+                    url,
+                    fd,
+                    start,
+                    end,
+                    headers,
+                    validator
+                ) for start, end in bounds
+            ]
+
+            for future in futures:
+                future.result()
+    except BaseException:
+        # The partial file is full sized so it can't be continued.
+        os.close(fd)
+        os.remove(part_file)
+        raise
+    else:
+        os.close(fd)
+
+
+def _transfer(
+    url: str,
+    part_file: str,
+    headers: dict = None,
+    segments: int = None,
+    segment_threshold: int = None
+) -> None:
+    """Transfers a file once into the given partial file. If the
+    partial file already contains data, only the rest of the file
+    is requested, and it is appended to the partial file only if
+    the file hasn't changed since the partial file was started and
+    the server sends the requested range. Otherwise the file is
+    transferred from the start.
+
+    Args:
+        url (str): The url where the file is streamed from.
+        part_file (str): The partial file the file is written to.
+        headers (dict): The possible headers for the HTTP call.
+        segments (int): The number of the parallel ranges a large
+            file is downloaded in.
+        segment_threshold (int): The size in bytes from which on
+            the file is downloaded in ranges.
+
+    Throws:
+        _RetryableError: Is thrown if the transfer fails in a way
+            that is worth retrying.
+    """
+    offset = os.path.getsize(part_file) if os.path.exists(part_file) else 0
+    validator = _read_validator(part_file=part_file)
+    request_headers = dict(headers) if headers else {}
+
+    # The ranges refer to the encoded body so the body mustn't be
+    # encoded for the transfer to be resumable.
+    request_headers["Accept-Encoding"] = "identity"
+
+    # The partial file can't be continued if it isn't known which
+    # version of the file it is a part of.
+    if offset and not validator:
+        logging.debug("Discarding the partial file %s", part_file)
+        _remove_partial_file(part_file=part_file)
+        offset = 0
+
+    if offset:
+        request_headers["Range"] = "bytes={}-".format(offset)
+        # The server sends the whole file instead of the range if
+        # the file has changed.
+        request_headers["If-Range"] = validator
+
+    try:
+        with get_session().get(
+            url=url,
+            headers=request_headers,
+            stream=True,
+            timeout=TIMEOUT
+        ) as response:
+            if response.status_code == 416:
+                # The partial file can't be continued so the file
+                # is transferred from the start on the next try.
+                _remove_partial_file(part_file=part_file)
+                raise _RetryableError("The range wasn't satisfiable")
+
+            if response.status_code in RETRY_STATUS_CODES:
+                raise _RetryableError(
+                    "The server responded {}".format(response.status_code)
+                )
+
+            response.raise_for_status()
+
+            if not offset and _can_segment(
+                response=response,
+                segments=segments,
+                segment_threshold=SEGMENT_THRESHOLD
+                if segment_threshold is None else segment_threshold
+            ):
+                size = int(response.headers["Content-Length"])
+                # The ranges are requested from the final location
+                # so that the redirects aren't followed again.
+                segment_url = response.url
+                segment_validator = _resolve_validator(response=response)
+                response.close()
+                _remove_partial_file(part_file=part_file)
+
+                try:
+                    _transfer_segmented(
+                        url=segment_url,
+                        part_file=part_file,
+                        size=size,
+                        segments=segments,
+                        headers=request_headers,
+                        validator=segment_validator
+                    )
+                except _ChangedError as e:
+                    # The ranges that were already written are of
+                    # the old version of the file so the file is
+                    # transferred again in one piece.
+                    logging.debug("%s, downloading it in one piece", e)
+                    _transfer(url=url, part_file=part_file, headers=headers)
+
+                return
+
+            if offset and response.status_code == 206:
+                start = _resolve_range_start(
+                    response.headers.get("Content-Range")
+                )
+
+                if start != offset:
+                    _remove_partial_file(part_file=part_file)
+                    raise _RetryableError(
+                        "The server sent the range from byte {} instead of "
+                        "{}".format(start, offset)
+                    )
+
+                logging.debug("Resuming %s from byte %d", url, offset)
+                mode = "ab"
+            else:
+                if offset:
+                    logging.debug(
+                        "%s has changed, downloading it from the start",
+                        url
+                    )
+                mode = "wb"
+                _store_validator(part_file=part_file, response=response)
+
+            with open(part_file, mode) as destination_file:
+                written = _write_response(
+                    response=response,
+                    file=destination_file
+                )
+
+            expected = response.headers.get("Content-Length")
 
-from . import shell
+            if expected is not None and written < int(expected):
+                raise _RetryableError(
+                    "The connection was closed after {} of {} bytes".format(
+                        written,
+                        expected
+                    )
+                )
+    except (
+        requests.ConnectionError,
+        requests.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+        # Reading the raw response raises the errors of urllib3.
+        urllib3.exceptions.HTTPError
+    ) as e:
+        raise _RetryableError(str(e))
+
+
+def _download(
+    url: str,
+    destination: str,
+    headers: dict = None,
+    segments: int = None,
+    segment_threshold: int = None
+) -> None:
+    """Downloads a file to the local machine by Hypertext
+    Transport Protocol.
+
+    The file is first written into a partial file next to the
+    destination, and a failed transfer is retried by continuing
+    the partial file. The partial file is also continued by the
+    later invocations if the transfer doesn't finish. Large files
+    are downloaded in parallel ranges if the server accepts them.
+
+    Args:
+        url (str): The url where the file is streamed from.
+        destination (str): The local path where the file is
+            streamed.
+        headers (dict): The possible headers for the HTTP call.
+        segments (int): The number of the parallel ranges a large
+            file is downloaded in.
+        segment_threshold (int): The size in bytes from which on
+            the file is downloaded in ranges.
+    """
+    part_file = "{}{}".format(destination, PART_FILE_SUFFIX)
+
+    with trace.span("download", category="http", url=url):
+        for attempt in range(RETRIES + 1):
+            try:
+                _transfer(
+                    url=url,
+                    part_file=part_file,
+                    headers=headers,
+                    segments=segments,
+                    segment_threshold=segment_threshold
+                )
+                break
+            except _RetryableError as e:
+                if attempt == RETRIES:
+                    logging.critical("Couldn't download %s: %s", url, e)
+                    sys.exit(1)
+                delay = RETRY_DELAY * 2 ** attempt
+                logging.warning(
+                    "Downloading %s failed (%s), retrying in %.1f seconds",
+                    url,
+                    e,
+                    delay
+                )
+                time.sleep(delay)
+
+    os.replace(part_file, destination)
+    _remove_partial_file(part_file=part_file)
+
+
+def exists(url: str, headers: dict = None) -> bool:
+    """Checks whether the server has the given file by Hypertext
+    Transport Protocol without transferring it.
+
+    Args:
+        url (str): The url of the file.
+        headers (dict): The possible headers for the HTTP call.
+
+    Returns:
+        A 'bool' that tells whether the file exists.
+
+    Throws:
+        RequestException: Is thrown if the request fails.
+    """
+    response = get_session().head(url=url, headers=headers, timeout=TIMEOUT)
+
+    if response.status_code == 404:
+        return False
+
+    response.raise_for_status()
+
+    return True
+
+
+def read(url: str, headers: dict = None) -> bytes:
+    """Reads a small file by Hypertext Transport Protocol into
+    the memory.
+
+    Args:
+        url (str): The url of the file.
+        headers (dict): The possible headers for the HTTP call.
+
+    Returns:
+        The 'bytes' of the file, or None if the file doesn't
+        exist.
+
+    Throws:
+        RequestException: Is thrown if the request fails.
+    """
+    response = get_session().get(url=url, headers=headers, timeout=TIMEOUT)
+
+    if response.status_code == 404:
+        return None
+
+    response.raise_for_status()
+
+    return response.content
+
+
+def fetch(url: str, destination: str, headers: dict = None) -> bool:
+    """Downloads a file by Hypertext Transport Protocol once
+    without retrying it. The caller is responsible for verifying
+    and moving the file.
+
+    Args:
+        url (str): The url where the file is streamed from.
+        destination (str): The local path where the file is
+            streamed.
+        headers (dict): The possible headers for the HTTP call.
+
+    Returns:
+        A 'bool' that tells whether the file existed.
+
+    Throws:
+        RequestException: Is thrown if the request fails.
+    """
+    with get_session().get(
+        url=url,
+        headers=headers,
+        stream=True,
+        timeout=TIMEOUT
+    ) as response:
+        if response.status_code == 404:
+            return False
+
+        response.raise_for_status()
+
+        with open(destination, "wb") as destination_file:
+            _write_response(response=response, file=destination_file)
+
+    return True
+
+
+def upload(url: str, source, headers: dict = None) -> None:
+    """Uploads a file by Hypertext Transport Protocol with a PUT
+    request.
+
+    Args:
+        url (str): The url where the file is uploaded to.
+        source (str | bytes): The local path of the uploaded file
+            or the uploaded bytes.
+        headers (dict): The possible headers for the HTTP call.
+
+    Throws:
+        RequestException: Is thrown if the request fails.
+    """
+    if isinstance(source, bytes):
+        response = get_session().put(
+            url=url,
+            data=source,
+            headers=headers,
+            timeout=TIMEOUT
+        )
+    else:
+        with open(source, "rb") as source_file:
+            response = get_session().put(
+                url=url,
+                data=source_file,
+                headers=headers,
+                timeout=TIMEOUT
+            )
+
+    response.raise_for_status()
 
 
 def stream(
     url: str,
     destination: str,
     headers: dict = None,
+    cache_dir: str = None,
+    remote_cache: "RemoteCache" = None,
+    sha256: str = None,
+    segments: int = SEGMENTS,
+    segment_threshold: int = SEGMENT_THRESHOLD,
     dry_run: bool = None,
     echo: bool = None
 ) -> None:
@@ -26,13 +820,26 @@ def stream(
         destination (str): The local path where the file is
             streamed.
         headers (dict): The possible headers for the HTTP call.
+        cache_dir (str): The root directory of the persistent
+            caches that is checked before the file is downloaded,
+            or None if the download cache isn't used.
+        remote_cache (RemoteCache): The optional remote cache
+            that is checked before the file is downloaded and
+            that the downloaded file is uploaded to. It is used
+            only together with the download cache.
+        sha256 (str): The optional SHA-256 checksum that the
+            downloaded file is verified against.
+        segments (int): The number of the parallel ranges a large
+            file is downloaded in if the server accepts ranges.
+        segment_threshold (int): The size in bytes from which on
+            the file is downloaded in ranges.
         dry_run (bool): Whether or not dry run is enabled.
         echo (bool): Whether or not the command must be printed.
+
+    Throws:
+        ValueError: Is thrown if the downloaded file doesn't
+            match the given checksum.
     """
-    if headers:
-        response = requests.get(url=url, headers=headers, stream=True)
-    else:
-        response = requests.get(url=url, stream=True)
     if not os.path.isdir(destination):
         shell.makedirs(
             os.path.dirname(destination),
@@ -47,7 +854,379 @@ def stream(
         )
     if dry_run:
         return
-    with open(destination, "wb") as destination_file:
-        for chunk in response.iter_content(chunk_size=1024):
-            if chunk:
-                destination_file.write(chunk)
+    if cache_dir:
+        DownloadCache(root=cache_dir, remote=remote_cache).fetch(
+            url=url,
+            destination=destination,
+            download=lambda path: _download(
+                url=url,
+                destination=path,
+                headers=headers,
+                segments=segments,
+                segment_threshold=segment_threshold
+            ),
+            sha256=sha256
+        )
+        return
+    _download(
+        url=url,
+        destination=destination,
+        headers=headers,
+        segments=segments,
+        segment_threshold=segment_threshold
+    )
+    if sha256 and file_sha256(destination) != sha256.lower():
+        raise ValueError(
+            "The file downloaded from {} doesn't match the checksum "
+            "{}".format(url, sha256)
+        )
+
+
+class _StreamingError(Exception):
+    """An exception that is raised when a file can't be extracted
+    while it is downloaded and the on-disk path must be used.
+    """
+    pass
+
+
+class _TeeReader:
+    """A class for creating file-like objects that read the body
+    of a response and, optionally, write the read bytes to a
+    file.
+
+    Attributes:
+        response (Response): The streamed response.
+        file (file): The optional file object the read bytes are
+            written to.
+        read_bytes (int): The number of the bytes read.
+    """
+
+    def __init__(self, response: requests.Response, file=None) -> None:
+        """Initializes the reader object.
+
+        Args:
+            response (Response): The streamed response.
+            file (file): The optional file object the read bytes
+                are written to.
+        """
+        self.response = response
+        self.file = file
+        self.read_bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads bytes from the response.
+
+        Args:
+            size (int): The maximum number of the bytes to read.
+
+        Returns:
+            The read 'bytes'.
+        """
+        chunk = self.response.raw.read(
+            None if size is None or size < 0 else size,
+            decode_content=True
+        )
+
+        if chunk:
+            self.read_bytes += len(chunk)
+            if self.file:
+                self.file.write(chunk)
+
+        return chunk
+
+
+def _stream_extract(
+    url: str,
+    destination: str,
+    headers: dict = None,
+    members: List[str] = None,
+    tee_file: str = None,
+    segments: int = None,
+    segment_threshold: int = None
+) -> None:
+    """Extracts a tar archive while it is downloaded.
+
+    Args:
+        url (str): The url where the archive is streamed from.
+        destination (str): The directory the archive is extracted
+            to.
+        headers (dict): The possible headers for the HTTP call.
+        members (list): The optional filters of the members that
+            are extracted.
+        tee_file (str): The optional file the archive is also
+            written to.
+        segments (int): The number of the parallel ranges a large
+            file is downloaded in.
+        segment_threshold (int): The size in bytes from which on
+            the file is downloaded in ranges.
+
+    Throws:
+        _StreamingError: Is thrown if the archive can't be
+            extracted while it is downloaded.
+    """
+    request_headers = dict(headers) if headers else {}
+    request_headers["Accept-Encoding"] = "identity"
+
+    with trace.span("download and extract", category="http", url=url):
+        try:
+            with get_session().get(
+                url=url,
+                headers=request_headers,
+                stream=True,
+                timeout=TIMEOUT
+            ) as response:
+                if response.status_code != 200:
+                    raise _StreamingError(
+                        "The server responded {}".format(response.status_code)
+                    )
+
+                # The large files are faster to download in parallel
+                # ranges than to extract over one connection.
+                if _can_segment(
+                    response=response,
+                    segments=segments,
+                    segment_threshold=SEGMENT_THRESHOLD
+                    if segment_threshold is None else segment_threshold
+                ):
+                    raise _StreamingError("The file is downloaded in ranges")
+
+                out = None
+
+                if tee_file:
+                    out = open(tee_file, "wb")
+                    _store_validator(part_file=tee_file, response=response)
+
+                try:
+                    reader = _TeeReader(response=response, file=out)
+
+                    shell.extract_stream(
+                        fileobj=reader,
+                        dest=destination,
+                        members=members
+                    )
+
+                    # The end of the archive may contain padding that
+                    # tar doesn't read.
+                    while reader.read(MAX_CHUNK_SIZE):
+                        pass
+                finally:
+                    if out:
+                        out.close()
+
+                expected = response.headers.get("Content-Length")
+
+                if expected is not None and reader.read_bytes < int(expected):
+                    raise _StreamingError(
+                        "The connection was closed after {} of {} bytes".format(
+                            reader.read_bytes,
+                            expected
+                        )
+                    )
+        except (
+            tarfile.TarError,
+            requests.RequestException,
+            urllib3.exceptions.HTTPError,
+            OSError
+        ) as e:
+            raise _StreamingError(str(e))
+
+
+def extract(
+    url: str,
+    destination: str,
+    action: ArchiveAction = ArchiveAction.extract,
+    members: List[str] = None,
+    headers: dict = None,
+    cache_dir: str = None,
+    remote_cache: "RemoteCache" = None,
+    sha256: str = None,
+    segments: int = SEGMENTS,
+    segment_threshold: int = SEGMENT_THRESHOLD,
+    dry_run: bool = None,
+    echo: bool = None
+) -> None:
+    """Downloads an archive by Hypertext Transport Protocol and
+    extracts it.
+
+    A tar archive is extracted while it is downloaded so that the
+    archive isn't read back from the disk. The archive is written
+    to a partial file at the same time, in the download cache if
+    it is used, so that the download can be continued. The archive is downloaded to the disk first
+    if it is a zip archive, if it must be verified against a
+    checksum, if it is large enough to be downloaded in ranges,
+    or if the streaming fails, in which case the download is
+    continued from where the streaming stopped.
+
+    Args:
+        url (str): The url where the archive is streamed from.
+        destination (str): The directory the archive is extracted
+            to.
+        action (ArchiveAction): The action that extracts the
+            archive.
+        members (list): The optional filters of the members that
+            are extracted. Each filter is a path or a glob
+            pattern, and a filter that matches a directory
+            selects everything under the directory.
+        headers (dict): The possible headers for the HTTP call.
+        cache_dir (str): The root directory of the persistent
+            caches that is checked before the archive is
+            downloaded, or None if the download cache isn't used.
+        remote_cache (RemoteCache): The optional remote cache
+            that is checked before the archive is downloaded and
+            that the downloaded archive is uploaded to. It is
+            used only together with the download cache.
+        sha256 (str): The optional SHA-256 checksum that the
+            downloaded archive is verified against.
+        segments (int): The number of the parallel ranges a large
+            archive is downloaded in if the server accepts ranges.
+        segment_threshold (int): The size in bytes from which on
+            the archive is downloaded in ranges.
+        dry_run (bool): Whether or not dry run is enabled.
+        echo (bool): Whether or not the command must be printed.
+
+    Throws:
+        ValueError: Is thrown if the downloaded archive doesn't
+            match the given checksum.
+    """
+    archive_file = "{}.archive".format(os.path.normpath(destination))
+
+    if action is not ArchiveAction.extract or sha256:
+        stream(
+            url=url,
+            destination=archive_file,
+            headers=headers,
+            cache_dir=cache_dir,
+            remote_cache=remote_cache,
+            sha256=sha256,
+            segments=segments,
+            segment_threshold=segment_threshold,
+            dry_run=dry_run,
+            echo=echo
+        )
+        shell.makedirs(destination, dry_run=dry_run, echo=echo)
+        shell.tar(
+            path=archive_file,
+            action=action,
+            dest=destination,
+            members=members,
+            dry_run=dry_run,
+            echo=echo
+        )
+        shell.rm(archive_file, dry_run=dry_run, echo=echo)
+        return
+
+    shell.makedirs(destination, dry_run=dry_run, echo=echo)
+
+    if echo:
+        # The streaming is printed as the equivalent pipeline.
+        shell.call(["curl", "-L", "-o", "-", url], dry_run=True, echo=True)
+        shell.tar(
+            path="-",
+            action=action,
+            dest=destination,
+            members=members,
+            dry_run=True,
+            echo=True
+        )
+
+    if dry_run:
+        return
+
+    def _fall_back(e: _StreamingError) -> None:
+        logging.debug("Couldn't extract %s while downloading it: %s", url, e)
+        shutil.rmtree(destination, ignore_errors=True)
+        os.makedirs(destination, exist_ok=True)
+
+    if not cache_dir:
+        part_file = "{}{}".format(archive_file, PART_FILE_SUFFIX)
+
+        # An interrupted download is continued instead of starting
+        # the streaming from the beginning.
+        if not os.path.exists(part_file) or not os.path.getsize(part_file):
+            try:
+                _stream_extract(
+                    url=url,
+                    destination=destination,
+                    headers=headers,
+                    members=members,
+                    tee_file=part_file,
+                    segments=segments,
+                    segment_threshold=segment_threshold
+                )
+                _remove_partial_file(part_file=part_file)
+                return
+            except _StreamingError as e:
+                _fall_back(e)
+
+        # The partial file that was written while streaming is
+        # continued.
+        _download(
+            url=url,
+            destination=archive_file,
+            headers=headers,
+            segments=segments,
+            segment_threshold=segment_threshold
+        )
+        shell.tar(
+            path=archive_file,
+            action=action,
+            dest=destination,
+            members=members
+        )
+        os.remove(archive_file)
+        return
+
+    cache = DownloadCache(root=cache_dir, remote=remote_cache)
+
+    with cache.lock(url=url) as entry:
+        if os.path.exists(entry):
+            logging.info("Found %s in the download cache", url)
+        elif not cache.fetch_remote(url=url, entry=entry):
+            logging.info(
+                "Didn't find %s in the download cache, downloading it",
+                url
+            )
+
+            download_file = cache.resolve_download_file(entry=entry)
+            part_file = "{}{}".format(download_file, PART_FILE_SUFFIX)
+
+            # An interrupted download is continued instead of
+            # starting the streaming from the beginning.
+            if not os.path.exists(part_file) \
+                    or not os.path.getsize(part_file):
+                try:
+                    _stream_extract(
+                        url=url,
+                        destination=destination,
+                        headers=headers,
+                        members=members,
+                        tee_file=part_file,
+                        segments=segments,
+                        segment_threshold=segment_threshold
+                    )
+                    os.replace(part_file, entry)
+                    _remove_partial_file(part_file=part_file)
+                    cache.store_remote(url=url, entry=entry)
+                    return
+                except _StreamingError as e:
+                    _fall_back(e)
+
+            # The partial file that was written while streaming is
+            # continued.
+            _download(
+                url=url,
+                destination=download_file,
+                headers=headers,
+                segments=segments,
+                segment_threshold=segment_threshold
+            )
+            os.replace(download_file, entry)
+            cache.store_remote(url=url, entry=entry)
+
+        # The cached archive is extracted straight from the cache.
+        shell.tar(
+            path=entry,
+            action=action,
+            dest=destination,
+            members=members
+        )
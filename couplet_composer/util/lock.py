@@ -0,0 +1,47 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains a helper for locking files between
+processes.
+"""
+
+import os
+
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+__all__ = ["file_lock"]
+
+
+@contextmanager
+def file_lock(path: str) -> None:
+    """Holds an exclusive lock on the given lock file while the
+    context is active. The lock is respected by the other
+    invocations of the build script, and the lock file is created
+    if it doesn't exist.
+
+    Args:
+        path (str): The lock file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "a+b") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,392 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the helpers for analysing the build log
+that Ninja writes to the build directory.
+
+Ninja appends an entry to '.ninja_log' for every output that it
+builds. The entry contains the start and the end time of the
+command in milliseconds since the start of the build, so a build
+ends where the times go back to the beginning. The log is parsed
+incrementally: the position in the log and the entries of the
+latest build are stored next to the log so that the next report
+only reads the entries that were added since.
+"""
+
+import json
+import logging
+import os
+
+from collections import namedtuple
+
+from typing import Dict, List
+
+
+__all__ = ["Edge", "NinjaLog", "analyze", "format_report"]
+
+
+# The file extensions of the outputs that are compiled and the
+# outputs that are linked. The executables have no extension on
+# the Unix-like systems.
+COMPILE_EXTENSIONS = [".o", ".obj"]
+LINK_EXTENSIONS = ["", ".a", ".dll", ".dylib", ".exe", ".lib", ".so"]
+
+Edge = namedtuple("Edge", ["start", "end", "outputs", "command_hash"])
+
+
+class NinjaLog:
+    """A class for creating objects that represent the build log
+    of Ninja in a build directory.
+
+    Attributes:
+        path (str): The path to the build log.
+        state_path (str): The path to the file that contains the
+            state of the incremental parsing.
+
+    Private attributes:
+        _offset (int): The position in the log up to which it has
+            been parsed.
+        _inode (int): The inode of the parsed log that tells
+            whether the log has been replaced.
+        _last_end (int): The end time of the previous entry.
+        _entries (list): The entries of the latest build.
+    """
+
+    FILE_NAME = ".ninja_log"
+    STATE_FILE_NAME = ".ninja_log.report"
+    STATE_VERSION = 1
+
+    def __init__(self, build_dir: str) -> None:
+        """Initializes the build log object.
+
+        Args:
+            build_dir (str): The build directory of Ninja.
+        """
+        self.path = os.path.join(build_dir, self.FILE_NAME)
+        self.state_path = os.path.join(build_dir, self.STATE_FILE_NAME)
+        self._reset(inode=None)
+        self._load_state()
+
+    def _reset(self, inode: int) -> None:
+        """Starts parsing the log from the beginning.
+
+        Args:
+            inode (int): The inode of the log.
+        """
+        self._offset = 0
+        self._inode = inode
+        self._last_end = -1
+        self._entries = []
+
+    def _load_state(self) -> None:
+        """Reads the state of the incremental parsing if it has
+        been stored.
+        """
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+
+            if state["version"] != self.STATE_VERSION:
+                return
+
+            self._offset = state["offset"]
+            self._inode = state["inode"]
+            self._last_end = state["last_end"]
+            self._entries = [tuple(entry) for entry in state["entries"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset(inode=None)
+
+    def _store_state(self) -> None:
+        """Writes the state of the incremental parsing next to the
+        log. The file is replaced atomically.
+        """
+        tmp_file = "{}.tmp".format(self.state_path)
+
+        with open(tmp_file, "w") as f:
+            json.dump(
+                {
+                    "version": self.STATE_VERSION,
+                    "offset": self._offset,
+                    "inode": self._inode,
+                    "last_end": self._last_end,
+                    "entries": self._entries
+                },
+                f,
+                separators=(",", ":")
+            )
+
+        os.replace(tmp_file, self.state_path)
+
+    def update(self) -> List[Edge]:
+        """Reads the entries that have been added to the log since
+        it was last read and gives the edges of the latest build.
+
+        Returns:
+            A 'list' of the 'Edge' objects of the latest build.
+        """
+        if not os.path.isfile(self.path):
+            return []
+
+        stat = os.stat(self.path)
+
+        # Ninja rewrites the log when it is compacted, and then
+        # the log is parsed again from the beginning.
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            logging.debug("Parsing %s from the beginning", self.path)
+            self._reset(inode=stat.st_ino)
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        # Only the complete lines are parsed as Ninja may be
+        # writing the log.
+        end = data.rfind(b"\n") + 1
+
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            self._parse_line(line=line)
+
+        self._offset += end
+        self._store_state()
+
+        return self.edges()
+
+    def start_build(self) -> None:
+        """Marks the start of a new build so that only the
+        entries that are added after this are taken as the entries
+        of the latest build. This should be called right before
+        Ninja is run.
+        """
+        self.update()
+        self._entries = []
+        self._last_end = -1
+        self._store_state()
+
+    def _parse_line(self, line: str) -> None:
+        """Parses a line of the log.
+
+        Args:
+            line (str): The line.
+        """
+        if not line or line.startswith("#"):
+            return
+
+        fields = line.split("\t")
+
+        if len(fields) < 5:
+            return
+
+        try:
+            start = int(fields[0])
+            end = int(fields[1])
+        except ValueError:
+            return
+
+        # The times restart from zero when a new build starts.
+        if end < self._last_end:
+            self._entries = []
+
+        self._last_end = end
+        self._entries.append((start, end, fields[3], fields[4]))
+
+    def edges(self) -> List[Edge]:
+        """Gives the edges of the latest build. The outputs of
+        the same command are combined into one edge, and only the
+        latest entry of an output is used.
+
+        Returns:
+            A 'list' of the 'Edge' objects sorted by their start
+            times.
+        """
+        latest = {}
+
+        for start, end, output, command_hash in self._entries:
+            latest[output] = (start, end, command_hash)
+
+        grouped = {}
+
+        for output, key in latest.items():
+            grouped.setdefault(key, []).append(output)
+
+        return sorted(
+            (
+                Edge(
+                    start=start,
+                    end=end,
+                    outputs=sorted(outputs),
+                    command_hash=command_hash
+                ) for (start, end, command_hash), outputs in grouped.items()
+            ),
+            key=lambda edge: (edge.start, edge.end)
+        )
+
+
+def _classify(edge: Edge) -> str:
+    """Gives the kind of the given edge.
+
+    Args:
+        edge (Edge): The edge.
+
+    Returns:
+        An 'str' that is 'compile', 'link', or 'other'.
+    """
+    extensions = [os.path.splitext(output)[1] for output in edge.outputs]
+
+    if any(extension in COMPILE_EXTENSIONS for extension in extensions):
+        return "compile"
+
+    if any(extension in LINK_EXTENSIONS for extension in extensions):
+        return "link"
+
+    return "other"
+
+
+def _resolve_critical_path(edges: List[Edge]) -> List[Edge]:
+    """Gives the critical path of the build. The log doesn't
+    contain the dependencies of the edges, so every edge is
+    assumed to have waited for the edge that finished last before
+    it started, which is the edge that Ninja was waiting for if
+    there were free jobs.
+
+    Args:
+        edges (list): The edges of the build.
+
+    Returns:
+        A 'list' of the 'Edge' objects on the critical path in
+        the order they were run.
+    """
+    if not edges:
+        return []
+
+    by_end = sorted(edges, key=lambda edge: edge.end)
+    path = [by_end[-1]]
+
+    while True:
+        current = path[-1]
+        previous = None
+
+        for edge in by_end:
+            if edge.end > current.start:
+                break
+            previous = edge
+
+        if not previous:
+            break
+
+        path.append(previous)
+
+    return list(reversed(path))
+
+
+def _describe(edge: Edge) -> Dict:
+    """Gives the description of the given edge for the report.
+
+    Args:
+        edge (Edge): The edge.
+
+    Returns:
+        A 'dict' that describes the edge.
+    """
+    return {
+        "output": edge.outputs[0],
+        "outputs": len(edge.outputs),
+        "start": edge.start / 1000,
+        "duration": (edge.end - edge.start) / 1000
+    }
+
+
+def analyze(edges: List[Edge], jobs: int, top: int = 10) -> Dict:
+    """Analyses the given edges of a build.
+
+    Args:
+        edges (list): The edges of the build.
+        jobs (int): The number of the parallel jobs that the build
+            was run with.
+        top (int): The number of the slowest edges of each kind
+            that are included.
+
+    Returns:
+        A 'dict' that contains the report that can be written as
+        JSON.
+    """
+    if not edges:
+        return {"edges": 0}
+
+    wall_time = max(edge.end for edge in edges) \
+        - min(edge.start for edge in edges)
+    total_time = sum(edge.end - edge.start for edge in edges)
+    parallelism = total_time / wall_time if wall_time else 0.0
+
+    def _slowest(kind: str) -> List[Dict]:
+        return [
+            _describe(edge) for edge in sorted(
+                (edge for edge in edges if _classify(edge) == kind),
+                key=lambda edge: edge.end - edge.start,
+                reverse=True
+            )[:top]
+        ]
+
+    critical_path = _resolve_critical_path(edges=edges)
+
+    return {
+        "edges": len(edges),
+        "wall_time": wall_time / 1000,
+        "total_time": total_time / 1000,
+        "parallelism": parallelism,
+        "jobs": jobs,
+        "utilization": parallelism / jobs if jobs else None,
+        "slowest_compiles": _slowest("compile"),
+        "slowest_links": _slowest("link"),
+        "critical_path": {
+            "duration": sum(edge.end - edge.start for edge in critical_path)
+            / 1000,
+            "edges": [_describe(edge) for edge in critical_path]
+        }
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Formats the given report for printing.
+
+    Args:
+        report (dict): The report given by 'analyze'.
+
+    Returns:
+        An 'str' that contains the report.
+    """
+    if not report["edges"]:
+        return "Ninja didn't build anything"
+
+    lines = [
+        "Ninja built {} edges in {:.1f} s using {:.1f} s of CPU time".format(
+            report["edges"],
+            report["wall_time"],
+            report["total_time"]
+        ),
+        "The average parallelism was {:.2f} of {} jobs ({:.0%})".format(
+            report["parallelism"],
+            report["jobs"],
+            report["utilization"] or 0
+        )
+    ]
+
+    for title, key in [
+        ("The slowest compiles", "slowest_compiles"),
+        ("The slowest links", "slowest_links")
+    ]:
+        if report[key]:
+            lines.append("{}:".format(title))
+            lines.extend(
+                "  {:>8.2f} s  {}".format(edge["duration"], edge["output"])
+                for edge in report[key]
+            )
+
+    lines.append("The critical path of {:.1f} s:".format(
+        report["critical_path"]["duration"]
+    ))
+    lines.extend(
+        "  {:>8.2f} s  {}".format(edge["duration"], edge["output"])
+        for edge in report["critical_path"]["edges"]
+    )
+
+    return "\n".join(lines)
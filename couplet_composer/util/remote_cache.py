@@ -0,0 +1,287 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the client of the remote cache that is
+shared between the machines that run the build script.
+
+The remote cache is a plain HTTP server that stores the blobs by
+the SHA-256 checksum of their contents under '/cas/' and maps
+the other keys, like the fingerprints of the builds and the
+checksums of the download URLs, to the checksums of the blobs
+under '/ac/'. The files are read with GET, checked with HEAD, and
+written with PUT.
+"""
+
+import logging
+import os
+import re
+import threading
+
+from argparse import Namespace
+
+import requests
+import urllib3
+
+from . import http
+
+from .download_cache import file_sha256
+
+
+__all__ = ["RemoteCache"]
+
+
+# The pattern of the keys and the checksums in the cache.
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# The remote cache objects that are shared by the downloads of
+# the run, mapped to their URLs and access.
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+class RemoteCache:
+    """A class for creating objects that represent the remote
+    cache.
+
+    The remote cache is an addition to the local caches: the
+    files that aren't in the local caches are looked up from the
+    remote cache, and the files that are added to the local
+    caches are uploaded to it unless the client is read-only.
+    The failures of the remote cache are logged and treated as
+    misses so that the build never fails because of it.
+
+    Attributes:
+        url (str): The root URL of the remote cache.
+        read_only (bool): Whether or not the files are only read
+            from the remote cache.
+
+    Private attributes:
+        _available (bool): Whether or not the remote cache could
+            be reached during the current run.
+        _lock (Lock): The lock of the availability.
+    """
+
+    BLOB_NAMESPACE = "cas"
+    ACTION_NAMESPACE = "ac"
+
+    def __init__(self, url: str, read_only: bool = False) -> None:
+        """Initializes the remote cache object.
+
+        Args:
+            url (str): The root URL of the remote cache.
+            read_only (bool): Whether or not the files are only
+                read from the remote cache.
+        """
+        self.url = url.rstrip("/")
+        self.read_only = read_only
+        self._available = True
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> "RemoteCache":
+        """Gives the remote cache object for the given command
+        line arguments. The same object is given for the same
+        options so that the remote cache isn't tried again during
+        the run if it can't be reached.
+
+        Args:
+            args (Namespace): A namespace that contains the
+                parsed command line arguments.
+
+        Returns:
+            The 'RemoteCache', or None if the remote cache isn't
+            used.
+        """
+        url = getattr(args, "remote_cache", None)
+
+        if not url:
+            return None
+
+        read_only = bool(getattr(args, "remote_cache_read_only", False))
+
+        with _instances_lock:
+            if (url, read_only) not in _instances:
+                _instances[(url, read_only)] = cls(
+                    url=url,
+                    read_only=read_only
+                )
+
+            return _instances[(url, read_only)]
+
+    def resolve_url(self, namespace: str, key: str) -> str:
+        """Gives the URL of the given key in the remote cache.
+
+        Args:
+            namespace (str): The namespace of the key.
+            key (str): The key.
+
+        Returns:
+            An 'str' that is the URL.
+        """
+        return "{}/{}/{}".format(self.url, namespace, key.lower())
+
+    def _fail(self, operation: str, key: str, error: Exception) -> None:
+        """Logs a failed request to the remote cache and stops
+        using the remote cache if it can't be reached.
+
+        Args:
+            operation (str): The description of the request.
+            key (str): The key of the request.
+            error (Exception): The error of the request.
+        """
+        logging.warning(
+            "Couldn't %s %s in the remote cache %s: %s",
+            operation,
+            key,
+            self.url,
+            error
+        )
+
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            with self._lock:
+                self._available = False
+            logging.warning(
+                "Not using the remote cache %s for the rest of the run",
+                self.url
+            )
+
+    def fetch_blob(self, digest: str, destination: str) -> bool:
+        """Downloads the blob with the given checksum to the
+        destination. The blob is verified against the checksum
+        before it is moved to the destination.
+
+        Args:
+            digest (str): The SHA-256 checksum of the blob.
+            destination (str): The path where the blob is placed.
+
+        Returns:
+            A 'bool' that tells whether the blob was found in the
+            remote cache.
+        """
+        if not self._available:
+            return False
+
+        download_file = "{}.remote".format(destination)
+
+        try:
+            if not http.fetch(
+                url=self.resolve_url(self.BLOB_NAMESPACE, digest),
+                destination=download_file
+            ):
+                logging.debug("Didn't find %s in the remote cache", digest)
+                return False
+
+            if file_sha256(download_file) != digest.lower():
+                logging.warning(
+                    "The blob %s in the remote cache %s doesn't match its "
+                    "checksum, ignoring it",
+                    digest,
+                    self.url
+                )
+                return False
+
+            os.replace(download_file, destination)
+        except (
+            requests.RequestException,
+            urllib3.exceptions.HTTPError,
+            OSError
+        ) as e:
+            self._fail(operation="fetch", key=digest, error=e)
+            return False
+        finally:
+            if os.path.exists(download_file):
+                os.remove(download_file)
+
+        logging.info("Found %s in the remote cache", digest)
+
+        return True
+
+    def fetch(self, key: str, destination: str) -> bool:
+        """Downloads the blob that the given key is mapped to to
+        the destination.
+
+        Args:
+            key (str): The key of the blob.
+            destination (str): The path where the blob is placed.
+
+        Returns:
+            A 'bool' that tells whether the key was found in the
+            remote cache.
+        """
+        if not self._available:
+            return False
+
+        try:
+            content = http.read(
+                url=self.resolve_url(self.ACTION_NAMESPACE, key)
+            )
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            self._fail(operation="look up", key=key, error=e)
+            return False
+
+        if content is None:
+            logging.debug("Didn't find %s in the remote cache", key)
+            return False
+
+        digest = content.decode("ascii", errors="replace").strip()
+
+        if not KEY_PATTERN.match(digest):
+            logging.warning(
+                "The key %s in the remote cache %s isn't mapped to a "
+                "checksum, ignoring it",
+                key,
+                self.url
+            )
+            return False
+
+        return self.fetch_blob(digest=digest, destination=destination)
+
+    def store_blob(self, path: str, digest: str = None) -> str:
+        """Uploads the given file to the remote cache as a blob
+        unless the remote cache already has it.
+
+        Args:
+            path (str): The file to upload.
+            digest (str): The optional SHA-256 checksum of the
+                file that is computed if it isn't given.
+
+        Returns:
+            An 'str' that is the checksum of the blob, or None if
+            the blob wasn't uploaded.
+        """
+        if self.read_only or not self._available:
+            return None
+
+        digest = (digest or file_sha256(path)).lower()
+        url = self.resolve_url(self.BLOB_NAMESPACE, digest)
+
+        try:
+            if not http.exists(url=url):
+                http.upload(url=url, source=path)
+                logging.info("Uploaded %s to the remote cache", digest)
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            self._fail(operation="store", key=digest, error=e)
+            return None
+
+        return digest
+
+    def store(self, key: str, path: str) -> None:
+        """Uploads the given file to the remote cache and maps
+        the given key to it.
+
+        Args:
+            key (str): The key of the blob.
+            path (str): The file to upload.
+        """
+        digest = self.store_blob(path=path)
+
+        if not digest:
+            return
+
+        try:
+            http.upload(
+                url=self.resolve_url(self.ACTION_NAMESPACE, key),
+                source=digest.encode("ascii")
+            )
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            self._fail(operation="store", key=key, error=e)
@@ -0,0 +1,161 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains a helper for running tasks that depend
+on each other concurrently.
+"""
+
+import logging
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from typing import Any, Callable, Dict, List
+
+
+__all__ = ["check_graph", "resolve_dependents", "run"]
+
+
+def check_graph(requirements: Dict[str, List[str]]) -> None:
+    """Checks that the given task graph can be scheduled.
+
+    Args:
+        requirements (dict): The keys of the tasks mapped to the
+            lists of the keys of the tasks that must be finished
+            before the task is started.
+
+    Throws:
+        ValueError: Is thrown if a task requires an unknown task
+            or if the requirements contain a cycle.
+    """
+    for key, required in requirements.items():
+        for requirement in required:
+            if requirement not in requirements:
+                raise ValueError(
+                    "The task '{}' requires an unknown task '{}'".format(
+                        key,
+                        requirement
+                    )
+                )
+
+    # The states are 1 for a task that is being visited and 2
+    # for a task that is visited.
+    states = {}
+
+    def _visit(key: str, path: List[str]) -> None:
+        if states.get(key) == 2:
+            return
+        if states.get(key) == 1:
+            raise ValueError("The tasks form a cycle: {}".format(
+                " -> ".join(path[path.index(key):] + [key])
+            ))
+        states[key] = 1
+        for requirement in requirements[key]:
+            _visit(requirement, path + [key])
+        states[key] = 2
+
+    for key in requirements:
+        _visit(key, [])
+
+
+def resolve_dependents(
+    requirements: Dict[str, List[str]],
+    keys: List[str]
+) -> List[str]:
+    """Gives the tasks that require any of the given tasks either
+    directly or through other tasks.
+
+    Args:
+        requirements (dict): The keys of the tasks mapped to the
+            lists of the keys of the tasks that must be finished
+            before the task is started.
+        keys (list): The keys of the required tasks.
+
+    Returns:
+        A 'list' of the keys of the dependent tasks in the order
+        of 'requirements', without the given tasks.
+    """
+    found = set(keys)
+    changed = True
+
+    while changed:
+        changed = False
+
+        for key, required in requirements.items():
+            if key not in found and any(r in found for r in required):
+                found.add(key)
+                changed = True
+
+    return [key for key in requirements if key in found and key not in keys]
+
+
+def run(
+    tasks: Dict[str, Callable[[], Any]],
+    requirements: Dict[str, List[str]],
+    jobs: int,
+    on_finish: Callable[[str, Any], None] = None
+) -> None:
+    """Runs the given tasks in a bounded thread pool so that a
+    task is started only after the tasks it requires are
+    finished.
+
+    The callback 'on_finish' is always called in the calling
+    thread so it needs no synchronization of its own.
+
+    Args:
+        tasks (dict): The keys of the tasks mapped to the
+            functions that run them.
+        requirements (dict): The keys of the tasks mapped to the
+            lists of the keys of the tasks that must be finished
+            before the task is started. The requirements that
+            aren't in 'tasks' are considered finished.
+        jobs (int): The maximum number of the tasks run at the
+            same time.
+        on_finish (Callable): An optional function that is
+            called with the key and the return value of each
+            task when it finishes.
+
+    Throws:
+        ValueError: Is thrown if the requirements of the tasks
+            contain a cycle.
+    """
+    pending = {
+        key: [r for r in requirements.get(key, []) if r in tasks]
+        for key in tasks
+    }
+
+    check_graph(pending)
+
+    finished = set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while pending or running:
+            ready = [
+                key for key, required in pending.items()
+                if all(r in finished for r in required)
+            ]
+
+            for key in ready:
+                logging.debug("Starting the task '%s'", key)
+                del pending[key]
+                running[executor.submit(tasks[key])] = key
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                key = running.pop(future)
+
+                try:
+                    result = future.result()
+                except BaseException:
+                    # No new tasks are started after a failure, but
+                    # the running ones are let to finish.
+                    for other in running:
+                        other.cancel()
+                    raise
+
+                logging.debug("Finished the task '%s'", key)
+                finished.add(key)
+
+                if on_finish:
+                    on_finish(key, result)
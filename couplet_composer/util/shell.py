@@ -4,21 +4,40 @@
 """A module that contains several shell helpers.
 """
 
+import fnmatch
 import logging
 import os
 import pipes
 import shutil
 import subprocess
 import sys
-import tarfile
-import zipfile
+import threading
 
 from contextlib import contextmanager
 
-from typing import Any
+from typing import Any, BinaryIO, List
 
 from ..support.archive_action import ArchiveAction
 
+from . import file_copy, trace
+
+
+# The directory stacks of 'pushd' are kept per thread so that the
+# commands can be run in several threads at the same time.
+_directories = threading.local()
+
+
+def _current_directory() -> str:
+    """Gives the directory that is on top of the directory stack
+    of the current thread.
+
+    Returns:
+        An 'str' that is the directory, or None if the directory
+        stack is empty.
+    """
+    stack = getattr(_directories, "stack", None)
+    return stack[-1] if stack else None
+
 
 def _quote(arg: str) -> str:
     """Gives a shell-escaped version of the argument.
@@ -97,7 +116,17 @@ def call(
         _env = dict(os.environ)
         _env.update(env)
     try:
-        subprocess.check_call(command, env=_env, stderr=stderr)
+        with trace.span(
+            os.path.basename(str(command[0])),
+            category="shell",
+            command=quote_command(command)
+        ):
+            subprocess.check_call(
+                command,
+                env=_env,
+                stderr=stderr,
+                cwd=_current_directory()
+            )
     except subprocess.CalledProcessError as e:
         logging.critical(
             "Command ended with status %d, stopping",
@@ -147,7 +176,17 @@ def capture(
         _env = dict(os.environ)
         _env.update(env)
     try:
-        out = subprocess.check_output(command, env=_env, stderr=stderr)
+        with trace.span(
+            os.path.basename(str(command[0])),
+            category="shell",
+            command=quote_command(command)
+        ):
+            out = subprocess.check_output(
+                command,
+                env=_env,
+                stderr=stderr,
+                cwd=_current_directory()
+            )
         # Coerce to 'str' hack. Not py3 'byte', not py2
         # 'unicode'.
         return str(out.decode())
@@ -175,23 +214,34 @@ def capture(
 @contextmanager
 def pushd(path: str, dry_run: bool = None, echo: bool = None) -> None:
     """Pushes the directory to the top of the directory stack
-    and, thus, changes the current working directory.
+    and, thus, changes the working directory of the commands run
+    with 'call' and 'capture'.
+
+    The directory stack is kept per thread and the working
+    directory of the process isn't changed so that the commands
+    can be run in several threads at the same time.
 
     Args:
         path (str): The directory to switch to.
         dry_run (bool): Whether or not dry run is enabled.
         echo (bool): Whether or not the command must be printed.
     """
-    old_dir = os.getcwd()
     if dry_run or echo:
         _echo_command(dry_run, ["pushd", path])
     if not dry_run:
-        os.chdir(path)
-    yield
-    if dry_run or echo:
-        _echo_command(dry_run, ["popd"])
-    if not dry_run:
-        os.chdir(old_dir)
+        if not hasattr(_directories, "stack"):
+            _directories.stack = []
+        _directories.stack.append(os.path.normpath(os.path.join(
+            _current_directory() or os.getcwd(),
+            path
+        )))
+    try:
+        yield
+    finally:
+        if dry_run or echo:
+            _echo_command(dry_run, ["popd"])
+        if not dry_run:
+            _directories.stack.pop()
 
 
 def makedirs(path: str, dry_run: bool = None, echo: bool = None) -> None:
@@ -206,21 +256,24 @@ def makedirs(path: str, dry_run: bool = None, echo: bool = None) -> None:
         _echo_command(dry_run, ["mkdir", "-p", path])
     if dry_run:
         return
-    if not os.path.isdir(path):
-        os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
 
 
 def copytree(
     src: str,
     dest: str,
+    jobs: int = None,
     dry_run: bool = None,
     echo: bool = None
 ) -> None:
-    """Copies a directory and its contents.
+    """Copies a directory and its contents. The source is merged
+    into the destination if the destination already exists.
 
     Args:
         src (str): The directory to copy.
         dest (str): The directory where the source is copied to.
+        jobs (int): The optional number of the threads that copy
+            the files.
         dry_run (bool): Whether or not dry run is enabled.
         echo (bool): Whether or not the command must be printed.
     """
@@ -228,17 +281,7 @@ def copytree(
         _echo_command(dry_run, ["cp", "-r", src, dest])
     if dry_run:
         return
-    # A workaround
-    if os.path.isdir(dest):
-        for item in os.listdir(src):
-            s = os.path.join(src, item)
-            d = os.path.join(dest, item)
-            if os.path.isdir(s):
-                shutil.copytree(s, d)  # , symlinks, ignore)
-            else:
-                shutil.copy2(s, d)
-    else:
-        shutil.copytree(src, dest)
+    file_copy.copy_tree(src, dest, jobs=jobs)
 
 
 def copy(
@@ -264,7 +307,62 @@ def copy(
         link = os.readlink(src)
         os.symlink(link, dest)
     else:
-        shutil.copy2(src, dest)
+        file_copy.copy_file(src, dest)
+
+
+def link(
+    src: str,
+    dest: str,
+    symbolic: bool = False,
+    dry_run: bool = None,
+    echo: bool = None
+) -> None:
+    """Links a file or a directory. The files that can't be
+    linked are copied instead.
+
+    Args:
+        src (str): The file or directory to link.
+        dest (str): The path of the link.
+        symbolic (bool): Whether or not symbolic links are
+            created instead of hard links.
+        dry_run (bool): Whether or not dry run is enabled.
+        echo (bool): Whether or not the command must be printed.
+    """
+    if dry_run or echo:
+        command = ["ln"]
+        if symbolic:
+            command.append("-s")
+        elif os.path.isdir(src):
+            command = ["cp", "-rl"]
+        command.extend([src, dest])
+        _echo_command(dry_run, command)
+    if dry_run:
+        return
+    if os.path.isdir(src):
+        file_copy.link_tree(src, dest, symbolic=symbolic)
+    else:
+        file_copy.link_file(src, dest, symbolic=symbolic)
+
+
+def move(
+    src: str,
+    dest: str,
+    dry_run: bool = None,
+    echo: bool = None
+) -> None:
+    """Moves a file or a directory.
+
+    Args:
+        src (str): The file or directory to move.
+        dest (str): The path where the source is moved to.
+        dry_run (bool): Whether or not dry run is enabled.
+        echo (bool): Whether or not the command must be printed.
+    """
+    if dry_run or echo:
+        _echo_command(dry_run, ["mv", src, dest])
+    if dry_run:
+        return
+    shutil.move(src, dest)
 
 
 def rmtree(path: str, dry_run: bool = None, echo: bool = None) -> None:
@@ -324,10 +422,69 @@ def which(command: str, dry_run: bool = None, echo: bool = None) -> str:
     return shutil.which(command)
 
 
+def _is_member_selected(name: str, members: List[str]) -> bool:
+    """Checks whether the given archive member matches the given
+    member filters.
+
+    Args:
+        name (str): The name of the member in the archive.
+        members (list): The filters. Each filter is a path or a
+            glob pattern, and a filter that matches a directory
+            selects everything under the directory. The patterns
+            are matched one path component at a time so that a
+            wildcard doesn't match across directories.
+
+    Returns:
+        A 'bool' telling whether the member is selected.
+    """
+    name_parts = name.rstrip("/").split("/")
+
+    for pattern in members:
+        pattern_parts = pattern.rstrip("/").split("/")
+
+        if len(name_parts) >= len(pattern_parts) and all(
+            fnmatch.fnmatchcase(part, pattern_part)
+            for part, pattern_part in zip(name_parts, pattern_parts)
+        ):
+            return True
+
+    return False
+
+
+def extract_stream(
+    fileobj: BinaryIO,
+    dest: str,
+    members: List[str] = None
+) -> None:
+    """Extracts a tar archive from the given file object while it
+    is read. The archive is read only once from the start to the
+    end, so the file object doesn't need to be seekable.
+
+    Args:
+        fileobj (file): The file object of the archive.
+        dest (str): The destination the archive is extracted to.
+        members (list): The optional filters of the members that
+            are extracted. Each filter is a path or a glob
+            pattern, and a filter that matches a directory
+            selects everything under the directory.
+    """
+    import tarfile
+
+    with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+        if not members:
+            archive.extractall(dest)
+            return
+
+        for member in archive:
+            if _is_member_selected(name=member.name, members=members):
+                archive.extract(member, dest)
+
+
 def tar(
     path: str,
     action: ArchiveAction = ArchiveAction.extract,
     dest: str = None,
+    members: List[str] = None,
     dry_run: bool = None,
     echo: bool = None
 ) -> None:
@@ -340,36 +497,65 @@ def tar(
         dest (str): Either the destination that the archive is
             extracted to or the archive file that is created from
             the path.
+        members (list): The optional filters of the members that
+            are extracted. Each filter is a path or a glob
+            pattern, and a filter that matches a directory
+            selects everything under the directory.
         dry_run (bool): Whether or not dry run is enabled.
         echo (bool): Whether or not the command must be printed.
     """
     if dry_run or echo:
         if action is ArchiveAction.extract:
+            command = ["tar", "-xf", path]
             if dest:
-                _echo_command(dry_run, ["tar", "-xf", path, "-C", dest])
-            else:
-                _echo_command(dry_run, ["tar", "-xf", path])
+                command.extend(["-C", dest])
+            if members:
+                command.extend(
+                    ["--wildcards", "--no-wildcards-match-slash"] + members
+                )
+            _echo_command(dry_run, command)
         elif action is ArchiveAction.unzip:
+            command = ["unzip"]
             if dest:
-                _echo_command(dry_run, ["unzip", "-d", dest, path])
-            else:
-                _echo_command(dry_run, ["unzip", path])
+                command.extend(["-d", dest])
+            command.append(path)
+            if members:
+                command.extend(members)
+            _echo_command(dry_run, command)
 
     if dry_run:
         return
 
-    if action is ArchiveAction.extract:
-        with tarfile.open(path) as archive:
-            if dest:
-                archive.extractall(dest)
-            else:
-                archive.extractall()
-    elif action is ArchiveAction.unzip:
-        with zipfile.ZipFile(path, "r") as archive:
-            if dest:
-                archive.extractall(dest)
+    # The archive modules are imported only when an archive is
+    # extracted as they're slow to import.
+    import tarfile
+    import zipfile
+
+    with trace.span("extract", category="archive", path=path):
+        if action is ArchiveAction.extract:
+            if members:
+                with open(path, "rb") as archive_file:
+                    extract_stream(
+                        fileobj=archive_file,
+                        dest=dest if dest else os.getcwd(),
+                        members=members
+                    )
             else:
-                archive.extractall()
+                with tarfile.open(path) as archive:
+                    if dest:
+                        archive.extractall(dest)
+                    else:
+                        archive.extractall()
+        elif action is ArchiveAction.unzip:
+            with zipfile.ZipFile(path, "r") as archive:
+                selected = [
+                    name for name in archive.namelist()
+                    if _is_member_selected(name=name, members=members)
+                ] if members else None
+                if dest:
+                    archive.extractall(dest, members=selected)
+                else:
+                    archive.extractall(members=selected)
 
 def chmod(path: str, mode: int, dry_run: bool = None, echo: bool = None) -> None:
     """Changes the mode of a file.
@@ -0,0 +1,462 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the class for the database that holds the
+state of the build directory between the runs of the build script.
+
+The state is stored in an SQLite database in the WAL mode so that
+the invocations that run at the same time, for example for
+different build variants, can read it while one of them writes to
+it. Every change is made in a transaction so that the state is
+never left partially written.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+
+from typing import Any, Dict, List
+
+
+__all__ = ["StateDatabase"]
+
+
+class StateDatabase:
+    """A class for creating objects that represent the database
+    that holds the state of the build directory. The state
+    contains the installed dependencies and their files, the
+    resolved tools, the fingerprints of the inputs of the builds,
+    and the timings of the steps of the runs.
+
+    Attributes:
+        path (str): The path to the database.
+
+    Private attributes:
+        _connection (Connection): The connection to the database.
+        _lock (RLock): The lock that makes sure that only one
+            thread at a time uses the connection.
+    """
+
+    VERSION = 1
+
+    # The number of the latest runs whose timings are kept.
+    MAX_RUNS = 100
+
+    # The time in seconds to wait for another invocation to
+    # finish writing to the database.
+    TIMEOUT = 60
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS installs ("
+        "target TEXT NOT NULL, variant TEXT NOT NULL, key TEXT NOT NULL, "
+        "version TEXT, fingerprint TEXT, inputs TEXT, "
+        "PRIMARY KEY (target, variant, key))",
+        "CREATE TABLE IF NOT EXISTS manifests ("
+        "target TEXT NOT NULL, variant TEXT NOT NULL, key TEXT NOT NULL, "
+        "path TEXT NOT NULL, "
+        "PRIMARY KEY (target, variant, key, path))",
+        "CREATE TABLE IF NOT EXISTS tools ("
+        "target TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, "
+        "PRIMARY KEY (target, key))",
+        "CREATE TABLE IF NOT EXISTS fingerprints ("
+        "scope TEXT NOT NULL, key TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+        "inputs TEXT, "
+        "PRIMARY KEY (scope, key))",
+        "CREATE TABLE IF NOT EXISTS runs ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, mode TEXT NOT NULL, "
+        "target TEXT, variant TEXT, started REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS timings ("
+        "run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE, "
+        "step TEXT NOT NULL, category TEXT, start REAL NOT NULL, "
+        "duration REAL NOT NULL)"
+    ]
+
+    TABLES = [
+        "installs",
+        "manifests",
+        "tools",
+        "fingerprints",
+        "runs",
+        "timings"
+    ]
+
+    def __init__(self, path: str) -> None:
+        """Initializes the state database object. The database is
+        created if it doesn't exist.
+
+        Args:
+            path (str): The path to the database.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # The transactions are controlled explicitly so that the
+        # writes lock the database as they start.
+        self._connection = sqlite3.connect(
+            path,
+            timeout=self.TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+
+        with self.transaction() as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+            if version != self.VERSION:
+                if version:
+                    logging.debug(
+                        "Recreating %s of version %d",
+                        self.path,
+                        version
+                    )
+
+                    for table in reversed(self.TABLES):
+                        connection.execute(
+                            "DROP TABLE IF EXISTS {}".format(table)
+                        )
+
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+
+                connection.execute(
+                    "PRAGMA user_version={:d}".format(self.VERSION)
+                )
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def transaction(self) -> sqlite3.Connection:
+        """Runs the statements that are executed while the context
+        is active in a transaction that is committed when the
+        context exits and rolled back if it raises.
+
+        Returns:
+            A 'Connection' that the statements are executed with.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            else:
+                self._connection.execute("COMMIT")
+
+    def _query(self, statement: str, parameters: tuple = ()) -> list:
+        """Runs the given query.
+
+        Args:
+            statement (str): The query.
+            parameters (tuple): The parameters of the query.
+
+        Returns:
+            A 'list' of the rows that the query gives.
+        """
+        with self._lock:
+            return self._connection.execute(statement, parameters).fetchall()
+
+    def installs(self, target: str, variant: str) -> Dict[str, dict]:
+        """Gives the installed dependencies of the given build
+        variant.
+
+        Args:
+            target (str): The target.
+            variant (str): The build variant.
+
+        Returns:
+            A 'dict' that contains the keys of the dependencies
+            mapped to the installed versions as 'version', the
+            fingerprints of their inputs as 'fingerprint', and the
+            inputs as 'inputs'.
+        """
+        return {
+            key: {
+                "version": version,
+                "fingerprint": fingerprint,
+                "inputs": json.loads(inputs) if inputs else None
+            } for key, version, fingerprint, inputs in self._query(
+                "SELECT key, version, fingerprint, inputs FROM installs "
+                "WHERE target = ? AND variant = ?",
+                (target, variant)
+            )
+        }
+
+    def store_install(
+        self,
+        target: str,
+        variant: str,
+        key: str,
+        version: str,
+        fingerprint: str = None,
+        inputs: dict = None,
+        files: List[str] = None
+    ) -> None:
+        """Stores the given installed dependency and replaces the
+        manifest of its files.
+
+        Args:
+            target (str): The target.
+            variant (str): The build variant.
+            key (str): The key of the dependency.
+            version (str): The installed version.
+            fingerprint (str): The fingerprint of the inputs of
+                the installation.
+            inputs (dict): The inputs of the installation.
+            files (list): The installed files relative to the
+                dependencies directory of the build variant.
+        """
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO installs "
+                "(target, variant, key, version, fingerprint, inputs) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    target,
+                    variant,
+                    key,
+                    version,
+                    fingerprint,
+                    json.dumps(inputs, sort_keys=True)
+                    if inputs is not None else None
+                )
+            )
+            connection.execute(
+                "DELETE FROM manifests "
+                "WHERE target = ? AND variant = ? AND key = ?",
+                (target, variant, key)
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO manifests (target, variant, key, path) "
+                "VALUES (?, ?, ?, ?)",
+                [(target, variant, key, path) for path in files or []]
+            )
+
+    def manifest(self, target: str, variant: str, key: str) -> List[str]:
+        """Gives the installed files of the given dependency.
+
+        Args:
+            target (str): The target.
+            variant (str): The build variant.
+            key (str): The key of the dependency.
+
+        Returns:
+            A 'list' of the files relative to the dependencies
+            directory of the build variant.
+        """
+        return [
+            row[0] for row in self._query(
+                "SELECT path FROM manifests "
+                "WHERE target = ? AND variant = ? AND key = ? ORDER BY path",
+                (target, variant, key)
+            )
+        ]
+
+    def clear_installs(self, target: str, variant: str) -> None:
+        """Removes the installed dependencies of the given build
+        variant.
+
+        Args:
+            target (str): The target.
+            variant (str): The build variant.
+        """
+        with self.transaction() as connection:
+            for table in ["installs", "manifests"]:
+                connection.execute(
+                    "DELETE FROM {} WHERE target = ? AND variant = ?".format(
+                        table
+                    ),
+                    (target, variant)
+                )
+
+    def tools(self, target: str) -> Dict[str, dict]:
+        """Gives the resolved tools of the given target.
+
+        Args:
+            target (str): The target.
+
+        Returns:
+            A 'dict' that contains the keys of the tools mapped to
+            their entries.
+        """
+        return {
+            key: json.loads(data) for key, data in self._query(
+                "SELECT key, data FROM tools WHERE target = ?",
+                (target,)
+            )
+        }
+
+    def store_tool(self, target: str, key: str, entry: dict) -> None:
+        """Stores the given resolved tool.
+
+        Args:
+            target (str): The target.
+            key (str): The key of the tool.
+            entry (dict): The entry of the tool.
+        """
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO tools (target, key, data) "
+                "VALUES (?, ?, ?)",
+                (target, key, json.dumps(entry, sort_keys=True))
+            )
+
+    def clear_tools(self, target: str) -> None:
+        """Removes the resolved tools of the given target.
+
+        Args:
+            target (str): The target.
+        """
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM tools WHERE target = ?", (target,))
+
+    def fingerprint(self, scope: str, key: str) -> dict:
+        """Gives the stored fingerprint of the given inputs.
+
+        Args:
+            scope (str): The kind of the inputs, for example
+                'configuration'.
+            key (str): The key of the inputs in the scope.
+
+        Returns:
+            A 'dict' that contains the fingerprint as
+            'fingerprint' and the inputs as 'inputs', or 'None' if
+            the fingerprint isn't stored.
+        """
+        rows = self._query(
+            "SELECT fingerprint, inputs FROM fingerprints "
+            "WHERE scope = ? AND key = ?",
+            (scope, key)
+        )
+
+        if not rows:
+            return None
+
+        return {
+            "fingerprint": rows[0][0],
+            "inputs": json.loads(rows[0][1]) if rows[0][1] else None
+        }
+
+    def store_fingerprint(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        inputs: Any = None
+    ) -> None:
+        """Stores the fingerprint of the given inputs.
+
+        Args:
+            scope (str): The kind of the inputs.
+            key (str): The key of the inputs in the scope.
+            fingerprint (str): The fingerprint.
+            inputs (Any): The inputs that must be serializable to
+                JSON.
+        """
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO fingerprints "
+                "(scope, key, fingerprint, inputs) VALUES (?, ?, ?, ?)",
+                (
+                    scope,
+                    key,
+                    fingerprint,
+                    json.dumps(inputs, sort_keys=True)
+                    if inputs is not None else None
+                )
+            )
+
+    def remove_fingerprint(self, scope: str, key: str) -> None:
+        """Removes the stored fingerprint of the given inputs.
+
+        Args:
+            scope (str): The kind of the inputs.
+            key (str): The key of the inputs in the scope.
+        """
+        with self.transaction() as connection:
+            connection.execute(
+                "DELETE FROM fingerprints WHERE scope = ? AND key = ?",
+                (scope, key)
+            )
+
+    def start_run(self, mode: str, target: str, variant: str) -> int:
+        """Records the start of a run of the build script. Only the
+        timings of the latest runs are kept.
+
+        Args:
+            mode (str): The run mode.
+            target (str): The target of the run.
+            variant (str): The build variant of the run.
+
+        Returns:
+            An 'int' that is the identifier of the run.
+        """
+        with self.transaction() as connection:
+            run = connection.execute(
+                "INSERT INTO runs (mode, target, variant, started) "
+                "VALUES (?, ?, ?, ?)",
+                (mode, target, variant, time.time())
+            ).lastrowid
+            connection.execute(
+                "DELETE FROM runs WHERE id <= ?",
+                (run - self.MAX_RUNS,)
+            )
+
+        return run
+
+    def store_timing(
+        self,
+        run: int,
+        step: str,
+        category: str,
+        start: float,
+        duration: float
+    ) -> None:
+        """Stores the timing of a step of the given run.
+
+        Args:
+            run (int): The identifier of the run.
+            step (str): The name of the step.
+            category (str): The category of the step.
+            start (float): The start time of the step in seconds
+                since the epoch.
+            duration (float): The duration of the step in seconds.
+        """
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT INTO timings (run, step, category, start, duration) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run, step, category, start, duration)
+            )
+
+    def timings(self, run: int) -> List[tuple]:
+        """Gives the timings of the steps of the given run.
+
+        Args:
+            run (int): The identifier of the run.
+
+        Returns:
+            A 'list' of the tuples of the name, the category, and
+            the duration of each step in the order they started.
+        """
+        return [
+            tuple(row) for row in self._query(
+                "SELECT step, category, duration FROM timings "
+                "WHERE run = ? ORDER BY start",
+                (run,)
+            )
+        ]
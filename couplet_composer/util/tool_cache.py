@@ -0,0 +1,143 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the class for the persistent cache of the
+resolved tools.
+
+A tool is stored with the path to its executable, the version that
+was detected from it, and the modification time, the inode, and the
+size of the executable. An entry is used only if the executable
+still has the same stats and the query that found it, for example
+the search path, is the same so that the next runs don't need to
+search the tools or run them to detect their versions. The entries
+are stored in the state database of the build directory.
+"""
+
+import logging
+import os
+import threading
+
+from typing import Any
+
+from .state import StateDatabase
+
+
+__all__ = ["ToolCache"]
+
+
+class ToolCache:
+    """A class for creating objects that represent the persistent
+    cache of the resolved tools in the build directory.
+
+    Attributes:
+        state (StateDatabase): The state database that the
+            entries are stored in.
+        target (str): The target that the tools are resolved for.
+
+    Private attributes:
+        _entries (dict): The entries of the cache.
+        _lock (Lock): The lock that makes sure that only one
+            thread at a time modifies the entries.
+    """
+
+    def __init__(self, state: StateDatabase, target: str) -> None:
+        """Initializes the tool cache object.
+
+        Args:
+            state (StateDatabase): The state database that the
+                entries are stored in.
+            target (str): The target that the tools are resolved
+                for.
+        """
+        self.state = state
+        self.target = target
+        self._entries = self.state.tools(target=self.target)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat(path: str) -> dict:
+        """Gives the stats of the given executable that tell
+        whether it has changed.
+
+        Args:
+            path (str): The path to the executable.
+
+        Returns:
+            A 'dict' that contains the stats, or 'None' if the
+            executable doesn't exist.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return {
+            "mtime": stat.st_mtime_ns,
+            "inode": stat.st_ino,
+            "size": stat.st_size
+        }
+
+    def lookup(self, key: str, query: Any) -> dict:
+        """Gives the stored entry of the given tool if it is still
+        valid.
+
+        Args:
+            key (str): The key of the tool.
+            query (Any): The data that was used to find the tool.
+                It must be serializable to JSON.
+
+        Returns:
+            A 'dict' that contains the path to the executable of
+            the tool as 'path' and the detected version as
+            'version', or 'None' if the entry isn't valid.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if not entry or entry.get("query") != query:
+            return None
+
+        if self._stat(entry["path"]) != entry["stat"]:
+            logging.debug("The cached path of %s has changed", key)
+            return None
+
+        logging.debug("Using the cached path %s of %s", entry["path"], key)
+
+        return entry
+
+    def store(
+        self,
+        key: str,
+        query: Any,
+        path: str,
+        version: str = None
+    ) -> None:
+        """Stores the given tool to the cache and to the state
+        database.
+
+        Args:
+            key (str): The key of the tool.
+            query (Any): The data that was used to find the tool.
+                It must be serializable to JSON.
+            path (str): The path to the executable of the tool.
+            version (str): The detected version of the tool.
+        """
+        stat = self._stat(path)
+
+        if not stat:
+            return
+
+        entry = {
+            "query": query,
+            "path": path,
+            "version": version,
+            "stat": stat
+        }
+
+        with self._lock:
+            if self._entries.get(key) == entry:
+                return
+
+            self._entries[key] = entry
+
+        self.state.store_tool(target=self.target, key=key, entry=entry)
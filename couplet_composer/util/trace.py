@@ -0,0 +1,153 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that contains the helpers for recording the phases of
+a run of the build script as a trace.
+
+The trace is written in the trace event format of Chrome so that
+it can be opened in 'chrome://tracing' or in Perfetto. Every
+phase is recorded as a complete event, and the phases that are
+run inside other phases in the same thread are shown nested.
+Nothing is recorded unless the trace is started.
+"""
+
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+
+
+__all__ = ["finish", "is_enabled", "span", "start"]
+
+
+_events = None
+_file = None
+_lock = threading.Lock()
+_threads = set()
+_origin = 0
+
+
+def start(path: str) -> None:
+    """Starts recording the trace that is written to the given
+    file when the trace is finished.
+
+    Args:
+        path (str): The file the trace is written to.
+    """
+    global _events, _file, _origin
+
+    with _lock:
+        _events = []
+        _file = path
+        _threads.clear()
+        _origin = time.perf_counter()
+
+        _events.append({
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": {"name": "couplet-composer"}
+        })
+
+
+def is_enabled() -> bool:
+    """Tells whether the trace is recorded.
+
+    Returns:
+        A 'bool' that tells whether the trace is recorded.
+    """
+    return _events is not None
+
+
+def _timestamp() -> float:
+    """Gives the current time in the trace.
+
+    Returns:
+        A 'float' that is the number of the microseconds since
+        the trace was started.
+    """
+    return (time.perf_counter() - _origin) * 1000000
+
+
+@contextmanager
+def span(name: str, category: str = "phase", **kwargs) -> None:
+    """Records the time the context is active as a phase of the
+    run.
+
+    Args:
+        name (str): The name of the phase.
+        category (str): The category of the phase.
+        **kwargs: The additional information of the phase that
+            is shown with it.
+    """
+    if _events is None:
+        yield
+        return
+
+    thread = threading.current_thread()
+    start_time = _timestamp()
+
+    try:
+        yield
+    finally:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_time,
+            "dur": _timestamp() - start_time,
+            "pid": os.getpid(),
+            "tid": thread.ident
+        }
+
+        if kwargs:
+            event["args"] = {key: str(value) for key, value in kwargs.items()}
+
+        with _lock:
+            if _events is not None:
+                if thread.ident not in _threads:
+                    _threads.add(thread.ident)
+                    _events.append({
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": os.getpid(),
+                        "tid": thread.ident,
+                        "args": {"name": thread.name}
+                    })
+
+                _events.append(event)
+
+
+def finish() -> None:
+    """Writes the recorded trace to its file and stops recording
+    the trace. The file is replaced atomically so that it is
+    never left partially written.
+    """
+    global _events, _file
+
+    with _lock:
+        if _events is None:
+            return
+
+        events = _events
+        path = _file
+        _events = None
+        _file = None
+
+    directory = os.path.dirname(os.path.abspath(path))
+
+    os.makedirs(directory, exist_ok=True)
+
+    tmp_file = "{}.tmp".format(path)
+
+    with open(tmp_file, "w") as f:
+        json.dump(
+            {"traceEvents": events, "displayTimeUnit": "ms"},
+            f,
+            separators=(",", ":")
+        )
+
+    os.replace(tmp_file, path)
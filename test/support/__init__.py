@@ -0,0 +1,2 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
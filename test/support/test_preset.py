@@ -0,0 +1,128 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the preset helpers."""
+
+import os
+
+import pytest
+
+from couplet_composer.support import preset
+
+from couplet_composer.support.run_mode import RunMode
+
+
+PRESETS = """\
+[common]
+mix-in-preset =
+    base
+    extra
+jobs = 4
+
+[base]
+build-variant = debug
+cmake-option =
+    -DFOO=ON
+    -DBAR=OFF
+
+[extra]
+mix-in-preset = base
+build-variant = release
+
+[configure:common]
+install-mode = symlink
+
+[compose:common]
+test
+
+[cycle]
+mix-in-preset = loop
+
+[loop]
+mix-in-preset = cycle
+"""
+
+
+def test_presets_are_resolved(tmp_path):
+    preset_file = tmp_path / "presets.ini"
+    preset_file.write_text(PRESETS)
+
+    options, options_after_end = preset.get_preset_options(
+        file_names=[str(preset_file)],
+        preset_name="common",
+        run_mode=RunMode.configure
+    )
+
+    assert options == {
+        "build-variant": "release",
+        "cmake-option": ["-DFOO=ON", "-DBAR=OFF"],
+        "jobs": "4",
+        "install-mode": "symlink"
+    }
+    assert options_after_end == {}
+
+    options, _ = preset.get_preset_options(
+        file_names=[str(preset_file)],
+        preset_name="common",
+        run_mode=RunMode.compose
+    )
+
+    assert "install-mode" not in options
+    assert options["test"] is None
+
+    with pytest.raises(ValueError, match="cycle -> loop -> cycle"):
+        preset.get_preset_options(
+            file_names=[str(preset_file)],
+            preset_name="cycle",
+            run_mode=RunMode.compose
+        )
+
+
+def test_presets_are_cached(tmp_path):
+    preset_file = tmp_path / "presets.ini"
+    preset_file.write_text(PRESETS)
+    file_names = [str(preset_file)]
+    cache_dir = str(tmp_path / "cache")
+
+    options, _ = preset.get_preset_options(
+        file_names=file_names,
+        preset_name="common",
+        run_mode=RunMode.configure,
+        cache_dir=cache_dir
+    )
+    cache_file = preset._resolve_cache_file(
+        file_names=file_names,
+        cache_dir=cache_dir
+    )
+    table = preset._load_cached_table(path=cache_file)
+
+    assert table.names == ["common", "base", "extra", "configure:common",
+                           "compose:common", "cycle", "loop"]
+    # Only the requested preset is stored.
+    assert table.presets == {
+        "configure": {
+            "common": {
+                "options": options,
+                "options_after_end": {},
+                "missing_options": []
+            }
+        },
+        "compose": {}
+    }
+
+    # A file with the same contents doesn't invalidate the table.
+    os.utime(str(preset_file), ns=(0, 0))
+
+    table = preset._load_cached_table(path=cache_file)
+
+    assert table.changed
+    assert table.resolve(name="common", run_mode=RunMode.configure) \
+        == table.presets["configure"]["common"]
+
+    preset_file.write_text(PRESETS + "[new]\njobs = 1\n")
+
+    assert preset._load_cached_table(path=cache_file) is None
+    assert "new" in preset.get_all_preset_names(
+        file_names=file_names,
+        cache_dir=cache_dir
+    )
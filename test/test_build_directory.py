@@ -0,0 +1,109 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the build directory."""
+
+from argparse import Namespace
+
+from pathlib import Path
+
+from couplet_composer.support.build_variant import BuildVariant
+
+from couplet_composer.support.cmake_generator import CMakeGenerator
+
+from couplet_composer.build_directory import BuildDirectory
+
+from couplet_composer.target import Target
+
+
+def test_migrate_tools_from_variant_directories(tmp_path):
+    build_dir = BuildDirectory(
+        args=Namespace(dry_run=False, verbose=False),
+        source_root=str(tmp_path),
+        build_variant=BuildVariant.debug,
+        generator=CMakeGenerator.ninja,
+        target=Target(system="linux", machine="x86_64")
+    )
+    bin_dir = tmp_path / "build" / "local" / "bin"
+
+    for variant in ["debug", "release"]:
+        tool_dir = bin_dir / "linux-x86_64-{}".format(variant) / "ninja"
+        tool_dir.mkdir(parents=True)
+        (tool_dir / "ninja").write_text(variant)
+
+    build_dir.migrate_tools()
+
+    assert build_dir.tools == str(bin_dir / "linux-x86_64")
+    assert (bin_dir / "linux-x86_64" / "ninja" / "ninja").exists()
+    assert not (bin_dir / "linux-x86_64-debug").exists()
+    assert not (bin_dir / "linux-x86_64-release").exists()
+
+
+def test_installed_versions_are_moved_to_state(tmp_path):
+    def _create_build_dir(build_variant: BuildVariant) -> BuildDirectory:
+        return BuildDirectory(
+            args=Namespace(dry_run=False, verbose=False),
+            source_root=str(tmp_path),
+            build_variant=build_variant,
+            generator=CMakeGenerator.ninja,
+            target=Target(system="linux", machine="x86_64")
+        )
+
+    build_dir = _create_build_dir(build_variant=BuildVariant.debug)
+    versions_file = Path(build_dir.versions_file)
+    versions_file.parent.mkdir(parents=True)
+    versions_file.write_text('{"glfw": "3.3.2"}')
+
+    assert build_dir.installed_versions == {"glfw": "3.3.2"}
+    assert not versions_file.exists()
+
+    build_dir.store_install(
+        key="sdl",
+        version="2.0.12",
+        files=["include/SDL2/SDL.h", "lib/libSDL2.a"]
+    )
+    build_dir = _create_build_dir(build_variant=BuildVariant.debug)
+
+    assert build_dir.installed_versions == {"glfw": "3.3.2", "sdl": "2.0.12"}
+    assert build_dir.resolve_manifest(key="sdl") == [
+        "include/SDL2/SDL.h",
+        "lib/libSDL2.a"
+    ]
+    assert _create_build_dir(
+        build_variant=BuildVariant.release
+    ).installed_versions == {}
+
+
+def test_clean_state_keeps_other_variants(tmp_path):
+    def _create_build_dir(build_variant: BuildVariant) -> BuildDirectory:
+        return BuildDirectory(
+            args=Namespace(dry_run=False, verbose=False),
+            source_root=str(tmp_path),
+            build_variant=build_variant,
+            generator=CMakeGenerator.ninja,
+            target=Target(system="linux", machine="x86_64")
+        )
+
+    build_dir = _create_build_dir(build_variant=BuildVariant.debug)
+    release_dir = _create_build_dir(build_variant=BuildVariant.release)
+    build_dir.store_install(key="glfw", version="3.3.2")
+    release_dir.store_install(key="glfw", version="3.3.2")
+    build_dir.state.store_tool(
+        target="linux-x86_64",
+        key="ninja",
+        entry={"path": "ninja"}
+    )
+
+    build_dir.clean_state()
+
+    assert _create_build_dir(
+        build_variant=BuildVariant.debug
+    ).installed_versions == {}
+    assert _create_build_dir(
+        build_variant=BuildVariant.release
+    ).installed_versions == {"glfw": "3.3.2"}
+    assert list(build_dir.state.tools(target="linux-x86_64")) == ["ninja"]
+
+    build_dir.clean_state(shared=True)
+
+    assert build_dir.state.tools(target="linux-x86_64") == {}
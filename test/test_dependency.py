@@ -0,0 +1,222 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the dependencies."""
+
+from argparse import Namespace
+
+from pathlib import Path
+
+from couplet_composer.support.build_variant import BuildVariant
+
+from couplet_composer.support.cmake_generator import CMakeGenerator
+
+from couplet_composer.util import fingerprint
+
+from couplet_composer.binary_dependency import BinaryDependency
+
+from couplet_composer.build_directory import BuildDirectory
+
+from couplet_composer.target import Target
+
+
+def _create_dependency(
+    cmake_options: dict,
+    files: str = "lib/libglfw3.a"
+) -> BinaryDependency:
+    return BinaryDependency(
+        key="glfw",
+        name="GLFW",
+        version="3.3.2",
+        commit=None,
+        files=files,
+        platform_files=None,
+        test_only=False,
+        benchmark_only=False,
+        asset_name=None,
+        repository="glfw/glfw",
+        tag_prefix=None,
+        depends_on=None,
+        sha256=None,
+        cmake_options=cmake_options
+    )
+
+
+def test_dependency_is_installed_when_inputs_change(tmp_path):
+    build_dir = BuildDirectory(
+        args=Namespace(dry_run=False, verbose=False),
+        source_root=str(tmp_path),
+        build_variant=BuildVariant.debug,
+        generator=CMakeGenerator.ninja,
+        target=Target(system="linux", machine="x86_64")
+    )
+    runner = Namespace(
+        args=Namespace(explain=False),
+        toolchain=Namespace(tool_cache=None),
+        build_variant=BuildVariant.debug,
+        cmake_generator=CMakeGenerator.ninja
+    )
+    dependency = _create_dependency(cmake_options={"GLFW_BUILD_DOCS": False})
+
+    assert dependency.should_install(runner=runner, build_dir=build_dir)
+
+    library = Path(build_dir.dependencies) / "lib"
+    inputs = dependency.resolve_inputs(runner=runner, build_dir=build_dir)
+    build_dir.store_install(
+        key=dependency.key,
+        version=dependency.version,
+        fingerprint=fingerprint.compute(inputs),
+        inputs=inputs,
+        files=["lib/libglfw3.a"]
+    )
+
+    # The installed library is missing.
+    assert dependency.should_install(runner=runner, build_dir=build_dir)
+
+    library.mkdir(parents=True)
+    (library / "libglfw3.a").write_text("")
+
+    assert not dependency.should_install(runner=runner, build_dir=build_dir)
+
+    dependency = _create_dependency(cmake_options={"GLFW_BUILD_DOCS": True})
+
+    assert dependency.should_install(runner=runner, build_dir=build_dir)
+    assert fingerprint.explain(
+        previous=inputs,
+        current=dependency.resolve_inputs(runner=runner, build_dir=build_dir)
+    ) == [
+        "'definition': 'cmake_options': 'GLFW_BUILD_DOCS' changed from false "
+        "to true"
+    ]
+
+
+def test_artifact_fingerprint_includes_prefix_and_upstream(tmp_path):
+    def _resolve_fingerprint(source_root: str, upstream: str) -> str:
+        build_dir = BuildDirectory(
+            args=Namespace(dry_run=False, verbose=False),
+            source_root=source_root,
+            build_variant=BuildVariant.debug,
+            generator=CMakeGenerator.ninja,
+            target=Target(system="linux", machine="x86_64")
+        )
+        build_dir.store_install(
+            key="glad",
+            version="0.1.34",
+            fingerprint=upstream
+        )
+        runner = Namespace(
+            build_dir=build_dir,
+            target=Target(system="linux", machine="x86_64"),
+            toolchain=Namespace(tool_cache=None),
+            build_variant=BuildVariant.debug,
+            cmake_generator=CMakeGenerator.ninja
+        )
+        dependency = _create_dependency(cmake_options=None)
+        dependency.depends_on = ["glad"]
+
+        return dependency._resolve_fingerprint(runner=runner)
+
+    first = _resolve_fingerprint(source_root=str(tmp_path / "a"), upstream="1")
+
+    assert first == _resolve_fingerprint(
+        source_root=str(tmp_path / "a"),
+        upstream="1"
+    )
+    assert first != _resolve_fingerprint(
+        source_root=str(tmp_path / "a"),
+        upstream="2"
+    )
+    assert first != _resolve_fingerprint(
+        source_root=str(tmp_path / "b"),
+        upstream="1"
+    )
+
+
+def test_dependency_is_installed_when_upstream_is_installed(tmp_path):
+    build_dir = BuildDirectory(
+        args=Namespace(dry_run=False, verbose=False),
+        source_root=str(tmp_path),
+        build_variant=BuildVariant.debug,
+        generator=CMakeGenerator.ninja,
+        target=Target(system="linux", machine="x86_64")
+    )
+    runner = Namespace(
+        args=Namespace(explain=False),
+        toolchain=Namespace(tool_cache=None),
+        build_variant=BuildVariant.debug,
+        cmake_generator=CMakeGenerator.ninja
+    )
+    dependency = _create_dependency(cmake_options=None)
+    dependency.depends_on = ["glad"]
+
+    build_dir.store_install(key="glad", version="0.1.34", fingerprint="1")
+    inputs = dependency.resolve_inputs(runner=runner, build_dir=build_dir)
+    build_dir.store_install(
+        key=dependency.key,
+        version=dependency.version,
+        fingerprint=fingerprint.compute(inputs),
+        inputs=inputs
+    )
+
+    assert not dependency.should_install(runner=runner, build_dir=build_dir)
+
+    # The upstream dependency is installed again with other inputs.
+    build_dir.store_install(key="glad", version="0.1.34", fingerprint="2")
+
+    assert dependency.should_install(runner=runner, build_dir=build_dir)
+    assert fingerprint.explain(
+        previous=inputs,
+        current=dependency.resolve_inputs(runner=runner, build_dir=build_dir)
+    ) == ["'depends_on': 'glad' changed from \"1\" to \"2\""]
+
+
+def test_ninja_is_required_only_by_ninja_generator():
+    dependency = _create_dependency(cmake_options=None)
+
+    def _resolve_required_tools(generator):
+        return dependency.resolve_required_tools(runner=Namespace(
+            args=Namespace(dry_run=False, cache_dir=None),
+            cmake_generator=generator
+        ))
+
+    assert _resolve_required_tools(CMakeGenerator.ninja) == ["cmake", "ninja"]
+    # Ninja is the only generator that is supported for now.
+    assert _resolve_required_tools(Namespace(name="make")) == ["cmake"]
+
+
+def test_shared_dependency_is_installed_when_files_change(tmp_path):
+    build_dir = BuildDirectory(
+        args=Namespace(dry_run=False, verbose=False),
+        source_root=str(tmp_path),
+        build_variant=BuildVariant.debug,
+        generator=CMakeGenerator.ninja,
+        target=Target(system="linux", machine="x86_64")
+    )
+    runner = Namespace(
+        args=Namespace(dry_run=False, verbose=False, cache_dir=None),
+        toolchain=Namespace(tool_cache=None),
+        build_variant=BuildVariant.debug,
+        cmake_generator=CMakeGenerator.ninja
+    )
+
+    def _install(files):
+        dependency = _create_dependency(cmake_options=None, files=files)
+        dependency.variant_independent = True
+
+        def _build(source_path, runner, build_dir):
+            for name in dependency._resolve_declared_files():
+                path = Path(build_dir.dependencies) / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(name)
+
+        dependency._fetch_sources = lambda runner, build_dir: None
+        dependency._build = _build
+
+        return dependency.install(runner=runner, build_dir=build_dir)
+
+    assert _install(files="lib/libglfw3.a") == ["lib/libglfw3.a"]
+
+    # The files of the earlier installation in the shared store
+    # mustn't be copied to the build variant.
+    assert _install(files="lib/libglfw.so") == ["lib/libglfw.so"]
+    assert (Path(build_dir.dependencies) / "lib" / "libglfw.so").exists()
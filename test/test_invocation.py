@@ -0,0 +1,104 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the invocation of the build
+script.
+"""
+
+import json
+import re
+import subprocess
+import sys
+
+import pytest
+
+from couplet_composer.invocation import Invocation
+
+from couplet_composer.support.run_mode import RunMode
+
+
+# The modules that must not be imported before a run mode needs
+# them.
+HEAVY_MODULES = [
+    "couplet_composer.dependency",
+    "couplet_composer.toolchain",
+    "couplet_composer.util.http",
+    "http.server",
+    "requests",
+    "tarfile",
+    "urllib3"
+]
+
+# The budget of importing the entry point of the build script in
+# microseconds. It is a few times the usual time so that a slow
+# machine doesn't fail the test but importing the heavy modules
+# again does.
+IMPORT_TIME_BUDGET = 60000
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True
+    )
+
+
+def test_entry_point_doesnt_import_heavy_modules():
+    process = _run_python(
+        "import json, sys\n"
+        "startup = set(sys.modules)\n"
+        "from couplet_composer import __main__\n"
+        "sys.argv = ['couplet-composer', 'preset', 'compose', '--show']\n"
+        "__main__.Invocation(version='0', name='Couplet Composer')\n"
+        "print(json.dumps(sorted(set(sys.modules) - startup)))\n"
+    )
+    imported = json.loads(process.stdout.decode("utf-8"))
+
+    assert [module for module in HEAVY_MODULES if module in imported] == []
+
+
+def test_entry_point_import_time_is_within_budget():
+    process = _run_python("from couplet_composer import __main__")
+    match = re.search(
+        r"^import time:\s+\d+ \|\s+(\d+) \| couplet_composer\.__main__$",
+        process.stderr.decode("utf-8"),
+        re.MULTILINE
+    )
+
+    assert match
+    assert int(match.group(1)) < IMPORT_TIME_BUDGET
+
+
+class _Runner:
+    """A runner that returns the given exit code."""
+
+    def __init__(self, exit_code, target="target"):
+        self.exit_code = exit_code
+        self.target = target
+
+    def __call__(self):
+        return self.exit_code
+
+
+@pytest.mark.parametrize("host,cross_compile,expected", [
+    (0, [0, 0], 0),
+    (2, [0, 3], 2),
+    (0, [0, 3, 4], 3),
+    (None, [], 0)
+])
+def test_invocation_returns_exit_code_of_runners(
+    host,
+    cross_compile,
+    expected
+):
+    invocation = Invocation.__new__(Invocation)
+    invocation.run_mode = RunMode.configure
+    invocation.targets = Invocation.Targets(host="host", cross_compile=[])
+    invocation.runners = Invocation.Runners(
+        host=_Runner(host),
+        cross_compile=[_Runner(exit_code) for exit_code in cross_compile]
+    )
+
+    assert invocation() == expected
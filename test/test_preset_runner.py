@@ -0,0 +1,118 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the preset mode runner."""
+
+import pytest
+
+from couplet_composer.support import environment
+
+from couplet_composer.util import shell
+
+from couplet_composer import configuring_runner
+
+from couplet_composer.args_parser import create_args_parser
+
+from couplet_composer.preset_runner import PresetRunner
+
+
+PRESETS = """\
+[test]
+build-variant = release
+install-mode = symlink
+
+[cycle]
+mix-in-preset = loop
+
+[loop]
+mix-in-preset = cycle
+"""
+
+
+class _FakeRunner:
+    """A runner that records how it was created and called instead
+    of running the configuring mode.
+    """
+
+    calls = []
+
+    def __init__(self, args, source_root, target):
+        self.args = args
+        self.source_root = source_root
+        self.target = target
+
+    def __call__(self):
+        self.calls.append(self)
+        return 3
+
+
+@pytest.fixture
+def runner_args(tmp_path, monkeypatch):
+    preset_file = tmp_path / "project" / environment.PRESET_FILE_PATH
+    preset_file.parent.mkdir(parents=True)
+    preset_file.write_text(PRESETS)
+
+    _FakeRunner.calls = []
+    monkeypatch.setattr(configuring_runner, "ConfiguringRunner", _FakeRunner)
+
+    def _parse(*options: str, name: str = "test"):
+        return create_args_parser().parse_args([
+            "preset",
+            "--repository",
+            "project",
+            "--no-cache",
+            "--name",
+            name
+        ] + list(options) + ["configure"])
+
+    return _parse
+
+
+def test_preset_runs_in_process(tmp_path, runner_args):
+    runner = PresetRunner(args=runner_args(), source_root=str(tmp_path))
+
+    assert runner() == 3
+    assert len(_FakeRunner.calls) == 1
+
+    called = _FakeRunner.calls[0]
+
+    assert called.source_root == str(tmp_path)
+    assert called.args.run_mode == "configure"
+    assert called.args.build_variant == "release"
+    assert called.args.install_mode == "symlink"
+    assert called.args.repository == "project"
+    assert called.args.cache_dir is None
+
+
+def test_preset_runs_in_subprocess(tmp_path, runner_args, monkeypatch):
+    commands = []
+    monkeypatch.setattr(
+        shell,
+        "call",
+        lambda command, **kwargs: commands.append(command)
+    )
+    runner = PresetRunner(
+        args=runner_args("--subprocess"),
+        source_root=str(tmp_path)
+    )
+
+    assert runner() == 0
+    assert _FakeRunner.calls == []
+    assert len(commands) == 1
+    assert commands[0][1] == "configure"
+    assert "--build-variant=release" in commands[0]
+    assert "--install-mode=symlink" in commands[0]
+
+
+def test_preset_cycle_is_reported(tmp_path, runner_args, caplog):
+    runner = PresetRunner(
+        args=runner_args(name="cycle"),
+        source_root=str(tmp_path)
+    )
+
+    assert runner() == 1
+    assert _FakeRunner.calls == []
+    assert [
+        record.getMessage() for record in caplog.records
+        if record.levelname == "CRITICAL"
+    ] == ["The presets mix in each other: cycle -> loop -> cycle"]
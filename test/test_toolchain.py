@@ -0,0 +1,65 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the toolchain."""
+
+import time
+
+from argparse import Namespace
+
+from couplet_composer.support.build_variant import BuildVariant
+
+from couplet_composer.support.cmake_generator import CMakeGenerator
+
+from couplet_composer.build_directory import BuildDirectory
+
+from couplet_composer.target import Target
+
+from couplet_composer.toolchain import Toolchain
+
+
+class _SlowTool:
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def find(self):
+        self.calls += 1
+        time.sleep(0.3)
+        return self.path
+
+
+def test_warm_up_prepares_tools_concurrently(tmp_path):
+    args = Namespace(dry_run=False, verbose=False)
+    toolchain = Toolchain(
+        args=args,
+        build_dir=BuildDirectory(
+            args=args,
+            source_root=str(tmp_path),
+            build_variant=BuildVariant.debug,
+            generator=CMakeGenerator.ninja,
+            target=Target(system="linux", machine="x86_64")
+        ),
+        target=Target(system="linux", machine="x86_64")
+    )
+    tools = {}
+
+    for name in ["cmake", "ninja"]:
+        (tmp_path / name).write_text(name)
+        tools[name] = _SlowTool(path=str(tmp_path / name))
+
+    toolchain._tools = tools
+
+    start = time.perf_counter()
+    toolchain.warm_up(names=["cmake", "ninja"], jobs=2)
+
+    # Using a tool that is being prepared waits for it.
+    assert toolchain.cmake == str(tmp_path / "cmake")
+    assert toolchain.ninja == str(tmp_path / "ninja")
+
+    toolchain.finish_warm_up()
+
+    # The tools would take at least 0.6 s one at a time.
+    assert time.perf_counter() - start < 0.5
+    assert tools["cmake"].calls == 1
+    assert tools["ninja"].calls == 1
@@ -0,0 +1,66 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the artifact cache."""
+
+import io
+import os
+import tarfile
+
+import pytest
+
+from couplet_composer.util import fingerprint
+
+from couplet_composer.util.artifact_cache import ArtifactCache
+
+
+def test_store_and_restore_artifact(tmp_path):
+    cache = ArtifactCache(root=str(tmp_path / "cache"))
+    key = fingerprint.compute({"version": "2.0.14", "variant": "debug"})
+
+    install_dir = tmp_path / "install"
+    (install_dir / "include" / "SDL2").mkdir(parents=True)
+    (install_dir / "include" / "SDL2" / "SDL.h").write_text("SDL")
+    (install_dir / "lib").mkdir()
+    (install_dir / "lib" / "libSDL2.a").write_bytes(b"\0" * 1024)
+
+    destination = tmp_path / "dependencies"
+
+    assert not cache.restore(fingerprint=key, destination=str(destination))
+
+    cache.store(fingerprint=key, source=str(install_dir))
+
+    assert cache.restore(fingerprint=key, destination=str(destination))
+    assert (destination / "include" / "SDL2" / "SDL.h").read_text() == "SDL"
+    assert (destination / "lib" / "libSDL2.a").read_bytes() == b"\0" * 1024
+
+    # The order of the keys doesn't change the fingerprint.
+    assert key == fingerprint.compute({"variant": "debug", "version": "2.0.14"})
+
+
+@pytest.mark.parametrize("kind", ["path", "symlink", "hardlink"])
+def test_restore_rejects_member_outside_destination(tmp_path, kind):
+    cache = ArtifactCache(root=str(tmp_path / "cache"))
+    key = fingerprint.compute({"version": "2.0.14", "variant": "debug"})
+    entry = cache.resolve_entry(fingerprint=key)
+    os.makedirs(os.path.dirname(entry))
+
+    with tarfile.open(entry, mode="w:gz") as archive:
+        info = tarfile.TarInfo("lib/libSDL2.a")
+
+        if kind == "path":
+            info.name = "../outside"
+        elif kind == "symlink":
+            info.type = tarfile.SYMTYPE
+            info.linkname = "../../outside"
+        else:
+            info.type = tarfile.LNKTYPE
+            info.linkname = "../outside"
+
+        archive.addfile(info, io.BytesIO(b""))
+
+    destination = tmp_path / "dependencies"
+
+    assert not cache.restore(fingerprint=key, destination=str(destination))
+    assert not (tmp_path / "outside").exists()
+    assert not os.path.exists(entry)
@@ -0,0 +1,56 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the download cache."""
+
+import hashlib
+
+import pytest
+
+from couplet_composer.util.download_cache import DownloadCache
+
+
+def _writer(content, calls):
+    def _download(path):
+        calls.append(path)
+        with open(path, "wb") as f:
+            f.write(content)
+    return _download
+
+
+def test_fetch_downloads_once(tmp_path):
+    cache = DownloadCache(root=str(tmp_path / "cache"))
+    calls = []
+    url = "https://example.com/archive.tar.gz"
+
+    first = tmp_path / "first.tar.gz"
+    second = tmp_path / "second.tar.gz"
+
+    assert not cache.fetch(url, str(first), _writer(b"data", calls))
+    assert cache.fetch(url, str(second), _writer(b"data", calls))
+
+    assert len(calls) == 1
+    assert first.read_bytes() == b"data"
+    assert second.read_bytes() == b"data"
+
+
+def test_fetch_verifies_checksum(tmp_path):
+    cache = DownloadCache(root=str(tmp_path / "cache"))
+    url = "https://example.com/archive.tar.gz"
+    checksum = hashlib.sha256(b"expected").hexdigest()
+
+    with pytest.raises(ValueError):
+        cache.fetch(
+            url,
+            str(tmp_path / "archive.tar.gz"),
+            _writer(b"corrupted", []),
+            sha256=checksum
+        )
+
+    assert not (tmp_path / "archive.tar.gz").exists()
+    assert cache.fetch(
+        url,
+        str(tmp_path / "archive.tar.gz"),
+        _writer(b"expected", []),
+        sha256=checksum
+    ) is False
@@ -0,0 +1,95 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the file copy helpers."""
+
+import errno
+import os
+import shutil
+
+import pytest
+
+from couplet_composer.util import file_copy
+
+
+@pytest.mark.parametrize("strategy", list(file_copy.STRATEGIES))
+def test_copy_file_with_each_strategy(strategy, tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    os.chmod(src, 0o750)
+
+    try:
+        dest = file_copy.copy_file(
+            str(src),
+            str(tmp_path / "dest.bin"),
+            strategies=[strategy]
+        )
+    except OSError:
+        pytest.skip("{} isn't supported here".format(strategy))
+
+    assert open(dest, "rb").read() == src.read_bytes()
+    assert os.stat(dest).st_mode == os.stat(src).st_mode
+
+
+def test_copy_tree_merges_into_existing_destination(tmp_path):
+    src = tmp_path / "src"
+    (src / "include" / "library").mkdir(parents=True)
+    (src / "include" / "library" / "header.h").write_text("header")
+    (src / "lib").mkdir()
+    (src / "lib" / "liblibrary.a").write_bytes(os.urandom(4096))
+
+    dest = tmp_path / "dest"
+    (dest / "include" / "other").mkdir(parents=True)
+    (dest / "include" / "other" / "other.h").write_text("other")
+
+    file_copy.copy_tree(str(src), str(dest), jobs=4)
+
+    assert (dest / "include" / "library" / "header.h").read_text() == "header"
+    assert (dest / "include" / "other" / "other.h").read_text() == "other"
+    assert (dest / "lib" / "liblibrary.a").read_bytes() \
+        == (src / "lib" / "liblibrary.a").read_bytes()
+
+
+def test_copy_tree_keeps_hard_linked_source(tmp_path):
+    src = tmp_path / "src"
+    (src / "lib").mkdir(parents=True)
+    content = os.urandom(4096)
+    (src / "lib" / "liblibrary.a").write_bytes(content)
+
+    # The destination was linked from the source earlier.
+    dest = tmp_path / "dest"
+    file_copy.link_tree(str(src), str(dest))
+
+    file_copy.copy_tree(str(src), str(dest))
+
+    assert (src / "lib" / "liblibrary.a").read_bytes() == content
+    assert (dest / "lib" / "liblibrary.a").read_bytes() == content
+    assert os.listdir(dest / "lib") == ["liblibrary.a"]
+
+    with pytest.raises(shutil.SameFileError):
+        file_copy.copy_tree(str(src), str(src))
+
+
+def test_link_tree_falls_back_to_copying(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    (src / "include").mkdir(parents=True)
+    (src / "include" / "first.h").write_text("first")
+    (src / "include" / "second.h").write_text("second")
+
+    file_copy.link_tree(str(src), str(tmp_path / "linked"))
+
+    assert os.path.samefile(
+        src / "include" / "first.h",
+        tmp_path / "linked" / "include" / "first.h"
+    )
+
+    def _link(src, dest):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", _link)
+
+    file_copy.link_tree(str(src), str(tmp_path / "copied"))
+
+    copied = tmp_path / "copied" / "include" / "second.h"
+    assert copied.read_text() == "second"
+    assert not os.path.samefile(src / "include" / "second.h", copied)
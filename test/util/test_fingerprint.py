@@ -0,0 +1,27 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the fingerprint helpers."""
+
+from couplet_composer.util import fingerprint
+
+
+def test_explain_changed_inputs():
+    previous = {
+        "command": ["cmake", "-DCMAKE_BUILD_TYPE=Debug", "-DFOO=ON"],
+        "environment": {"CCACHE_DIR": "/cache"},
+        "product": "1a2b"
+    }
+    current = {
+        "command": ["cmake", "-DCMAKE_BUILD_TYPE=Release", "-DFOO=ON"],
+        "environment": {"CCACHE_DIR": "/cache"},
+        "version": "2.0.0"
+    }
+
+    assert fingerprint.explain(previous=previous, current=previous) == []
+    assert fingerprint.explain(previous=previous, current=current) == [
+        "'command' changed: added -DCMAKE_BUILD_TYPE=Release, removed "
+        "-DCMAKE_BUILD_TYPE=Debug",
+        "'product' was removed",
+        "'version' was added"
+    ]
@@ -0,0 +1,237 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the HTTP helpers."""
+
+import hashlib
+import io
+import os
+import tarfile
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from couplet_composer.util import http
+
+
+CONTENT = os.urandom(1024 * 1024)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """A request handler that serves the content of the server
+    with support for ranges and that drops the first connection
+    half way through if the server is flaky. The content can be
+    changed after the first connection or from the given offset
+    on, and the ranges can be sent from the wrong offset.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        requested = 0
+
+        if "Range" in self.headers:
+            requested = int(self.headers["Range"].split("=")[1].split("-")[0])
+
+        if self.server.ranges and self.server.next_content \
+                and requested >= self.server.change_offset:
+            self.server.content = self.server.next_content
+
+        etag = '"{}"'.format(hashlib.sha256(self.server.content).hexdigest())
+        start = 0
+        end = len(self.server.content) - 1
+        status = 200
+
+        if "Range" in self.headers \
+                and self.headers.get("If-Range", etag) == etag:
+            first, last = self.headers["Range"].split("=")[1].split("-")
+            start = 0 if self.server.misaligned else int(first)
+            end = int(last) if last else end
+            status = 206
+
+        body = self.server.content[start:end + 1]
+
+        self.server.ranges.append(start)
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", "bytes {}-{}/{}".format(
+                start,
+                end,
+                len(self.server.content)
+            ))
+        self.end_headers()
+
+        if self.server.flaky and len(self.server.ranges) == 1:
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.ranges = []
+    httpd.flaky = False
+    httpd.content = CONTENT
+    httpd.next_content = None
+    httpd.change_offset = 0
+    httpd.misaligned = False
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_stream_resumes_interrupted_transfer(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "RETRY_DELAY", 0)
+    server.flaky = True
+
+    destination = tmp_path / "archive.tar.gz"
+
+    http.stream(
+        url="http://127.0.0.1:{}/archive.tar.gz".format(server.server_port),
+        destination=str(destination),
+        segments=1
+    )
+
+    assert destination.read_bytes() == CONTENT
+    assert server.ranges == [0, len(CONTENT) // 2]
+    assert not os.path.exists("{}.part".format(destination))
+    assert not os.path.exists("{}.part.validator".format(destination))
+
+
+@pytest.mark.parametrize("change", ["content", "range", "validator"])
+def test_stream_restarts_transfer_that_cant_be_continued(
+    server,
+    tmp_path,
+    monkeypatch,
+    change
+):
+    monkeypatch.setattr(http, "RETRY_DELAY", 0)
+    server.flaky = True
+    content = CONTENT
+
+    if change == "content":
+        content = os.urandom(len(CONTENT))
+        server.next_content = content
+    elif change == "range":
+        server.misaligned = True
+    else:
+        # The partial file of an unknown version is discarded.
+        server.flaky = False
+        (tmp_path / "archive.tar.gz.part").write_bytes(os.urandom(1024))
+
+    destination = tmp_path / "archive.tar.gz"
+
+    http.stream(
+        url="http://127.0.0.1:{}/archive.tar.gz".format(server.server_port),
+        destination=str(destination),
+        segments=1
+    )
+
+    assert destination.read_bytes() == content
+    assert server.ranges[-1] == 0
+
+
+def test_stream_downloads_large_files_in_ranges(server, tmp_path):
+    destination = tmp_path / "archive.tar.xz"
+
+    http.stream(
+        url="http://127.0.0.1:{}/archive.tar.xz".format(server.server_port),
+        destination=str(destination),
+        segments=4,
+        segment_threshold=len(CONTENT) // 2
+    )
+
+    assert destination.read_bytes() == CONTENT
+    # The first request is for the whole file and it is followed
+    # by the requests for the ranges.
+    assert sorted(server.ranges[1:]) == [
+        i * len(CONTENT) // 4 for i in range(4)
+    ]
+
+
+def test_stream_restarts_ranges_of_changed_file(server, tmp_path):
+    content = os.urandom(len(CONTENT))
+    server.next_content = content
+    # The file changes after some of the ranges have been sent.
+    server.change_offset = len(CONTENT) // 2
+
+    destination = tmp_path / "archive.tar.xz"
+
+    http.stream(
+        url="http://127.0.0.1:{}/archive.tar.xz".format(server.server_port),
+        destination=str(destination),
+        segments=4,
+        segment_threshold=len(CONTENT) // 2
+    )
+
+    assert destination.read_bytes() == content
+    assert server.ranges[-1] == 0
+
+
+def _create_tar_gz(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_extract_while_downloading(server, tmp_path):
+    server.content = _create_tar_gz({
+        "project/include/header.h": b"#pragma once\n",
+        "project/lib/liblibrary.a": os.urandom(4096)
+    })
+    url = "http://127.0.0.1:{}/project.tar.gz".format(server.server_port)
+    cache_dir = tmp_path / "cache"
+
+    for name in ["first", "second"]:
+        destination = tmp_path / name
+
+        http.extract(
+            url=url,
+            destination=str(destination),
+            cache_dir=str(cache_dir)
+        )
+
+        assert (destination / "project" / "include" / "header.h") \
+            .read_bytes() == b"#pragma once\n"
+        assert not (tmp_path / "{}.archive".format(name)).exists()
+
+    # The second extraction is done from the cache.
+    assert server.ranges == [0]
+
+
+def test_extract_continues_interrupted_stream(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "RETRY_DELAY", 0)
+    server.flaky = True
+    server.content = _create_tar_gz({
+        "project/include/header.h": b"#pragma once\n",
+        "project/lib/liblibrary.a": os.urandom(64 * 1024)
+    })
+    destination = tmp_path / "project"
+
+    http.extract(
+        url="http://127.0.0.1:{}/project.tar.gz".format(server.server_port),
+        destination=str(destination)
+    )
+
+    assert (destination / "project" / "include" / "header.h") \
+        .read_bytes() == b"#pragma once\n"
+    # The download is continued from where the streaming stopped.
+    assert server.ranges == [0, len(server.content) // 2]
+    assert not (tmp_path / "project.archive").exists()
+    assert not (tmp_path / "project.archive.part").exists()
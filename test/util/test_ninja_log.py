@@ -0,0 +1,65 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the Ninja log analyzer."""
+
+from couplet_composer.util import ninja_log
+
+from couplet_composer.util.ninja_log import NinjaLog
+
+
+def _write(path, entries, mode="a"):
+    with open(path, mode) as f:
+        for start, end, output in entries:
+            f.write("{}\t{}\t0\t{}\t{:x}\n".format(
+                start,
+                end,
+                output,
+                hash(output) & 0xffff
+            ))
+
+
+def test_ninja_log_reports_latest_build(tmp_path):
+    log_file = tmp_path / ".ninja_log"
+    log_file.write_text("# ninja log v5\n")
+
+    # The previous build is ignored.
+    _write(log_file, [(0, 900, "old.o"), (900, 1000, "old")])
+
+    build_log = NinjaLog(build_dir=str(tmp_path))
+    build_log.start_build()
+
+    # Ninja writes the entries in the order the edges finish.
+    _write(log_file, [
+        (0, 1000, "src/b.cpp.o"),
+        (1000, 2000, "src/c.cpp.o"),
+        (0, 4000, "src/a.cpp.o"),
+        (4000, 4500, "liblib.a"),
+        (4500, 6000, "app")
+    ])
+
+    # The state is read back so that only the new lines are
+    # parsed.
+    edges = NinjaLog(build_dir=str(tmp_path)).update()
+
+    assert sorted(o for e in edges for o in e.outputs) == [
+        "app",
+        "liblib.a",
+        "src/a.cpp.o",
+        "src/b.cpp.o",
+        "src/c.cpp.o"
+    ]
+
+    report = ninja_log.analyze(edges=edges, jobs=2)
+
+    assert report["wall_time"] == 6.0
+    assert report["total_time"] == 8.0
+    assert round(report["parallelism"], 2) == 1.33
+    assert report["slowest_compiles"][0]["output"] == "src/a.cpp.o"
+    assert [e["output"] for e in report["slowest_links"]] == ["app", "liblib.a"]
+    assert [e["output"] for e in report["critical_path"]["edges"]] == [
+        "src/a.cpp.o",
+        "liblib.a",
+        "app"
+    ]
+    assert "critical path of 6.0 s" in ninja_log.format_report(report)
@@ -0,0 +1,86 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the remote cache."""
+
+import hashlib
+import os
+import threading
+
+import pytest
+
+from couplet_composer.util import cache_server, fingerprint
+
+from couplet_composer.util.artifact_cache import ArtifactCache
+
+from couplet_composer.util.remote_cache import RemoteCache
+
+
+@pytest.fixture
+def server(tmp_path):
+    httpd = cache_server.create_server(directory=str(tmp_path / "remote"))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield "http://{}:{}".format(*httpd.server_address[:2])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_artifacts_are_shared_through_remote_cache(tmp_path, server):
+    key = fingerprint.compute({"version": "2.0.14", "variant": "debug"})
+
+    install_dir = tmp_path / "install"
+    (install_dir / "lib").mkdir(parents=True)
+    (install_dir / "lib" / "libSDL2.a").write_bytes(os.urandom(4096))
+
+    # The first machine builds the artifact and uploads it.
+    ArtifactCache(
+        root=str(tmp_path / "first"),
+        remote=RemoteCache(url=server)
+    ).store(fingerprint=key, source=str(install_dir))
+
+    # The second machine has an empty local cache.
+    destination = tmp_path / "dependencies"
+
+    assert ArtifactCache(
+        root=str(tmp_path / "second"),
+        remote=RemoteCache(url=server, read_only=True)
+    ).restore(fingerprint=key, destination=str(destination))
+    assert (destination / "lib" / "libSDL2.a").read_bytes() \
+        == (install_dir / "lib" / "libSDL2.a").read_bytes()
+
+
+def test_remote_cache_verifies_blobs(tmp_path, server):
+    source = tmp_path / "blob"
+    source.write_bytes(b"the original contents")
+
+    remote = RemoteCache(url=server)
+    digest = remote.store_blob(path=str(source))
+
+    assert digest == hashlib.sha256(b"the original contents").hexdigest()
+
+    # The server rejects an upload that doesn't match its key.
+    source.write_bytes(b"the tampered contents")
+    blob = tmp_path / "remote" / "cas" / digest[:2] / digest
+
+    assert not remote.store_blob(path=str(source), digest="0" * 64)
+    assert not (tmp_path / "remote" / "cas" / "00" / ("0" * 64)).exists()
+
+    # A blob that has been corrupted on the server is ignored.
+    blob.write_bytes(b"the tampered contents")
+
+    destination = tmp_path / "destination"
+
+    assert not remote.fetch_blob(digest=digest, destination=str(destination))
+    assert not destination.exists()
+
+
+def test_read_only_remote_cache_doesnt_upload(tmp_path, server):
+    source = tmp_path / "blob"
+    source.write_bytes(b"contents")
+
+    remote = RemoteCache(url=server, read_only=True)
+    remote.store(key="1" * 64, path=str(source))
+
+    assert not remote.fetch(key="1" * 64, destination=str(tmp_path / "out"))
+    assert not (tmp_path / "remote" / "ac").exists()
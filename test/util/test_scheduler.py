@@ -0,0 +1,76 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the task scheduler."""
+
+import threading
+
+import pytest
+
+from couplet_composer.util import scheduler
+
+
+def test_run_respects_requirements():
+    lock = threading.Lock()
+    order = []
+
+    def _task(key):
+        def _run():
+            with lock:
+                order.append(key)
+            return key
+        return _run
+
+    finished = []
+
+    scheduler.run(
+        tasks={key: _task(key) for key in ["a", "b", "c", "d"]},
+        requirements={"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]},
+        jobs=4,
+        on_finish=lambda key, result: finished.append(result)
+    )
+
+    assert order[0] == "a"
+    assert order[-1] == "d"
+    assert sorted(finished) == ["a", "b", "c", "d"]
+
+
+def test_run_ignores_requirements_without_tasks():
+    finished = []
+
+    scheduler.run(
+        tasks={"a": lambda: None},
+        requirements={"a": ["installed"]},
+        jobs=2,
+        on_finish=lambda key, result: finished.append(key)
+    )
+
+    assert finished == ["a"]
+
+
+def test_check_graph_detects_cycles():
+    with pytest.raises(ValueError):
+        scheduler.check_graph({"a": ["b"], "b": ["c"], "c": ["a"]})
+
+
+def test_check_graph_detects_unknown_tasks():
+    with pytest.raises(ValueError):
+        scheduler.check_graph({"a": ["b"]})
+
+
+def test_resolve_dependents_follows_requirements():
+    requirements = {
+        "glad": [],
+        "glfw": ["glad"],
+        "imgui": ["glfw"],
+        "sdl": []
+    }
+
+    assert scheduler.resolve_dependents(
+        requirements=requirements,
+        keys=["glad"]
+    ) == ["glfw", "imgui"]
+    assert scheduler.resolve_dependents(
+        requirements=requirements,
+        keys=["imgui", "sdl"]
+    ) == []
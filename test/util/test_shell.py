@@ -3,6 +3,9 @@
 
 """A module that defines the tests for the shell utilities."""
 
+import io
+import tarfile
+
 from couplet_composer.util import shell
 
 
@@ -10,3 +13,60 @@ def test_quote_command():
     cmd = ["app", "--option", "value", "--another-option=and-value"]
     expected = "app --option value --another-option=and-value"
     assert shell.quote_command(cmd) == expected
+
+
+def test_tar_extracts_selected_members(tmp_path):
+    archive_path = tmp_path / "project.tar.gz"
+
+    with tarfile.open(archive_path, mode="w:gz") as archive:
+        for name in [
+            "project-1a2b3c/include/library/header.h",
+            "project-1a2b3c/include/library/detail/impl.h",
+            "project-1a2b3c/src/library.c",
+            "project-1a2b3c/LICENSE"
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(name)
+            archive.addfile(info, io.BytesIO(name.encode("utf-8")))
+
+    shell.tar(
+        str(archive_path),
+        dest=str(tmp_path / "dest"),
+        members=["*/include/library", "*/LICENSE"]
+    )
+
+    extracted = sorted(
+        str(p.relative_to(tmp_path / "dest")).replace("\\", "/")
+        for p in (tmp_path / "dest").rglob("*") if p.is_file()
+    )
+    assert extracted == [
+        "project-1a2b3c/LICENSE",
+        "project-1a2b3c/include/library/detail/impl.h",
+        "project-1a2b3c/include/library/header.h"
+    ]
+
+
+def test_tar_member_wildcards_match_one_directory(tmp_path):
+    archive_path = tmp_path / "llvm.tar.xz"
+
+    with tarfile.open(archive_path, mode="w:xz") as archive:
+        for name in [
+            "llvm-11.0.0/bin/clang-tidy",
+            "llvm-11.0.0/share/clang/bin/tool",
+            "llvm-11.0.0/tools/extra/bin/clang-tidy"
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(name)
+            archive.addfile(info, io.BytesIO(name.encode("utf-8")))
+
+    shell.tar(
+        str(archive_path),
+        dest=str(tmp_path / "dest"),
+        members=["*/bin/clang-tidy"]
+    )
+
+    extracted = sorted(
+        str(p.relative_to(tmp_path / "dest")).replace("\\", "/")
+        for p in (tmp_path / "dest").rglob("*") if p.is_file()
+    )
+    assert extracted == ["llvm-11.0.0/bin/clang-tidy"]
@@ -0,0 +1,138 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the state database."""
+
+import sqlite3
+import threading
+
+from couplet_composer.util.state import StateDatabase
+
+
+def test_state_stores_installs_and_fingerprints(tmp_path):
+    state_file = str(tmp_path / "state.db")
+    state = StateDatabase(path=state_file)
+
+    state.store_install(
+        target="linux-x86_64",
+        variant="debug",
+        key="glfw",
+        version="3.3.2",
+        fingerprint="abc",
+        inputs={"version": "3.3.2"},
+        files=["lib/libglfw3.a", "include/GLFW/glfw3.h"]
+    )
+    state.store_fingerprint(
+        scope="configuration",
+        key="build",
+        fingerprint="def",
+        inputs={"command": ["cmake"]}
+    )
+
+    # The state is read from the database by the next run.
+    state = StateDatabase(path=state_file)
+
+    assert state.installs(target="linux-x86_64", variant="debug") == {
+        "glfw": {
+            "version": "3.3.2",
+            "fingerprint": "abc",
+            "inputs": {"version": "3.3.2"}
+        }
+    }
+    assert state.installs(target="linux-x86_64", variant="release") == {}
+    assert state.manifest(
+        target="linux-x86_64",
+        variant="debug",
+        key="glfw"
+    ) == ["include/GLFW/glfw3.h", "lib/libglfw3.a"]
+    assert state.fingerprint(scope="configuration", key="build") == {
+        "fingerprint": "def",
+        "inputs": {"command": ["cmake"]}
+    }
+
+    state.clear_installs(target="linux-x86_64", variant="debug")
+    state.remove_fingerprint(scope="configuration", key="build")
+
+    assert state.installs(target="linux-x86_64", variant="debug") == {}
+    assert state.manifest(
+        target="linux-x86_64",
+        variant="debug",
+        key="glfw"
+    ) == []
+    assert state.fingerprint(scope="configuration", key="build") is None
+
+
+def test_state_is_recreated_when_schema_changes(tmp_path):
+    state_file = str(tmp_path / "state.db")
+    StateDatabase(path=state_file).store_tool(
+        target="linux-x86_64",
+        key="cmake",
+        entry={"path": "/usr/bin/cmake"}
+    )
+
+    connection = sqlite3.connect(state_file)
+    connection.execute("PRAGMA user_version=99")
+    connection.close()
+
+    assert StateDatabase(path=state_file).tools(target="linux-x86_64") == {}
+
+
+def test_state_keeps_timings_of_latest_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(StateDatabase, "MAX_RUNS", 2)
+    state = StateDatabase(path=str(tmp_path / "state.db"))
+    runs = []
+
+    for i in range(3):
+        run = state.start_run(
+            mode="configure",
+            target="linux-x86_64",
+            variant="debug"
+        )
+        state.store_timing(
+            run=run,
+            step="install glfw",
+            category="dependency",
+            start=float(i),
+            duration=1.5
+        )
+        runs.append(run)
+
+    assert state.timings(run=runs[0]) == []
+    assert state.timings(run=runs[2]) == [
+        ("install glfw", "dependency", 1.5)
+    ]
+
+
+def test_state_is_written_by_concurrent_connections(tmp_path):
+    state_file = str(tmp_path / "state.db")
+    StateDatabase(path=state_file)
+
+    def _store(variant: str) -> None:
+        state = StateDatabase(path=state_file)
+
+        for i in range(20):
+            state.store_install(
+                target="linux-x86_64",
+                variant=variant,
+                key="dependency{}".format(i),
+                version="1.0.0",
+                files=["lib/lib{}.a".format(i)]
+            )
+
+    threads = [
+        threading.Thread(target=_store, args=(variant,))
+        for variant in ["debug", "release"]
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    state = StateDatabase(path=state_file)
+
+    for variant in ["debug", "release"]:
+        assert len(
+            state.installs(target="linux-x86_64", variant=variant)
+        ) == 20
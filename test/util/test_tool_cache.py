@@ -0,0 +1,54 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the tool cache."""
+
+from couplet_composer.util.state import StateDatabase
+
+from couplet_composer.util.tool_cache import ToolCache
+
+
+def test_tool_cache_validates_entries(tmp_path):
+    tool = tmp_path / "cmake"
+    tool.write_text("#!/bin/sh\n")
+    state_file = str(tmp_path / "state.db")
+    query = {"name": "cmake", "search_path": "/usr/bin"}
+
+    cache = ToolCache(state=StateDatabase(path=state_file), target="linux")
+    cache.store(key="cmake", query=query, path=str(tool), version="3.18.4")
+
+    # The entry is read from the database by the next run.
+    cache = ToolCache(state=StateDatabase(path=state_file), target="linux")
+
+    assert cache.lookup(key="cmake", query=query)["version"] == "3.18.4"
+    assert cache.lookup(key="ninja", query=query) is None
+    assert cache.lookup(
+        key="cmake",
+        query={"name": "cmake", "search_path": "/opt/bin"}
+    ) is None
+
+    tool.write_text("#!/bin/sh\nexit 0\n")
+
+    assert cache.lookup(key="cmake", query=query) is None
+
+
+def test_tool_cache_keeps_entries_of_other_runs(tmp_path):
+    cmake = tmp_path / "cmake"
+    cmake.write_text("cmake")
+    ninja = tmp_path / "ninja"
+    ninja.write_text("ninja")
+    state_file = str(tmp_path / "state.db")
+
+    first = ToolCache(state=StateDatabase(path=state_file), target="linux")
+    second = ToolCache(state=StateDatabase(path=state_file), target="linux")
+    first.store(key="cmake", query=None, path=str(cmake))
+    second.store(key="ninja", query=None, path=str(ninja))
+
+    cache = ToolCache(state=StateDatabase(path=state_file), target="linux")
+
+    assert cache.lookup(key="cmake", query=None)["path"] == str(cmake)
+    assert cache.lookup(key="ninja", query=None)["path"] == str(ninja)
+    assert ToolCache(
+        state=StateDatabase(path=state_file),
+        target="darwin"
+    ).lookup(key="cmake", query=None) is None
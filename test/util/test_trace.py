@@ -0,0 +1,35 @@
+# Copyright (c) 2021 Antti Kivi
+# Licensed under the MIT License
+
+"""A module that defines the tests for the trace helpers."""
+
+import json
+import sys
+
+from couplet_composer.util import shell, trace
+
+
+def test_trace_records_nested_spans(tmp_path):
+    trace_file = tmp_path / "trace.json"
+
+    trace.start(path=str(trace_file))
+
+    with trace.span("configure", category="runner"):
+        with trace.span("install sdl", category="dependency", version="2"):
+            shell.call([sys.executable, "-c", "pass"])
+
+    trace.finish()
+
+    assert not trace.is_enabled()
+
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    spans = {e["cat"]: e for e in events if e["ph"] == "X"}
+
+    assert set(spans) == {"runner", "dependency", "shell"}
+    assert spans["dependency"]["args"] == {"version": "2"}
+
+    # Every span is inside the span it was started in.
+    for parent, child in [("runner", "dependency"), ("dependency", "shell")]:
+        assert spans[parent]["ts"] <= spans[child]["ts"]
+        assert spans[child]["ts"] + spans[child]["dur"] \
+            <= spans[parent]["ts"] + spans[parent]["dur"]